@@ -0,0 +1,265 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+CAMPOS_USUARIO = ("id", "nome", "email", "senha_hash", "tipo", "data_criacao", "ultimo_acesso")
+
+class EmailDuplicado(Exception):
+    """E-mail já existe no armazenamento"""
+
+def normalizar_email(email: str) -> str:
+    """Chave canônica do e-mail usada nos índices"""
+    return email.strip().lower()
+
+def gravar_json_atomico(caminho: str, dados):
+    """Grava em arquivo temporário no mesmo diretório e troca por rename.
+    
+    Uma queda no meio da gravação deixa o arquivo anterior intacto.
+    """
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    fd, caminho_tmp = tempfile.mkstemp(prefix=".usuarios-", suffix=".tmp", dir=diretorio)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(caminho_tmp, caminho)
+    except BaseException:
+        if os.path.exists(caminho_tmp):
+            os.remove(caminho_tmp)
+        raise
+
+class ArmazenamentoUsuarios:
+    """Interface dos backends de persistência de usuários.
+    
+    Os registros trafegam como dicts com as chaves de CAMPOS_USUARIO.
+    """
+    
+    # True quando cada gravação regrava o snapshot em memória inteiro
+    grava_snapshot = False
+    
+    def vincular(self, fonte: Callable[[], List[dict]]):
+        """Recebe a função que devolve o snapshot completo em memória"""
+    
+    def carregar(self) -> List[dict]:
+        raise NotImplementedError
+    
+    def buscar_por_email(self, email: str) -> Optional[dict]:
+        """Registro atual do e-mail, sem carregar os demais quando o backend permite"""
+        chave = normalizar_email(email)
+        return next((r for r in self.carregar() if normalizar_email(r["email"]) == chave), None)
+    
+    def buscar_por_id(self, usuario_id: str) -> Optional[dict]:
+        """Registro atual do id, sem carregar os demais quando o backend permite"""
+        return next((r for r in self.carregar() if r["id"] == usuario_id), None)
+    
+    def salvar_todos(self, registros: List[dict]):
+        raise NotImplementedError
+    
+    def inserir(self, registro: dict):
+        raise NotImplementedError
+    
+    def atualizar(self, registro: dict):
+        raise NotImplementedError
+    
+    def remover(self, usuario_id: str):
+        raise NotImplementedError
+    
+    def registrar_acessos(self, acessos: Dict[str, str]):
+        """Grava em lote o último acesso (id -> data/hora)"""
+        raise NotImplementedError
+    
+    def versao(self):
+        """Valor que muda sempre que outro processo altera os dados"""
+        raise NotImplementedError
+
+class ArmazenamentoJSON(ArmazenamentoUsuarios):
+    """Arquivo JSON único; toda alteração regrava o arquivo inteiro"""
+    
+    grava_snapshot = True
+    
+    def __init__(self, caminho: str = "usuarios.json"):
+        self.caminho = caminho
+        self._fonte: Optional[Callable[[], List[dict]]] = None
+        self._indices_versao = None
+    
+    def vincular(self, fonte):
+        self._fonte = fonte
+    
+    def _indices(self) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+        """Registros por e-mail e por id, relidos só quando o arquivo muda"""
+        # Versão antes da leitura: uma gravação no meio só faz reler da próxima vez
+        versao = self.versao()
+        if self._indices_versao is None or self._indices_versao[0] != versao:
+            registros = self.carregar()
+            self._indices_versao = (versao, {normalizar_email(r["email"]): r for r in registros},
+                                    {r["id"]: r for r in registros})
+        return self._indices_versao[1], self._indices_versao[2]
+    
+    def buscar_por_email(self, email: str) -> Optional[dict]:
+        return self._indices()[0].get(normalizar_email(email))
+    
+    def buscar_por_id(self, usuario_id: str) -> Optional[dict]:
+        return self._indices()[1].get(usuario_id)
+    
+    def carregar(self) -> List[dict]:
+        if not os.path.exists(self.caminho):
+            return []
+        with open(self.caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def salvar_todos(self, registros: List[dict]):
+        gravar_json_atomico(self.caminho, registros)
+    
+    def _regravar(self):
+        self.salvar_todos(self._fonte())
+    
+    def inserir(self, registro: dict):
+        self._regravar()
+    
+    def atualizar(self, registro: dict):
+        self._regravar()
+    
+    def remover(self, usuario_id: str):
+        self._regravar()
+    
+    def registrar_acessos(self, acessos: Dict[str, str]):
+        self._regravar()
+    
+    def versao(self):
+        try:
+            info = os.stat(self.caminho)
+        except FileNotFoundError:
+            return None
+        return (info.st_mtime_ns, info.st_size)
+
+class ArmazenamentoSQLite(ArmazenamentoUsuarios):
+    """SQLite embarcado em modo WAL; alterações custam uma linha"""
+    
+    def __init__(self, caminho: str = "usuarios.db"):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS usuarios (
+                    id TEXT PRIMARY KEY,
+                    nome TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    email_normalizado TEXT NOT NULL,
+                    senha_hash TEXT NOT NULL,
+                    tipo TEXT NOT NULL,
+                    data_criacao TEXT NOT NULL,
+                    ultimo_acesso TEXT
+                )
+            """)
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_usuarios_email ON usuarios (email_normalizado)"
+            )
+    
+    @staticmethod
+    def _linha(registro: dict) -> dict:
+        linha = {campo: registro.get(campo) for campo in CAMPOS_USUARIO}
+        linha["email_normalizado"] = normalizar_email(registro["email"])
+        return linha
+    
+    def _executar(self, sql: str, parametros=()):
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(sql, parametros)
+        except sqlite3.IntegrityError as e:
+            if "email_normalizado" in str(e):
+                raise EmailDuplicado(str(e)) from e
+            raise
+    
+    def carregar(self) -> List[dict]:
+        with self._lock:
+            cursor = self._conn.execute(f"SELECT {', '.join(CAMPOS_USUARIO)} FROM usuarios ORDER BY rowid")
+            return [dict(linha) for linha in cursor]
+    
+    def buscar_por_email(self, email: str) -> Optional[dict]:
+        with self._lock:
+            linha = self._conn.execute(
+                f"SELECT {', '.join(CAMPOS_USUARIO)} FROM usuarios WHERE email_normalizado = ?",
+                (normalizar_email(email),)
+            ).fetchone()
+        return dict(linha) if linha is not None else None
+    
+    def buscar_por_id(self, usuario_id: str) -> Optional[dict]:
+        with self._lock:
+            linha = self._conn.execute(
+                f"SELECT {', '.join(CAMPOS_USUARIO)} FROM usuarios WHERE id = ?", (usuario_id,)
+            ).fetchone()
+        return dict(linha) if linha is not None else None
+    
+    def salvar_todos(self, registros: List[dict]):
+        linhas = [self._linha(r) for r in registros]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM usuarios")
+            self._conn.executemany("""
+                INSERT INTO usuarios (id, nome, email, email_normalizado, senha_hash, tipo, data_criacao, ultimo_acesso)
+                VALUES (:id, :nome, :email, :email_normalizado, :senha_hash, :tipo, :data_criacao, :ultimo_acesso)
+            """, linhas)
+    
+    def inserir(self, registro: dict):
+        self._executar("""
+            INSERT INTO usuarios (id, nome, email, email_normalizado, senha_hash, tipo, data_criacao, ultimo_acesso)
+            VALUES (:id, :nome, :email, :email_normalizado, :senha_hash, :tipo, :data_criacao, :ultimo_acesso)
+        """, self._linha(registro))
+    
+    def atualizar(self, registro: dict):
+        self._executar("""
+            UPDATE usuarios SET nome = :nome, email = :email, email_normalizado = :email_normalizado,
+                senha_hash = :senha_hash, tipo = :tipo, data_criacao = :data_criacao, ultimo_acesso = :ultimo_acesso
+            WHERE id = :id
+        """, self._linha(registro))
+    
+    def remover(self, usuario_id: str):
+        self._executar("DELETE FROM usuarios WHERE id = ?", (usuario_id,))
+    
+    def registrar_acessos(self, acessos: Dict[str, str]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE usuarios SET ultimo_acesso = ? WHERE id = ?",
+                [(quando, usuario_id) for usuario_id, quando in acessos.items()]
+            )
+    
+    def versao(self):
+        # data_version muda quando outra conexão confirma uma transação
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+def migrar_json_para_sqlite(arquivo_json: str = "usuarios.json", arquivo_sqlite: str = "usuarios.db") -> int:
+    """Copia os usuários do JSON para o SQLite; e-mails já existentes são ignorados"""
+    origem = ArmazenamentoJSON(arquivo_json)
+    destino = ArmazenamentoSQLite(arquivo_sqlite)
+    migrados = 0
+    for registro in origem.carregar():
+        try:
+            destino.inserir(registro)
+            migrados += 1
+        except (EmailDuplicado, sqlite3.IntegrityError):
+            continue
+    return migrados
+
+def armazenamento_do_ambiente(arquivo_usuarios: str = "usuarios.json") -> ArmazenamentoUsuarios:
+    """Backend escolhido por USUARIOS_SQLITE; sem a variável, usa o JSON"""
+    caminho_sqlite = os.environ.get("USUARIOS_SQLITE")
+    if caminho_sqlite:
+        return ArmazenamentoSQLite(caminho_sqlite)
+    return ArmazenamentoJSON(arquivo_usuarios)
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) != 4 or sys.argv[1] != "migrar":
+        print("Uso: python armazenamento_usuarios.py migrar usuarios.json usuarios.db")
+        sys.exit(1)
+    total = migrar_json_para_sqlite(sys.argv[2], sys.argv[3])
+    print(f"{total} usuários migrados para {sys.argv[3]}")
\ No newline at end of file
@@ -1,76 +1,294 @@
-import hashlib
-import json
-import os
-from datetime import datetime
-from dataclasses import dataclass
-from typing import Optional, List
-
-@dataclass
-class Usuario:
-    id: str
-    nome: str
-    email: str
-    senha_hash: str
-    tipo: str
-    data_criacao: str
-    ultimo_acesso: Optional[str] = None
-
-class GerenciadorUsuarios:
-    def __init__(self, arquivo_usuarios="usuarios.json"):
-        self.arquivo_usuarios = arquivo_usuarios
-        self.carregar_usuarios()
-        
-        if not self.usuarios:
-            self.criar_admin_padrao()
-    
-    def carregar_usuarios(self):
-        if os.path.exists(self.arquivo_usuarios):
-            with open(self.arquivo_usuarios, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-                self.usuarios = [Usuario(**u) for u in dados]
-        else:
-            self.usuarios = []
-    
-    def salvar_usuarios(self):
-        with open(self.arquivo_usuarios, 'w', encoding='utf-8') as f:
-            dados = [u.__dict__ for u in self.usuarios]
-            json.dump(dados, f, indent=4, ensure_ascii=False)
-    
-    def criar_admin_padrao(self):
-        senha_hash = hashlib.sha256("admin123".encode()).hexdigest()
-        admin = Usuario(
-            id=f"USR{datetime.now().strftime('%Y%m%d%H%M%S')}",
-            nome="Administrador",
-            email="admin@sistema.com",
-            senha_hash=senha_hash,
-            tipo="admin",
-            data_criacao=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
-        self.usuarios.append(admin)
-        self.salvar_usuarios()
-    
-    def autenticar(self, email: str, senha: str) -> Optional[Usuario]:
-        senha_hash = hashlib.sha256(senha.encode()).hexdigest()
-        for usuario in self.usuarios:
-            if usuario.email == email and usuario.senha_hash == senha_hash:
-                usuario.ultimo_acesso = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self.salvar_usuarios()
-                return usuario
-        return None
-    
-    def criar_usuario(self, nome: str, email: str, senha: str) -> tuple:
-        if any(u.email == email for u in self.usuarios):
-            return False, "Email já cadastrado"
-        
-        senha_hash = hashlib.sha256(senha.encode()).hexdigest()
-        novo_usuario = Usuario(
-            id=f"USR{datetime.now().strftime('%Y%m%d%H%M%S')}",
-            nome=nome,
-            email=email,
-            senha_hash=senha_hash,
-            tipo="usuario",
-            data_criacao=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
-        self.usuarios.append(novo_usuario)
-        self.salvar_usuarios()
-        return True, "Usuário criado com sucesso"
\ No newline at end of file
+import atexit
+import threading
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict
+
+from armazenamento_usuarios import (
+    ArmazenamentoUsuarios,
+    ArmazenamentoJSON,
+    EmailDuplicado,
+    normalizar_email,
+)
+from gerador_ids import novo_id
+from senhas import PoliticaSenha, gerar_hash, gerar_hash_limitado, precisa_rehash, verificar_senha_limitada
+
+@dataclass
+class Usuario:
+    id: str
+    nome: str
+    email: str
+    senha_hash: str
+    tipo: str
+    data_criacao: str
+    ultimo_acesso: Optional[str] = None
+
+class GerenciadorUsuarios:
+    def __init__(self, arquivo_usuarios="usuarios.json", intervalo_flush=5.0, limite_acessos_pendentes=50,
+                 armazenamento: Optional[ArmazenamentoUsuarios] = None,
+                 politica_senha: Optional[PoliticaSenha] = None):
+        self.arquivo_usuarios = arquivo_usuarios
+        self.politica_senha = politica_senha
+        self.armazenamento = armazenamento or ArmazenamentoJSON(arquivo_usuarios)
+        self.armazenamento.vincular(self._registros)
+        # Write-behind do último acesso: logins só marcam o usuário e a
+        # gravação acontece por tempo (intervalo_flush) ou por volume
+        self.intervalo_flush = intervalo_flush
+        self.limite_acessos_pendentes = limite_acessos_pendentes
+        self._acessos_pendentes: Dict[str, str] = {}
+        self._timer_flush: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self.usuarios: List[Usuario] = []
+        self._indice_email: Dict[str, Usuario] = {}
+        self._indice_id: Dict[str, Usuario] = {}
+        self._versao_carregada = None
+        self.carregar_usuarios()
+        
+        if not self.usuarios:
+            self.criar_admin_padrao()
+        
+        atexit.register(self.descarregar_acessos)
+    
+    def _registros(self) -> List[dict]:
+        return [asdict(u) for u in self.usuarios]
+    
+    def carregar_usuarios(self):
+        with self._lock:
+            self._versao_carregada = self.armazenamento.versao()
+            self.usuarios = [Usuario(**u) for u in self.armazenamento.carregar()]
+            self._reindexar()
+            # Acessos ainda não gravados continuam valendo após recarregar
+            for usuario_id, quando in self._acessos_pendentes.items():
+                usuario = self._indice_id.get(usuario_id)
+                if usuario is not None:
+                    usuario.ultimo_acesso = quando
+    
+    def recarregar_se_alterado(self) -> bool:
+        """Recarrega do armazenamento só se outro processo mudou os dados"""
+        if self.armazenamento.versao() == self._versao_carregada:
+            return False
+        with self._lock:
+            if self.armazenamento.versao() == self._versao_carregada:
+                return False
+            self.carregar_usuarios()
+            return True
+    
+    def _sincronizar_email(self, email: str):
+        """Atualiza só o usuário do e-mail, se outro processo mudou os dados.
+        
+        Um login não paga a recarga completa (lista e dois índices) a cada
+        gravação alheia, como o flush de último acesso de outro worker. A
+        versão carregada não muda: as operações que dependem da lista
+        inteira ainda recarregam tudo.
+        """
+        if self.armazenamento.versao() == self._versao_carregada:
+            return
+        registro = self.armazenamento.buscar_por_email(email)
+        with self._lock:
+            if registro is not None:
+                self._aplicar_registro(registro)
+                return
+            atual = self.buscar_por_email(email)
+            if atual is not None:
+                # Removido por outro processo
+                self._desindexar(atual)
+                self.usuarios.remove(atual)
+    
+    def _aplicar_registro(self, registro: dict) -> Usuario:
+        """Põe o registro lido do armazenamento na lista e nos índices"""
+        usuario = self._indice_id.get(registro["id"])
+        atual = self.buscar_por_email(registro["email"])
+        if atual is not None and atual is not usuario:
+            # O e-mail agora é de outro usuário
+            self._desindexar(atual)
+            self.usuarios.remove(atual)
+        if usuario is None:
+            usuario = Usuario(**registro)
+            self.usuarios.append(usuario)
+        else:
+            self._desindexar(usuario)
+            for campo, valor in registro.items():
+                setattr(usuario, campo, valor)
+        usuario.ultimo_acesso = self._acessos_pendentes.get(usuario.id, usuario.ultimo_acesso)
+        self._indexar(usuario)
+        return usuario
+    
+    def _marcar_versao(self):
+        """Registra a versão após uma gravação própria, que não exige recarga"""
+        self._versao_carregada = self.armazenamento.versao()
+    
+    def _reindexar(self):
+        """Reconstrói os índices por e-mail e por id a partir da lista"""
+        self._indice_email = {normalizar_email(u.email): u for u in self.usuarios}
+        self._indice_id = {u.id: u for u in self.usuarios}
+    
+    def _indexar(self, usuario: Usuario):
+        self._indice_email[normalizar_email(usuario.email)] = usuario
+        self._indice_id[usuario.id] = usuario
+    
+    def _desindexar(self, usuario: Usuario):
+        self._indice_email.pop(normalizar_email(usuario.email), None)
+        self._indice_id.pop(usuario.id, None)
+    
+    def buscar_por_email(self, email: str) -> Optional[Usuario]:
+        return self._indice_email.get(normalizar_email(email))
+    
+    def buscar_por_id(self, usuario_id: str) -> Optional[Usuario]:
+        usuario = self._indice_id.get(usuario_id)
+        if usuario is None and self.armazenamento.versao() != self._versao_carregada:
+            # Pode ter sido criado por outro worker depois da última carga
+            registro = self.armazenamento.buscar_por_id(usuario_id)
+            if registro is not None:
+                with self._lock:
+                    usuario = self._aplicar_registro(registro)
+        return usuario
+    
+    def _cancelar_flush(self):
+        self._acessos_pendentes = {}
+        if self._timer_flush is not None:
+            self._timer_flush.cancel()
+            self._timer_flush = None
+    
+    def salvar_usuarios(self):
+        with self._lock:
+            self.armazenamento.salvar_todos(self._registros())
+            self._marcar_versao()
+            # O snapshot completo já inclui os acessos pendentes
+            self._cancelar_flush()
+    
+    def registrar_acesso(self, usuario: Usuario):
+        """Marca o último acesso e agenda a gravação em lote"""
+        with self._lock:
+            usuario.ultimo_acesso = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._acessos_pendentes[usuario.id] = usuario.ultimo_acesso
+            
+            if len(self._acessos_pendentes) >= self.limite_acessos_pendentes or self.intervalo_flush <= 0:
+                self.descarregar_acessos()
+            elif self._timer_flush is None:
+                self._timer_flush = threading.Timer(self.intervalo_flush, self.descarregar_acessos)
+                self._timer_flush.daemon = True
+                self._timer_flush.start()
+    
+    def descarregar_acessos(self):
+        """Grava os acessos pendentes, se houver"""
+        with self._lock:
+            if self._acessos_pendentes:
+                if self.armazenamento.grava_snapshot:
+                    # O snapshot gravado precisa incluir as alterações dos outros processos
+                    self.recarregar_se_alterado()
+                    self.armazenamento.registrar_acessos(self._acessos_pendentes)
+                    self._marcar_versao()
+                else:
+                    # Só as linhas dos acessos mudam: nada a recarregar antes
+                    self.armazenamento.registrar_acessos(self._acessos_pendentes)
+                self._cancelar_flush()
+    
+    def criar_admin_padrao(self):
+        with self._lock:
+            senha_hash = gerar_hash("admin123", self.politica_senha)
+            admin = Usuario(
+                id=novo_id("USR"),
+                nome="Administrador",
+                email="admin@sistema.com",
+                senha_hash=senha_hash,
+                tipo="admin",
+                data_criacao=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            )
+            self.usuarios.append(admin)
+            self._indexar(admin)
+            try:
+                self.armazenamento.inserir(asdict(admin))
+                self._marcar_versao()
+            except EmailDuplicado:
+                # Outro processo criou o admin primeiro
+                self.carregar_usuarios()
+    
+    def verificar_credenciais(self, email: str, senha: str) -> Optional[Usuario]:
+        """Confere e-mail e senha sem registrar o acesso"""
+        usuario = self.buscar_por_email(email)
+        if usuario is None:
+            return None
+        if not verificar_senha_limitada(senha, usuario.senha_hash):
+            return None
+        if precisa_rehash(usuario.senha_hash, self.politica_senha):
+            # Hash antigo ou mais fraco que a política: troca aproveitando a senha em claro
+            self.atualizar_usuario(usuario.id, senha_hash=gerar_hash_limitado(senha, self.politica_senha))
+        return usuario
+    
+    def autenticar(self, email: str, senha: str) -> Optional[Usuario]:
+        self._sincronizar_email(email)
+        usuario = self.verificar_credenciais(email, senha)
+        if usuario:
+            self.registrar_acesso(usuario)
+        return usuario
+    
+    def criar_usuario(self, nome: str, email: str, senha: str) -> tuple:
+        with self._lock:
+            self.recarregar_se_alterado()
+            if self.buscar_por_email(email) is not None:
+                return False, "Email já cadastrado"
+            
+            senha_hash = gerar_hash_limitado(senha, self.politica_senha)
+            novo_usuario = Usuario(
+                id=novo_id("USR"),
+                nome=nome,
+                email=email,
+                senha_hash=senha_hash,
+                tipo="usuario",
+                data_criacao=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            )
+            self.usuarios.append(novo_usuario)
+            self._indexar(novo_usuario)
+            try:
+                self.armazenamento.inserir(asdict(novo_usuario))
+            except BaseException as e:
+                self._desindexar(novo_usuario)
+                self.usuarios.remove(novo_usuario)
+                if isinstance(e, EmailDuplicado):
+                    return False, "Email já cadastrado"
+                raise
+            self._marcar_versao()
+            return True, "Usuário criado com sucesso"
+    
+    def atualizar_usuario(self, usuario_id: str, **campos) -> tuple:
+        with self._lock:
+            self.recarregar_se_alterado()
+            usuario = self.buscar_por_id(usuario_id)
+            if usuario is None:
+                return False, "Usuário não encontrado"
+            
+            novo_email = campos.get("email")
+            if novo_email is not None:
+                existente = self.buscar_por_email(novo_email)
+                if existente is not None and existente is not usuario:
+                    return False, "Email já cadastrado"
+            
+            anterior = asdict(usuario)
+            self._desindexar(usuario)
+            for campo, valor in campos.items():
+                if campo != "id" and hasattr(usuario, campo):
+                    setattr(usuario, campo, valor)
+            try:
+                self.armazenamento.atualizar(asdict(usuario))
+            except EmailDuplicado:
+                for campo, valor in anterior.items():
+                    setattr(usuario, campo, valor)
+                return False, "Email já cadastrado"
+            finally:
+                self._indexar(usuario)
+            self._marcar_versao()
+            return True, "Usuário atualizado com sucesso"
+    
+    def remover_usuario(self, usuario_id: str) -> tuple:
+        with self._lock:
+            self.recarregar_se_alterado()
+            usuario = self.buscar_por_id(usuario_id)
+            if usuario is None:
+                return False, "Usuário não encontrado"
+            
+            self._desindexar(usuario)
+            self.usuarios.remove(usuario)
+            self._acessos_pendentes.pop(usuario_id, None)
+            self.armazenamento.remover(usuario_id)
+            self._marcar_versao()
+            return True, "Usuário removido com sucesso"
\ No newline at end of file
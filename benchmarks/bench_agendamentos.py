@@ -0,0 +1,86 @@
+"""Checagem de conflito com 1 milhão de agendamentos no histórico.
+
+Monta um banco temporário com agendamentos de 15 minutos, das 08:00 às
+19:00, para os cinco profissionais, cobrindo uns 12 anos. Mede a checagem
+com o dia fora do cache (consulta pelo índice do SQLite) e dentro dele
+(busca binária), contra uma varredura linear da lista completa.
+
+Uso: python benchmarks/bench_agendamentos.py [total]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositorio_agendamentos import Agendamento, RepositorioAgendamentos
+
+PROFISSIONAIS = ["João", "Maria", "Carlos", "Ana", "Pedro"]
+INICIO_DIA, FIM_DIA, DURACAO = 8 * 60, 19 * 60, 15
+CONSULTAS = 20_000
+
+def gerar(total):
+    por_dia = (FIM_DIA - INICIO_DIA) // DURACAO
+    primeiro_dia = date(2014, 1, 1)
+    for n in range(total):
+        dia, resto = divmod(n, por_dia * len(PROFISSIONAIS))
+        profissional, slot = divmod(resto, por_dia)
+        inicio = INICIO_DIA + slot * DURACAO
+        yield Agendamento(
+            id=f"AGD{n:012d}",
+            profissional=PROFISSIONAIS[profissional],
+            data=(primeiro_dia + timedelta(days=dia)).isoformat(),
+            inicio=inicio,
+            fim=inicio + DURACAO,
+            cliente=f"Cliente {n % 5000}",
+            telefone="(11) 90000-0000",
+            servico="Corte de Cabelo",
+            criado_em="2014-01-01 00:00:00",
+        )
+
+def consultas_aleatorias(dias, quantidade):
+    aleatorio = random.Random(42)
+    for _ in range(quantidade):
+        inicio = aleatorio.randrange(INICIO_DIA, FIM_DIA - 30)
+        yield aleatorio.choice(PROFISSIONAIS), aleatorio.choice(dias), inicio, inicio + 30
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as diretorio:
+        repositorio = RepositorioAgendamentos(os.path.join(diretorio, "agendamentos.db"), max_dias_cache=64)
+        inicio = time.perf_counter()
+        agendamentos = list(gerar(total))
+        repositorio.inserir_lote(agendamentos)
+        print(f"carga de {total:,} agendamentos: {time.perf_counter() - inicio:.1f} s")
+        
+        dias = sorted({a.data for a in agendamentos})
+        print(f"{len(dias):,} dias de histórico ({len(dias) / 365:.1f} anos)")
+        
+        consultas = list(consultas_aleatorias(dias, CONSULTAS))
+        inicio = time.perf_counter()
+        for profissional, dia, de, ate in consultas:
+            repositorio.conflitos(profissional, dia, de, ate)
+        decorrido = time.perf_counter() - inicio
+        print(f"dia fora do cache (SQLite): {decorrido / CONSULTAS * 1e6:8.1f} µs/checagem")
+        
+        profissional, dia = consultas[0][0], consultas[0][1]
+        repositorio.conflitos(profissional, dia, INICIO_DIA, INICIO_DIA + 30)
+        inicio = time.perf_counter()
+        for _, _, de, ate in consultas:
+            repositorio.conflitos(profissional, dia, de, ate)
+        decorrido = time.perf_counter() - inicio
+        print(f"dia em cache (bisect):      {decorrido / CONSULTAS * 1e6:8.1f} µs/checagem")
+        
+        amostra = consultas[:20]
+        inicio = time.perf_counter()
+        for profissional, dia, de, ate in amostra:
+            [a.id for a in agendamentos
+             if a.profissional == profissional and a.data == dia and a.inicio < ate and a.fim > de]
+        decorrido = time.perf_counter() - inicio
+        print(f"varredura linear:           {decorrido / len(amostra) * 1e6:8.1f} µs/checagem")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""Catálogo com 100 mil produtos.
+
+Grava SKUs sintéticos num banco temporário, abre o catálogo (carga dos
+índices) e mede a busca do seletor de produto por código, por prefixo de
+nome e por dois termos, contra a busca antiga: varrer a lista de rótulos
+"nome - preço" e achar o preço pelo .index() na lista paralela. Mede
+também obter() pelo código e a inclusão de um produto no catálogo aberto.
+
+Uso: python benchmarks/bench_catalogo.py [total]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogo_produtos import CATEGORIAS, CatalogoProdutos, Produto
+
+ITENS = ["Camiseta", "Caneca", "Notebook", "Fone", "Café", "Arroz", "Cabo", "Mouse", "Teclado", "Calça",
+         "Tênis", "Monitor", "Feijão", "Açúcar", "Carregador", "Jaqueta", "Garrafa", "Mochila"]
+ADJETIVOS = ["Azul", "Preto", "Básico", "Premium", "Orgânico", "Sem Fio", "Gamer", "Térmica", "Infantil", "Slim"]
+BUSCAS = {
+    "código": "P0500",
+    "prefixo de nome": "carreg",
+    "dois termos": "mochila infantil",
+}
+REPETICOES = 200
+
+def gerar(total):
+    aleatorio = random.Random(7)
+    for n in range(1, total + 1):
+        nome = f"{aleatorio.choice(ITENS)} {aleatorio.choice(ADJETIVOS)} {n}"
+        yield Produto(f"P{n:06d}", nome, aleatorio.choice(CATEGORIAS), aleatorio.randrange(100, 500_000),
+                      aleatorio.randrange(0, 500))
+
+def cronometrar(funcao) -> float:
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        funcao()
+    return (time.perf_counter() - inicio) / REPETICOES * 1000
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    produtos = list(gerar(total))
+    caminho = os.path.join(tempfile.mkdtemp(), "produtos.db")
+    
+    CatalogoProdutos(caminho)._inserir(produtos)
+    inicio = time.perf_counter()
+    catalogo = CatalogoProdutos(caminho)
+    print(f"carga do catálogo com {len(catalogo):,} produtos: {time.perf_counter() - inicio:.2f} s")
+    
+    rotulos = [f"{p.nome} - R$ {p.preco / 100:.2f}" for p in produtos]
+    precos = [p.preco / 100 for p in produtos]
+    
+    def busca_antiga(texto):
+        termos = texto.lower().split()
+        return [r for r in rotulos if all(t in r.lower() for t in termos)][:20]
+    
+    print(f"{'busca':<20}{'catálogo':>10}{'lista':>10}  primeiro resultado")
+    for rotulo, busca in BUSCAS.items():
+        ms_catalogo = cronometrar(lambda: catalogo.buscar(busca, limite=20))
+        ms_lista = cronometrar(lambda: busca_antiga(busca))
+        resultado = catalogo.buscar(busca, limite=1)
+        print(f"{rotulo:<20}{ms_catalogo:>8.3f}ms{ms_lista:>8.1f}ms  {resultado[0].codigo if resultado else '-'}"
+              f" {resultado[0].nome if resultado else ''}")
+    
+    alvo = produtos[total // 2]
+    rotulo_alvo = rotulos[total // 2]
+    print(f"preço pelo código: {cronometrar(lambda: catalogo.obter(alvo.codigo).preco) * 1000:.1f} µs "
+          f"(.index() na lista: {cronometrar(lambda: precos[rotulos.index(rotulo_alvo)]):.2f} ms)")
+    
+    inicio = time.perf_counter()
+    for n in range(100):
+        catalogo.adicionar(f"Produto Novo {n}", "Outros", 1990, 10)
+    print(f"adicionar um produto: {(time.perf_counter() - inicio) * 10:.2f} ms em média (100 inclusões)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Busca de clientes com 300 mil cadastros.
+
+Monta o índice de trigramas com clientes sintéticos e mede buscas por
+prefixo, sem acento, com erro de digitação, por telefone e por e-mail,
+contra o str.contains do pandas sobre a coluna de nomes (a busca antiga).
+Também mede a carga em lote e o custo de adicionar um cliente ao índice
+já montado (que não refaz a base).
+
+Uso: python benchmarks/bench_clientes.py [total]
+"""
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indice_clientes import IndiceClientes
+
+NOMES = ["João", "Maria", "José", "Ana", "Antônio", "Francisca", "Carlos", "Luíza", "Paulo", "Adriana",
+         "Pedro", "Márcia", "Lucas", "Fernanda", "Luiz", "Patrícia", "Marcos", "Aline", "Gabriel", "Sônia"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima",
+              "Gomes", "Ribeiro", "Carvalho", "Araújo", "Melo", "Barbosa", "Conceição", "Magalhães", "Brandão"]
+BUSCAS = {
+    "prefixo": "mar",
+    "sem acento": "antonio conceicao",
+    "erro de digitação": "fernadna magalhaes",
+    "telefone": "(11) 98765",
+    "e-mail": "patricia.barbosa",
+}
+REPETICOES = 50
+
+def gerar(total):
+    aleatorio = random.Random(7)
+    for n in range(total):
+        nome = f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)}"
+        usuario = ".".join(nome.lower().split()[:2])
+        yield nome, f"(11) 9{8765 if n % 1000 == 0 else aleatorio.randrange(1000, 9999)}-{n % 10000:04d}", \
+            f"{usuario}{n}@email.com"
+
+def cronometrar(funcao) -> float:
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        funcao()
+    return (time.perf_counter() - inicio) / REPETICOES * 1000
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    clientes = list(gerar(total))
+    
+    indice = IndiceClientes()
+    inicio = time.perf_counter()
+    indice.adicionar_lote((nome, telefone, email, "2024-05-10") for nome, telefone, email in clientes)
+    print(f"carga em lote de {len(indice):,} clientes: {time.perf_counter() - inicio:.1f} s")
+    
+    tabela = pd.DataFrame(clientes, columns=["Nome", "Telefone", "E-mail"])
+    print(f"{'busca':<20}{'índice':>10}{'pandas':>10}  primeiro resultado")
+    for rotulo, busca in BUSCAS.items():
+        ms_indice = cronometrar(lambda: indice.buscar(busca, k=20))
+        ms_pandas = cronometrar(lambda: tabela[tabela["Nome"].str.contains(busca, case=False, regex=False)].head(20))
+        resultado = indice.buscar(busca, k=1)
+        primeiro = f"{resultado[0].nome} / {resultado[0].telefone} / {resultado[0].email}" if resultado else "-"
+        print(f"{rotulo:<20}{ms_indice:>8.2f}ms{ms_pandas:>8.2f}ms  {primeiro}")
+    
+    inicio = time.perf_counter()
+    for n in range(1000):
+        indice.adicionar(f"Cliente Novo {n}", f"(21) 91234-{n:04d}", "", "2024-05-11")
+    print(f"adicionar um cliente: {(time.perf_counter() - inicio):.3f} ms em média (1.000 inserções)")
+    print(f"busca com o delta cheio: {cronometrar(lambda: indice.buscar('cliente novo 99', k=20)):.2f} ms, "
+          f"primeiro resultado {indice.buscar('cliente novo 99', k=1)[0].nome}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""Semana de disponibilidade de todos os profissionais.
+
+Preenche a agenda de 7 dias com agendamentos aleatórios e mede a visão da
+semana (5 profissionais x 7 dias) com os mapas frios, em cache, e depois de
+um novo agendamento (que invalida só um dia de um profissional).
+
+Uso: python benchmarks/bench_disponibilidade.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configuracao_agenda import ConfiguracaoAgenda, ConfiguracoesAgenda, PROFISSIONAIS
+from disponibilidade import MotorDisponibilidade
+from repositorio_agendamentos import ConflitoAgendamento, RepositorioAgendamentos
+
+REPETICOES = 200
+
+def cronometrar(funcao, repeticoes=1) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+def main():
+    config = ConfiguracaoAgenda(intervalo=15)
+    hoje = date.today()
+    aleatorio = random.Random(7)
+    with tempfile.TemporaryDirectory() as diretorio:
+        repositorio = RepositorioAgendamentos(os.path.join(diretorio, "agendamentos.db"))
+        configuracoes = ConfiguracoesAgenda(os.path.join(diretorio, "configuracao_agenda.db"))
+        configuracoes.salvar(config)
+        motor = MotorDisponibilidade(repositorio, configuracoes)
+        for _ in range(400):
+            inicio = aleatorio.randrange(config.abertura, config.fechamento - 60, 15)
+            try:
+                repositorio.agendar(aleatorio.choice(PROFISSIONAIS), hoje + timedelta(days=aleatorio.randrange(7)),
+                                    inicio, inicio + aleatorio.choice((30, 45, 60)), "Cliente", "0", "Corte de Cabelo")
+            except ConflitoAgendamento:
+                pass
+        
+        def semana():
+            motor.semana(hoje, 30)
+        
+        print(f"semana, mapas frios:     {cronometrar(semana):7.2f} ms")
+        print(f"semana, mapas em cache:  {cronometrar(semana, REPETICOES):7.2f} ms")
+        
+        def agendar_e_ler():
+            inicio = aleatorio.randrange(config.abertura, config.fechamento - 30, 15)
+            try:
+                repositorio.agendar("Ana", hoje, inicio, inicio + 15, "Cliente", "0", "Barba")
+            except ConflitoAgendamento:
+                pass
+            motor.semana(hoje, 30)
+        print(f"agendar + semana:        {cronometrar(agendar_e_ler, 50):7.2f} ms")
+        livres = sum(len(horarios) for dias in motor.semana(hoje, 30).values() for horarios in dias.values())
+        print(f"{livres} horários livres de 30 minutos na semana")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""Exportação do CSV de vendas com 1 milhão de linhas.
+
+Mede tempo, pico de memória (tracemalloc) e tamanho do arquivo exportando
+o livro de vendas do jeito antigo (DataFrame inteiro, to_csv() numa string
+e .encode() numa cópia em bytes) e pelo exportar_csv em blocos, sem e com
+gzip. Os caminhos em blocos incluem a leitura do conteudo_download, que é
+o que o download entrega ao Streamlit: o pico acompanha o tamanho do
+arquivo (pequeno com gzip), não o da tabela montada em memória.
+
+Uso: python benchmarks/bench_exportacao.py [vendas]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exportacao import conteudo_download, exportar_csv
+from livro_vendas import CAMPOS_VENDA, LivroVendas
+
+def gerar(total):
+    for n in range(total):
+        dia = f"2024-{1 + n % 12:02d}-{1 + n % 28:02d}"
+        yield (f"VND-{n:08d}", f"{dia} 12:00:00", dia, f"Cliente {n % 5000}", f"Produto {n % 500}",
+               1 + n % 3, 5000, 5000 * (1 + n % 3), "PIX", 1, "", f"P{n % 500:03d}", "Eletrônicos")
+
+def medir(funcao):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    tamanho = funcao()
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, pico, tamanho
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "vendas.db")
+        livro = LivroVendas(caminho)
+        conn = sqlite3.connect(caminho)
+        conn.executemany(f"INSERT INTO vendas ({', '.join(CAMPOS_VENDA)}) "
+                         f"VALUES ({', '.join('?' * len(CAMPOS_VENDA))})", gerar(total))
+        conn.commit()
+        
+        def antigo():
+            tabela = pd.read_sql_query(f"SELECT {', '.join(CAMPOS_VENDA)} FROM vendas ORDER BY data", conn)
+            return len(tabela.to_csv(index=False).encode("utf-8"))
+        
+        def em_blocos(comprimir):
+            conteudo = conteudo_download(lambda: exportar_csv(
+                CAMPOS_VENDA, livro.em_blocos("2024-01-01", "2024-12-31", em_reais=True), comprimir=comprimir))
+            return len(conteudo() if callable(conteudo) else conteudo)
+        
+        print(f"{total:,} vendas{'tempo':>24}{'pico':>12}{'arquivo':>12}")
+        for rotulo, funcao in [("to_csv + encode", antigo), ("em blocos", lambda: em_blocos(False)),
+                               ("em blocos + gzip", lambda: em_blocos(True))]:
+            duracao, pico, tamanho = medir(funcao)
+            print(f"{rotulo:<24}{duracao:>10.1f} s{pico / 2**20:>9.1f} MB{tamanho / 2**20:>9.1f} MB")
+        livro.fechar()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Tempo de servidor por interação: script inteiro x fragmento da aba.
+
+Antes dos fragmentos, qualquer clique numa aba reexecutava render() com as
+quatro abas; agora só a função da aba é reexecutada. O benchmark mede as
+duas coisas com o AppTest do Streamlit.
+
+Uso: python benchmarks/bench_fragmentos.py [repetições]
+"""
+import os
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from streamlit.testing.v1 import AppTest
+
+MODULOS = {
+    "sistema_agendamento": ["_aba_novo_agendamento", "_aba_clientes", "_aba_agenda", "_aba_configuracoes"],
+    "sistema_vendas": ["_aba_dashboard", "_aba_nova_venda", "_aba_produtos", "_aba_relatorios"],
+    "sistema_financeiro": ["_aba_fluxo_caixa", "_aba_contas_pagar", "_aba_contas_receber", "_aba_relatorios"],
+    "sistema_rh": ["_aba_funcionarios", "_aba_ponto", "_aba_folha", "_aba_indicadores"],
+    "sistema_estoque": ["_aba_inventario", "_aba_entradas", "_aba_saidas", "_aba_fornecedores"],
+    "sistema_relatorios": ["_aba_gerenciais", "_aba_operacionais", "_aba_indicadores", "_aba_exportar"],
+}
+
+def script(raiz, modulo, funcao):
+    import importlib
+    import inspect
+    import sys
+    sys.path.insert(0, raiz)
+    alvo = getattr(importlib.import_module(modulo), funcao)
+    if inspect.signature(alvo).parameters:
+        # Abas que recebem dados montados pelo render (ex.: inventário)
+        import pandas as pd
+        alvo(pd.DataFrame({"Produto": ["Produto"], "Categoria": ["Outros"], "Quantidade": [1], "Mínimo": [1]}))
+    else:
+        alvo()
+
+def medir(modulo, funcao, repeticoes):
+    app = AppTest.from_function(script, args=(RAIZ, modulo, funcao), default_timeout=120)
+    app.run()  # aquece imports
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        app.run()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'módulo':<22} | {'render (antes)':>14} | " + " | ".join(f"aba {i}" for i in range(1, 5)))
+    for modulo, abas in MODULOS.items():
+        completo = medir(modulo, "render", repeticoes)
+        por_aba = [medir(modulo, aba, repeticoes) for aba in abas]
+        print(f"{modulo:<22} | {completo:>11.1f} ms | " + " | ".join(f"{t:>5.1f}" for t in por_aba) + " ms")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
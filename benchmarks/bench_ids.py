@@ -0,0 +1,60 @@
+"""Vazão do gerador de ids e teste de estresse de colisões.
+
+Uso: python benchmarks/bench_ids.py
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gerador_ids import novo_id
+
+TOTAL = 200_000
+THREADS = 8
+PROCESSOS = 4
+POR_TRABALHADOR = 50_000
+
+def gerar_lote(quantidade):
+    return [novo_id("VND") for _ in range(quantidade)]
+
+def microbenchmark():
+    inicio = time.perf_counter()
+    for _ in range(TOTAL):
+        novo_id()
+    decorrido = time.perf_counter() - inicio
+    print(f"sequencial: {TOTAL / decorrido:,.0f} ids/s ({decorrido / TOTAL * 1e6:.2f} µs/id)")
+
+def estresse_threads():
+    lotes = [None] * THREADS
+    
+    def trabalhador(i):
+        lotes[i] = gerar_lote(POR_TRABALHADOR)
+    
+    threads = [threading.Thread(target=trabalhador, args=(i,)) for i in range(THREADS)]
+    inicio = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    decorrido = time.perf_counter() - inicio
+    
+    todos = [i for lote in lotes for i in lote]
+    assert len(set(todos)) == len(todos), "colisão entre threads"
+    for lote in lotes:
+        assert lote == sorted(lote), "ids fora de ordem dentro de uma thread"
+    print(f"{THREADS} threads: {len(todos):,} ids únicos e ordenados, {len(todos) / decorrido:,.0f} ids/s")
+
+def estresse_processos():
+    with ProcessPoolExecutor(max_workers=PROCESSOS) as pool:
+        lotes = list(pool.map(gerar_lote, [POR_TRABALHADOR] * PROCESSOS))
+    todos = [i for lote in lotes for i in lote]
+    assert len(set(todos)) == len(todos), "colisão entre processos"
+    print(f"{PROCESSOS} processos: {len(todos):,} ids únicos")
+
+if __name__ == "__main__":
+    microbenchmark()
+    estresse_threads()
+    estresse_processos()
\ No newline at end of file
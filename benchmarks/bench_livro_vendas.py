@@ -0,0 +1,91 @@
+"""Vazão do livro de vendas com 1, 10 e 100 gravadores concorrentes.
+
+Cada gravador é uma thread registrando vendas sem parar, como sessões no
+pico do caixa. Mede vendas por segundo até tudo estar no banco, a latência
+de registrar() (o que o script do Streamlit sente) e o tamanho médio dos
+lotes, contra um commit por venda (conexão única protegida por lock).
+
+Uso: python benchmarks/bench_livro_vendas.py [vendas_por_rodada]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livro_vendas import CAMPOS_VENDA, LivroVendas, Venda
+
+GRAVADORES = (1, 10, 100)
+
+def _percentil(valores, q):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))]
+
+def rodar(gravadores, total, registrar):
+    por_gravador = total // gravadores
+    latencias = [[] for _ in range(gravadores)]
+    largada = threading.Barrier(gravadores + 1)
+    
+    def gravador(n):
+        largada.wait()
+        for i in range(por_gravador):
+            inicio = time.perf_counter()
+            registrar(f"Cliente {n}", "Produto A", 1 + i % 3, 5000, "PIX")
+            latencias[n].append(time.perf_counter() - inicio)
+    
+    threads = [threading.Thread(target=gravador, args=(n,)) for n in range(gravadores)]
+    for thread in threads:
+        thread.start()
+    largada.wait()
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return inicio, por_gravador * gravadores, [l for lista in latencias for l in lista]
+
+class CommitPorVenda:
+    """O jeito ingênuo: cada venda é um INSERT + COMMIT, serializado por um lock"""
+    
+    def __init__(self, caminho):
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(f"CREATE TABLE vendas ({', '.join(CAMPOS_VENDA)})")
+        self._lock = threading.Lock()
+    
+    def registrar(self, cliente, produto, quantidade, preco_unitario, forma_pagamento):
+        venda = Venda("x", "", "", cliente, produto, quantidade, preco_unitario,
+                      preco_unitario * quantidade, forma_pagamento)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(f"INSERT INTO vendas VALUES ({', '.join('?' * len(CAMPOS_VENDA))})",
+                               tuple(getattr(venda, campo) for campo in CAMPOS_VENDA))
+            self._conn.execute("COMMIT")
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    print(f"{'':<22}{'gravadores':>10}{'vendas/s':>12}{'registrar p50':>15}{'p99':>10}{'lote médio':>12}")
+    with tempfile.TemporaryDirectory() as diretorio:
+        for gravadores in GRAVADORES:
+            livro = LivroVendas(os.path.join(diretorio, f"livro_{gravadores}.db"))
+            inicio, quantidade, latencias = rodar(gravadores, total, livro.registrar)
+            livro.aguardar()
+            duracao = time.perf_counter() - inicio
+            assert livro.contar() == quantidade
+            contadores = livro.contadores()
+            livro.fechar()
+            print(f"{'group commit':<22}{gravadores:>10}{quantidade / duracao:>12,.0f}"
+                  f"{_percentil(latencias, 0.5) * 1e6:>13.1f}µs{_percentil(latencias, 0.99) * 1e6:>8.1f}µs"
+                  f"{contadores['vendas_gravadas'] / contadores['lotes']:>12.1f}")
+        
+        for gravadores in GRAVADORES:
+            ingenuo = CommitPorVenda(os.path.join(diretorio, f"ingenuo_{gravadores}.db"))
+            inicio, quantidade, latencias = rodar(gravadores, total // 10, ingenuo.registrar)
+            duracao = time.perf_counter() - inicio
+            print(f"{'commit por venda':<22}{gravadores:>10}{quantidade / duracao:>12,.0f}"
+                  f"{_percentil(latencias, 0.5) * 1e6:>13.1f}µs{_percentil(latencias, 0.99) * 1e6:>8.1f}µs{1:>12.1f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Latência de login em função do número de usuários cadastrados.
+
+Uso: python benchmarks/bench_login.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import GerenciadorUsuarios, Usuario
+from senhas import PoliticaSenha, gerar_hash
+
+TAMANHOS = [100, 10_000, 100_000, 1_000_000]
+LOGINS = 2_000
+# Custo mínimo de hash: o que se mede aqui é a busca do usuário
+POLITICA_BARATA = PoliticaSenha(algoritmo="pbkdf2_sha256", pbkdf2_iteracoes=1)
+
+def montar_gerenciador(total, diretorio):
+    gerenciador = GerenciadorUsuarios(os.path.join(diretorio, f"usuarios_{total}.json"),
+                                      politica_senha=POLITICA_BARATA)
+    senha_hash = gerar_hash("senha", POLITICA_BARATA)
+    gerenciador.usuarios.extend(
+        Usuario(
+            id=f"USR{i:08d}",
+            nome=f"Usuário {i}",
+            email=f"usuario{i}@empresa.com",
+            senha_hash=senha_hash,
+            tipo="usuario",
+            data_criacao="2024-01-01 00:00:00",
+        )
+        for i in range(total)
+    )
+    gerenciador._reindexar()
+    return gerenciador
+
+def main():
+    with tempfile.TemporaryDirectory() as diretorio:
+        print(f"{'usuários':>10} | {'µs/login':>10}")
+        for total in TAMANHOS:
+            gerenciador = montar_gerenciador(total, diretorio)
+            # Pior caso da busca linear antiga: o último usuário cadastrado
+            emails = [f"USUARIO{total - 1 - (i % 10)}@empresa.com" for i in range(LOGINS)]
+            inicio = time.perf_counter()
+            for email in emails:
+                assert gerenciador.verificar_credenciais(email, "senha") is not None
+            decorrido = time.perf_counter() - inicio
+            print(f"{total:>10} | {decorrido / LOGINS * 1e6:>10.2f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
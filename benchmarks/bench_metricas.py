@@ -0,0 +1,52 @@
+"""Custo de medir() e contar() com as métricas desligadas e ligadas.
+
+Uso: python benchmarks/bench_metricas.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["PORTAL_METRICAS_INTERVALO"] = "0"
+
+import metricas
+
+TOTAL = 1_000_000
+
+def laco_vazio():
+    for _ in range(TOTAL):
+        pass
+
+def laco_medir():
+    for _ in range(TOTAL):
+        with metricas.medir("bench"):
+            pass
+
+def laco_contar():
+    for _ in range(TOTAL):
+        metricas.contar("bench")
+
+def cronometrar(funcao) -> float:
+    inicio = time.perf_counter()
+    funcao()
+    return (time.perf_counter() - inicio) / TOTAL * 1e9
+
+def main():
+    base = cronometrar(laco_vazio)
+    print(f"laço vazio: {base:.0f} ns/iteração")
+    for estado in ("desligadas", "ligadas"):
+        if estado == "ligadas":
+            metricas.ligar()
+        else:
+            metricas.desligar()
+        print(f"métricas {estado}: medir() +{cronometrar(laco_medir) - base:.0f} ns, "
+              f"contar() +{cronometrar(laco_contar) - base:.0f} ns")
+    # As durações de um with vazio: confere que as séries registram o que foi medido
+    for linha in metricas.registro_metricas.resumo():
+        quantis = ", ".join(f"{chave[:-3]} {valor * 1e6:.0f} ns" for chave, valor in linha.items()
+                            if chave.endswith("_ms") and chave != "media_ms")
+        print(f"série {linha['nome']}: {linha['contagem']} medições, média {linha['media_ms'] * 1e6:.0f} ns, {quantis}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""Relatórios de vendas com 1 milhão de vendas espalhadas por um ano.
+
+Para cada período (Hoje, Esta Semana, Este Mês, Este Ano) mede o relatório
+por produto e por cliente no motor: a primeira vez (lendo as partições
+do mês), de novo depois de uma venda nova (só a venda entra na partição)
+e repetido sem vendas novas (cache). A comparação é ler todas as vendas
+com pandas e filtrar o período a cada relatório.
+
+Uso: python benchmarks/bench_relatorios.py [vendas]
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livro_vendas import CAMPOS_VENDA, LivroVendas
+from relatorios_vendas import COLUNAS, RELATORIOS, MotorRelatorios
+
+HOJE = date.today()
+PERIODOS = {
+    "Hoje": (HOJE, HOJE),
+    "Esta Semana": (HOJE - timedelta(days=HOJE.weekday()), HOJE),
+    "Este Mês": (HOJE.replace(day=1), HOJE),
+    "Este Ano": (HOJE - timedelta(days=364), HOJE),
+}
+TIPOS = ("Vendas por Produto", "Vendas por Cliente")
+
+def gerar(total):
+    aleatorio = random.Random(7)
+    # O livro recebe as vendas na ordem em que acontecem: dias crescentes
+    dias = sorted(aleatorio.randrange(365) for _ in range(total))
+    for n, atras in enumerate(reversed(dias)):
+        dia = (HOJE - timedelta(days=atras)).isoformat()
+        quantidade = aleatorio.randrange(1, 4)
+        yield (f"VND-{n:08d}", f"{dia} 12:00:00", dia, f"Cliente {n % 20000}", f"Produto {n % 500}", quantidade,
+               5000, 5000 * quantidade, "PIX", 1, "", f"P{n % 500:03d}", ["Eletrônicos", "Serviços"][n % 2])
+
+def cronometrar(funcao) -> float:
+    inicio = time.perf_counter()
+    funcao()
+    return (time.perf_counter() - inicio) * 1000
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "vendas.db")
+        livro = LivroVendas(caminho)
+        conn = sqlite3.connect(caminho)
+        conn.executemany(f"INSERT INTO vendas ({', '.join(CAMPOS_VENDA)}) "
+                         f"VALUES ({', '.join('?' * len(CAMPOS_VENDA))})", gerar(total))
+        conn.commit()
+        
+        def completo(tipo, inicio, fim):
+            vendas = pd.read_sql_query(f"SELECT {', '.join(COLUNAS)} FROM vendas", conn, parse_dates=["data"])
+            return RELATORIOS[tipo](vendas[vendas["data"].between(pd.Timestamp(inicio), pd.Timestamp(fim))])
+        
+        print(f"{'período':<14}{'relatório':<22}{'1ª vez':>10}{'venda nova':>12}{'cache':>10}{'tudo':>10}")
+        for periodo, (inicio, fim) in PERIODOS.items():
+            for tipo in TIPOS:
+                # Motor novo por linha: a 1ª vez lê as partições do período do zero
+                motor = MotorRelatorios(caminho)
+                primeira = cronometrar(lambda: motor.gerar(tipo, inicio, fim))
+                livro.registrar("Cliente novo", "Produto 1", 1, 5000, "PIX")
+                livro.aguardar()
+                nova = cronometrar(lambda: motor.gerar(tipo, inicio, fim))
+                cache = cronometrar(lambda: motor.gerar(tipo, inicio, fim))
+                ingenuo = cronometrar(lambda: completo(tipo, inicio, fim))
+                print(f"{periodo:<14}{tipo:<22}{primeira:>8.0f}ms{nova:>10.1f}ms{cache:>8.3f}ms{ingenuo:>8.0f}ms")
+        print(f"partições lidas no último motor: {motor.contadores()['particoes_lidas']}")
+        livro.fechar()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
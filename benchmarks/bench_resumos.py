@@ -0,0 +1,98 @@
+"""Métricas do painel de vendas com 1 milhão de vendas no livro.
+
+Preenche um livro com vendas sintéticas espalhadas por um ano, resume
+tudo com a reconstrução dos resumos e mede o que o topo da página de
+vendas e o dashboard pedem (dia, mês, 30 dias, top 5 produtos, categorias)
+lendo os resumos, contra as mesmas somas com GROUP BY sobre a tabela de
+vendas. Também mede quanto o acúmulo dos resumos custa à vazão do livro.
+
+Uso: python benchmarks/bench_resumos.py [vendas]
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livro_vendas import CAMPOS_VENDA, LivroVendas
+from resumos_vendas import ResumosVendas, acumular
+
+REPETICOES = 20
+HOJE = date(2024, 12, 20)
+
+def gerar(total):
+    aleatorio = random.Random(7)
+    for n in range(total):
+        dia = HOJE - timedelta(days=aleatorio.randrange(365))
+        quantidade = aleatorio.randrange(1, 4)
+        preco = aleatorio.randrange(1000, 50000)
+        yield (f"VND-{n}", f"{dia} 12:00:00", dia.isoformat(), f"Cliente {n % 5000}", f"Produto {n % 500}",
+               quantidade, preco, quantidade * preco, aleatorio.choice(["PIX", "Cartão", "Dinheiro"]), 1, "",
+               f"P{n % 500:03d}", f"Categoria {n % 7}")
+
+def painel_resumos(resumos):
+    resumos._data_version = None
+    resumos.do_dia(HOJE)
+    resumos.do_mes(HOJE)
+    resumos.por_dia(HOJE - timedelta(days=29), HOJE)
+    resumos.ranking("produto", HOJE, limite=5)
+    resumos.ranking("categoria", HOJE)
+
+def painel_group_by(conn):
+    mes = HOJE.strftime("%Y-%m")
+    conn.execute("SELECT COUNT(*), SUM(total) FROM vendas WHERE data = ?", (HOJE.isoformat(),)).fetchall()
+    conn.execute("SELECT COUNT(*), SUM(total) FROM vendas WHERE substr(data, 1, 7) = ?", (mes,)).fetchall()
+    conn.execute("SELECT data, SUM(total) FROM vendas WHERE data BETWEEN ? AND ? GROUP BY data",
+                 ((HOJE - timedelta(days=29)).isoformat(), HOJE.isoformat())).fetchall()
+    conn.execute("SELECT produto, SUM(quantidade), SUM(total) FROM vendas WHERE substr(data, 1, 7) = ? "
+                 "GROUP BY produto ORDER BY 3 DESC LIMIT 5", (mes,)).fetchall()
+    conn.execute("SELECT categoria, SUM(total) FROM vendas WHERE substr(data, 1, 7) = ? GROUP BY categoria",
+                 (mes,)).fetchall()
+
+def cronometrar(funcao) -> float:
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        funcao()
+    return (time.perf_counter() - inicio) / REPETICOES * 1000
+
+def vazao(caminho, com_resumos, total=20_000):
+    livro = LivroVendas(caminho)
+    if com_resumos:
+        ResumosVendas(caminho)
+        livro.na_transacao(acumular)
+    inicio = time.perf_counter()
+    for n in range(total):
+        livro.registrar(f"Cliente {n}", f"Produto {n % 500}", 1, 5000, "PIX", categoria=f"Categoria {n % 7}")
+    livro.aguardar()
+    duracao = time.perf_counter() - inicio
+    livro.fechar()
+    return total / duracao
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "vendas.db")
+        LivroVendas(caminho).fechar()
+        conn = sqlite3.connect(caminho)
+        conn.executemany(f"INSERT INTO vendas ({', '.join(CAMPOS_VENDA)}) "
+                         f"VALUES ({', '.join('?' * len(CAMPOS_VENDA))})", gerar(total))
+        conn.commit()
+        
+        resumos = ResumosVendas(caminho)
+        inicio = time.perf_counter()
+        resumos.reconstruir_se_vazio()
+        print(f"reconstrução dos resumos de {total:,} vendas: {time.perf_counter() - inicio:.1f} s")
+        
+        print(f"painel pelos resumos: {cronometrar(lambda: painel_resumos(resumos)):.2f} ms "
+              f"(em cache, sem commit novo: {cronometrar(lambda: resumos.do_mes(HOJE)) * 1000:.1f} µs)")
+        print(f"painel com GROUP BY nas vendas: {cronometrar(lambda: painel_group_by(conn)):.1f} ms")
+        
+        print(f"vazão do livro sem resumos: {vazao(os.path.join(diretorio, 'a.db'), False):,.0f} vendas/s")
+        print(f"vazão do livro com resumos: {vazao(os.path.join(diretorio, 'b.db'), True):,.0f} vendas/s")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
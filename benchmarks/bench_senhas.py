@@ -0,0 +1,45 @@
+"""Logins por segundo para cada custo de hash de senha.
+
+Uso: python benchmarks/bench_senhas.py [threads]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from senhas import PoliticaSenha, gerar_hash, verificar_senha
+
+POLITICAS = [
+    PoliticaSenha(algoritmo="scrypt", scrypt_n=2 ** 13),
+    PoliticaSenha(algoritmo="scrypt", scrypt_n=2 ** 14),
+    PoliticaSenha(algoritmo="scrypt", scrypt_n=2 ** 15),
+    PoliticaSenha(algoritmo="pbkdf2_sha256", pbkdf2_iteracoes=100_000),
+    PoliticaSenha(algoritmo="pbkdf2_sha256", pbkdf2_iteracoes=600_000),
+]
+DURACAO = 2.0
+
+def medir(politica, threads):
+    senha_hash = gerar_hash("senha-de-teste", politica)
+    total = 0
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        while time.perf_counter() - inicio < DURACAO:
+            lote = [pool.submit(verificar_senha, "senha-de-teste", senha_hash) for _ in range(threads)]
+            total += sum(1 for f in lote if f.result())
+    return total / (time.perf_counter() - inicio)
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    print(f"threads: {threads}")
+    print(f"{'política':<28} | {'logins/s':>9}")
+    for politica in POLITICAS:
+        if politica.algoritmo == "scrypt":
+            nome = f"scrypt n=2^{politica.scrypt_n.bit_length() - 1}"
+        else:
+            nome = f"pbkdf2_sha256 {politica.pbkdf2_iteracoes}"
+        print(f"{nome:<28} | {medir(politica, threads):>9.1f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""Estilo de tabelas: callbacks por célula/linha contra regras vetorizadas.
+
+Para 10 mil e 100 mil linhas, mede o cálculo dos estilos (Styler._compute)
+da coluna Status colorida por valor e da linha colorida por limite de
+estoque, do jeito antigo (Styler.map / Styler.apply(axis=1)) e com as
+regras de tabelas.py. Mede também o que o st.dataframe faz com o Styler
+(marshall_styler do Streamlit) para a tabela inteira e para uma página.
+
+Uso: python benchmarks/bench_tabelas.py [linhas ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.io.formats.style import Styler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.elements.lib.pandas_styler_utils import marshall_styler
+from streamlit.proto.ArrowData_pb2 import ArrowData
+
+from tabelas import CorPorLimite, CorPorValor, LINHAS_POR_PAGINA, VERDE, VERMELHO, AMARELO, estilizar
+
+COR_STATUS = CorPorValor("Status", {"Confirmado": VERDE, "Cancelado": VERMELHO, "Em espera": AMARELO})
+COR_ESTOQUE = CorPorLimite("Quantidade", "Mínimo", ((1.0, VERMELHO), (1.5, AMARELO)))
+
+def color_status(val):
+    if val == "Confirmado":
+        return 'background-color: #90EE90'
+    elif val == "Cancelado":
+        return 'background-color: #FFB6C1'
+    elif val == "Em espera":
+        return 'background-color: #FFE4B5'
+    return ''
+
+def highlight_estoque_baixo(row):
+    qtd = int(row['Quantidade'])
+    minimo = int(row['Mínimo'])
+    if qtd <= minimo:
+        return ['background-color: #FFB6C1'] * len(row)
+    elif qtd <= minimo * 1.5:
+        return ['background-color: #FFE4B5'] * len(row)
+    return [''] * len(row)
+
+def gerar(linhas):
+    aleatorio = np.random.default_rng(3)
+    return pd.DataFrame({
+        "Cliente": [f"Cliente {i}" for i in range(linhas)],
+        "Status": aleatorio.choice(["Confirmado", "Cancelado", "Em espera", "Concluído"], linhas),
+        "Quantidade": aleatorio.integers(0, 200, linhas),
+        "Mínimo": aleatorio.integers(5, 100, linhas),
+    })
+
+def cronometrar(funcao) -> float:
+    inicio = time.perf_counter()
+    funcao()
+    return (time.perf_counter() - inicio) * 1000
+
+def main():
+    tamanhos = [int(n) for n in sys.argv[1:]] or [10_000, 100_000]
+    # Styler.applymap virou Styler.map no pandas 2.1 (e sumiu no 3)
+    por_celula = getattr(Styler, "map", None) or Styler.applymap
+    
+    for linhas in tamanhos:
+        df = gerar(linhas)
+        print(f"--- {linhas:,} linhas")
+        print(f"status, callback por célula:  {cronometrar(lambda: por_celula(df.style, color_status, subset=['Status'])._compute()):9.1f} ms")
+        print(f"status, regra vetorizada:     {cronometrar(lambda: estilizar(df, [COR_STATUS])._compute()):9.1f} ms")
+        print(f"estoque, callback por linha:  {cronometrar(lambda: df.style.apply(highlight_estoque_baixo, axis=1)._compute()):9.1f} ms")
+        print(f"estoque, regra vetorizada:    {cronometrar(lambda: estilizar(df, [COR_ESTOQUE])._compute()):9.1f} ms")
+        
+        pagina = df.iloc[:LINHAS_POR_PAGINA]
+        if df.size <= pd.get_option("styler.render.max_elements"):
+            inteira = f"{cronometrar(lambda: marshall_styler(ArrowData(), estilizar(df, [COR_ESTOQUE]), 'b')):9.1f} ms"
+        else:
+            inteira = "     acima do limite de células do Styler"
+        print(f"st.dataframe, tabela inteira: {inteira}")
+        print(f"st.dataframe, uma página:     {cronometrar(lambda: marshall_styler(ArrowData(), estilizar(pagina, [COR_ESTOQUE]), 'b')):9.1f} ms")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,252 @@
+"""Catálogo de produtos, com chave pelo código e preços em centavos.
+
+Os produtos ficam no SQLite e, por processo, em memória: um dicionário
+código → produto, os códigos de cada categoria e uma lista ordenada das
+palavras dos nomes, onde a busca por prefixo é uma bisseção (o seletor de
+produto busca enquanto o usuário digita, sem mandar o catálogo inteiro
+para o navegador). Um produto novo entra nos índices na hora; se outro
+worker alterar o catálogo, o PRAGMA data_version avisa e tudo é relido.
+"""
+import sqlite3
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass, fields, replace
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from texto import normalizar
+
+CATEGORIAS = ["Eletrônicos", "Vestuário", "Alimentos", "Serviços", "Outros"]
+
+@dataclass(frozen=True)
+class Produto:
+    codigo: str
+    nome: str
+    categoria: str
+    preco: int
+    estoque: int = 0
+
+CAMPOS_PRODUTO = tuple(campo.name for campo in fields(Produto))
+
+# Catálogo inicial de um banco novo
+PRODUTOS_INICIAIS = [
+    Produto("P001", "Produto A", "Eletrônicos", 5000, 45),
+    Produto("P002", "Produto B", "Vestuário", 7500, 32),
+    Produto("P003", "Produto C", "Eletrônicos", 12000, 18),
+    Produto("P004", "Produto D", "Alimentos", 2500, 67),
+    Produto("P005", "Produto E", "Serviços", 20000, 999),
+    Produto("S001", "Serviço X", "Serviços", 20000, 999),
+    Produto("S002", "Serviço Y", "Serviços", 15000, 999),
+]
+
+PREFIXO_CODIGO = "P"
+TENTATIVAS_CODIGO = 3
+
+def _numero_codigo(codigo: str) -> int:
+    """Número de um código gerado (P001 → 1); 0 para códigos de outro formato"""
+    numero = codigo[len(PREFIXO_CODIGO):]
+    return int(numero) if codigo.startswith(PREFIXO_CODIGO) and numero.isdigit() else 0
+
+class CatalogoProdutos:
+    def __init__(self, caminho: str = "produtos.db"):
+        self.caminho = caminho
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, timeout=30, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS produtos (
+                    codigo TEXT PRIMARY KEY,
+                    nome TEXT NOT NULL,
+                    categoria TEXT NOT NULL,
+                    preco INTEGER NOT NULL,
+                    estoque INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            if self._conn.execute("SELECT COUNT(*) FROM produtos").fetchone()[0] == 0:
+                self._inserir(PRODUTOS_INICIAIS)
+            self._data_version = None
+            self._sincronizar()
+    
+    def _inserir(self, produtos: List[Produto]):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._executar_insercao(produtos)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+    
+    def _executar_insercao(self, produtos: List[Produto]):
+        self._conn.executemany(
+            f"INSERT INTO produtos ({', '.join(CAMPOS_PRODUTO)}) VALUES ({', '.join('?' * len(CAMPOS_PRODUTO))})",
+            [tuple(getattr(p, campo) for campo in CAMPOS_PRODUTO) for p in produtos]
+        )
+    
+    def _indexar(self, produto: Produto):
+        self._por_codigo[produto.codigo] = produto
+        self._por_categoria.setdefault(produto.categoria, []).append(produto.codigo)
+        nome = normalizar(produto.nome)
+        insort(self._nomes, (nome, produto.codigo))
+        insort(self._codigos, (produto.codigo.lower(), produto.codigo))
+        for palavra in set(nome.split()):
+            insort(self._palavras, (palavra, produto.codigo))
+        self._ultimo_numero = max(self._ultimo_numero, _numero_codigo(produto.codigo))
+        self._geracao += 1
+    
+    def _sincronizar(self):
+        """Relê o catálogo se outra conexão gravou desde a última leitura"""
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+        self._por_codigo: Dict[str, Produto] = {}
+        self._por_categoria: Dict[str, List[str]] = {}
+        self._nomes: List[Tuple[str, str]] = []
+        self._codigos: List[Tuple[str, str]] = []
+        self._palavras: List[Tuple[str, str]] = []
+        self._geracao = getattr(self, "_geracao", 0) + 1
+        self._tabela: Optional[Tuple[int, pd.DataFrame]] = None
+        produtos = [Produto(*linha) for linha in self._conn.execute(
+            f"SELECT {', '.join(CAMPOS_PRODUTO)} FROM produtos"
+        )]
+        for produto in produtos:
+            self._por_codigo[produto.codigo] = produto
+            self._por_categoria.setdefault(produto.categoria, []).append(produto.codigo)
+        # Em lote, ordenar uma vez sai mais barato que insort produto a produto
+        self._nomes = sorted((normalizar(p.nome), p.codigo) for p in produtos)
+        self._codigos = sorted((p.codigo.lower(), p.codigo) for p in produtos)
+        self._palavras = sorted({(palavra, nome_codigo[1]) for nome_codigo in self._nomes
+                                 for palavra in nome_codigo[0].split()})
+        self._ultimo_numero = max((_numero_codigo(p.codigo) for p in produtos), default=0)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._sincronizar()
+            return len(self._por_codigo)
+    
+    def obter(self, codigo: str) -> Optional[Produto]:
+        with self._lock:
+            self._sincronizar()
+            return self._por_codigo.get(codigo)
+    
+    def categorias(self) -> List[str]:
+        with self._lock:
+            self._sincronizar()
+            return sorted(self._por_categoria)
+    
+    def da_categoria(self, categoria: str) -> List[Produto]:
+        with self._lock:
+            self._sincronizar()
+            return [self._por_codigo[codigo] for codigo in self._por_categoria.get(categoria, [])]
+    
+    @staticmethod
+    def _com_prefixo(ordenada: List[Tuple[str, str]], prefixo: str):
+        for i in range(bisect_left(ordenada, (prefixo,)), len(ordenada)):
+            chave, codigo = ordenada[i]
+            if not chave.startswith(prefixo):
+                return
+            yield codigo
+    
+    def buscar(self, texto: str, limite: int = 20) -> List[Produto]:
+        """Produtos cujo código começa com o texto ou cujo nome tem palavras começando com cada termo"""
+        termos = normalizar(texto).split()
+        with self._lock:
+            self._sincronizar()
+            if not termos:
+                return [self._por_codigo[codigo] for _, codigo in self._nomes[:limite]]
+            
+            encontrados: Dict[str, Produto] = {}
+            if len(termos) == 1:
+                for codigo in self._com_prefixo(self._codigos, termos[0]):
+                    encontrados[codigo] = self._por_codigo[codigo]
+                    if len(encontrados) >= limite:
+                        return list(encontrados.values())
+            # Candidatos pelo termo mais longo (o mais seletivo); os outros filtram
+            termos.sort(key=len, reverse=True)
+            for codigo in self._com_prefixo(self._palavras, termos[0]):
+                if codigo in encontrados:
+                    continue
+                produto = self._por_codigo[codigo]
+                palavras = normalizar(produto.nome).split()
+                if all(any(p.startswith(termo) for p in palavras) for termo in termos[1:]):
+                    encontrados[codigo] = produto
+                    if len(encontrados) >= limite:
+                        break
+            return list(encontrados.values())
+    
+    def tabela(self, categoria: Optional[str] = None) -> pd.DataFrame:
+        """Catálogo em DataFrame (preço em reais), montado uma vez por versão"""
+        with self._lock:
+            self._sincronizar()
+            if self._tabela is None or self._tabela[0] != self._geracao:
+                produtos = [self._por_codigo[codigo] for _, codigo in self._nomes]
+                self._tabela = (self._geracao, pd.DataFrame({
+                    "Código": [p.codigo for p in produtos],
+                    "Produto": [p.nome for p in produtos],
+                    "Categoria": [p.categoria for p in produtos],
+                    "Preço": [p.preco / 100 for p in produtos],
+                    "Estoque": [p.estoque for p in produtos],
+                }))
+            tabela = self._tabela[1]
+        if categoria:
+            return tabela[tabela["Categoria"] == categoria]
+        return tabela
+    
+    def adicionar(self, nome: str, categoria: str, preco: int, estoque: int = 0) -> Produto:
+        """Cadastra o produto (preço em centavos) com o próximo código livre"""
+        nome = nome.strip()
+        if not nome:
+            raise ValueError("Informe o nome do produto")
+        if preco <= 0:
+            raise ValueError("O preço precisa ser positivo")
+        if estoque < 0:
+            raise ValueError("O estoque não pode ser negativo")
+        with self._lock:
+            for _ in range(TENTATIVAS_CODIGO):
+                # A transação segura a escrita entre workers: o próximo código é
+                # calculado com o catálogo relido dentro dela, não com o cache
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._sincronizar()
+                    produto = Produto(f"{PREFIXO_CODIGO}{self._ultimo_numero + 1:03d}", nome, categoria, preco, estoque)
+                    self._executar_insercao([produto])
+                    self._conn.execute("COMMIT")
+                except sqlite3.IntegrityError:
+                    # Código gravado por fora do catálogo: relê tudo e tenta o seguinte
+                    self._conn.execute("ROLLBACK")
+                    self._data_version = None
+                    continue
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                # data_version só muda com gravações de outras conexões: aqui basta indexar
+                self._indexar(produto)
+                return produto
+        raise ValueError("Não foi possível gerar um código livre para o produto; tente de novo")
+    
+    def ajustar_estoque(self, codigo: str, quantidade: int) -> Produto:
+        """Soma `quantidade` (negativa para saída) ao estoque do produto"""
+        with self._lock:
+            self._sincronizar()
+            produto = self._por_codigo.get(codigo)
+            if produto is None:
+                raise ValueError(f"Produto {codigo} não encontrado no catálogo")
+            # A condição fica no UPDATE: vale mesmo se outro worker mexeu no estoque agora
+            cursor = self._conn.execute(
+                "UPDATE produtos SET estoque = estoque + ? WHERE codigo = ? AND estoque + ? >= 0",
+                (quantidade, codigo, quantidade)
+            )
+            if cursor.rowcount == 0:
+                raise ValueError(f"Estoque insuficiente de {produto.nome} ({produto.estoque} em estoque)")
+            estoque = self._conn.execute("SELECT estoque FROM produtos WHERE codigo = ?", (codigo,)).fetchone()[0]
+            produto = self._por_codigo[codigo] = replace(produto, estoque=estoque)
+            self._geracao += 1
+            return produto
+
+@st.cache_resource
+def obter_catalogo_produtos() -> CatalogoProdutos:
+    """Catálogo do processo, compartilhado pelas sessões"""
+    return CatalogoProdutos()
\ No newline at end of file
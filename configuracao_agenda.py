@@ -0,0 +1,142 @@
+"""Configuração da agenda, persistida e versionada.
+
+Cada gravação que muda algo cria uma nova versão (o histórico fica no
+banco). Os caches derivados da configuração se registram com ao_alterar()
+e são avisados só quando a versão muda, seja por gravação neste processo
+ou de outro worker.
+"""
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import streamlit as st
+
+PROFISSIONAIS = ["João", "Maria", "Carlos", "Ana", "Pedro"]
+
+# Duração de cada serviço, em minutos
+DURACAO_SERVICOS = {
+    "Corte de Cabelo": 30,
+    "Barba": 30,
+    "Corte + Barba": 60,
+    "Coloração": 90,
+    "Hidratação": 60,
+    "Manicure": 45,
+    "Pedicure": 45,
+}
+
+@dataclass(frozen=True)
+class ConfiguracaoAgenda:
+    """Horário de funcionamento (em minutos desde a meia-noite) e grade"""
+    abertura: int = 8 * 60
+    fechamento: int = 19 * 60
+    intervalo: int = 30
+    profissionais_ativos: Tuple[str, ...] = tuple(PROFISSIONAIS)
+    servicos_ativos: Tuple[str, ...] = ("Corte de Cabelo", "Barba", "Manicure", "Pedicure")
+    duracao_servicos: Dict[str, int] = field(default_factory=lambda: dict(DURACAO_SERVICOS), hash=False)
+    
+    def duracao(self, servico: str) -> int:
+        return self.duracao_servicos.get(servico, self.intervalo)
+    
+    def validar(self):
+        """Levanta ValueError se a configuração não permite nenhum agendamento"""
+        if self.fechamento <= self.abertura:
+            raise ValueError("O fechamento precisa ser depois da abertura")
+        if self.intervalo <= 0:
+            raise ValueError("O intervalo precisa ser positivo")
+        if not self.profissionais_ativos:
+            raise ValueError("Selecione ao menos um profissional")
+        if not self.servicos_ativos:
+            raise ValueError("Selecione ao menos um serviço")
+    
+    @classmethod
+    def de_dict(cls, dados: dict) -> "ConfiguracaoAgenda":
+        dados = dict(dados)
+        dados["profissionais_ativos"] = tuple(dados.get("profissionais_ativos", ()))
+        dados["servicos_ativos"] = tuple(dados.get("servicos_ativos", ()))
+        return cls(**dados)
+
+class ConfiguracoesAgenda:
+    def __init__(self, caminho: str = "configuracao_agenda.db"):
+        self.caminho = caminho
+        self._ouvintes: List[Callable[[int, ConfiguracaoAgenda], None]] = []
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, timeout=30, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS configuracoes (
+                    versao INTEGER PRIMARY KEY,
+                    dados TEXT NOT NULL,
+                    salvo_em TEXT NOT NULL,
+                    salvo_por TEXT NOT NULL DEFAULT ''
+                )
+            """)
+            self._data_version = None
+            self._versao, self._config = 0, ConfiguracaoAgenda()
+            self._recarregar()
+    
+    def ao_alterar(self, ouvinte: Callable[[int, ConfiguracaoAgenda], None]):
+        """Registra ouvinte(versao, configuracao) chamado quando a versão muda"""
+        self._ouvintes.append(ouvinte)
+    
+    def _recarregar(self):
+        # data_version muda quando outra conexão confirma uma transação
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+        linha = self._conn.execute(
+            "SELECT versao, dados FROM configuracoes ORDER BY versao DESC LIMIT 1"
+        ).fetchone()
+        if linha is not None and linha[0] != self._versao:
+            self._definir(linha[0], ConfiguracaoAgenda.de_dict(json.loads(linha[1])))
+    
+    def _definir(self, versao: int, config: ConfiguracaoAgenda):
+        self._versao, self._config = versao, config
+        for ouvinte in self._ouvintes:
+            ouvinte(versao, config)
+    
+    def atual(self) -> Tuple[int, ConfiguracaoAgenda]:
+        """(versão, configuração) vigentes; versão 0 é o padrão nunca salvo"""
+        with self._lock:
+            self._recarregar()
+            return self._versao, self._config
+    
+    def salvar(self, config: ConfiguracaoAgenda, autor: str = "") -> int:
+        """Grava uma nova versão se algo mudou; devolve a versão vigente"""
+        config.validar()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._recarregar()
+                if config == self._config:
+                    self._conn.execute("ROLLBACK")
+                    return self._versao
+                cursor = self._conn.execute(
+                    "INSERT INTO configuracoes (dados, salvo_em, salvo_por) VALUES (?, ?, ?)",
+                    (json.dumps(asdict(config), ensure_ascii=False),
+                     datetime.now().strftime("%Y-%m-%d %H:%M:%S"), autor)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._definir(cursor.lastrowid, config)
+            return self._versao
+    
+    def historico(self, limite: int = 10) -> List[dict]:
+        """Últimas versões gravadas, da mais recente para a mais antiga"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT versao, salvo_em, salvo_por FROM configuracoes ORDER BY versao DESC LIMIT ?", (limite,)
+            )
+            return [{"versao": v, "salvo_em": em, "salvo_por": por} for v, em, por in cursor]
+
+@st.cache_resource
+def obter_configuracoes_agenda() -> ConfiguracoesAgenda:
+    """Configuração compartilhada pelas sessões do processo"""
+    return ConfiguracoesAgenda()
\ No newline at end of file
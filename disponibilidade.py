@@ -0,0 +1,136 @@
+"""Horários livres por profissional, calculados sobre um mapa de minutos.
+
+Para cada (profissional, dia) o motor guarda a soma acumulada dos minutos
+ocupados (1441 posições em int16). Com ela, saber se [s, s + duração) está
+livre é prefixo[s + duração] - prefixo[s] == 0, e a grade inteira do dia
+sai numa única operação vetorizada do numpy. O mapa é refeito só quando o
+repositório avisa que a agenda daquele profissional naquele dia mudou.
+
+A grade de inícios de cada duração e os horários livres já calculados
+também ficam em cache; a grade depende só da configuração e é descartada
+quando sai uma nova versão dela.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import streamlit as st
+
+from configuracao_agenda import ConfiguracaoAgenda, ConfiguracoesAgenda, obter_configuracoes_agenda
+from repositorio_agendamentos import RepositorioAgendamentos, obter_repositorio_agendamentos
+
+MINUTOS_DIA = 24 * 60
+
+class MotorDisponibilidade:
+    def __init__(self, repositorio: RepositorioAgendamentos, configuracoes: ConfiguracoesAgenda,
+                 max_dias_cache: int = 2048):
+        self.repositorio = repositorio
+        self.configuracoes = configuracoes
+        self.max_dias_cache = max_dias_cache
+        self._prefixos: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._livres: Dict[Tuple[str, str, int], List[int]] = {}
+        self._grades: Dict[int, np.ndarray] = {}
+        self._geracao = 0
+        self._lock = threading.Lock()
+        repositorio.ao_alterar(self.invalidar)
+        configuracoes.ao_alterar(self._configuracao_alterada)
+    
+    def invalidar(self, profissional: Optional[str] = None, dia: Optional[str] = None):
+        """Descarta o mapa e os horários de um (profissional, dia), ou de todos"""
+        with self._lock:
+            self._geracao += 1
+            if profissional is None:
+                self._prefixos.clear()
+                self._livres.clear()
+            else:
+                self._prefixos.pop((profissional, dia), None)
+                for chave in [c for c in self._livres if c[0] == profissional and c[1] == dia]:
+                    del self._livres[chave]
+    
+    def _configuracao_alterada(self, versao: int, config: ConfiguracaoAgenda):
+        # Os mapas de ocupação continuam valendo; grade e horários livres não
+        with self._lock:
+            self._geracao += 1
+            self._grades.clear()
+            self._livres.clear()
+    
+    def _grade(self, config: ConfiguracaoAgenda, duracao: int) -> np.ndarray:
+        grade = self._grades.get(duracao)
+        if grade is None:
+            grade = self._grades[duracao] = np.arange(config.abertura, config.fechamento - duracao + 1,
+                                                      config.intervalo)
+        return grade
+    
+    def _montar_prefixo(self, profissional: str, dia: str) -> np.ndarray:
+        ocupados = self.repositorio.ocupados(profissional, dia)
+        variacao = np.zeros(MINUTOS_DIA + 1, dtype=np.int16)
+        if ocupados:
+            intervalos = np.asarray(ocupados, dtype=np.int64)
+            np.add.at(variacao, intervalos[:, 0], 1)
+            np.add.at(variacao, intervalos[:, 1], -1)
+        ocupado = np.cumsum(variacao[:MINUTOS_DIA]) > 0
+        prefixo = np.zeros(MINUTOS_DIA + 1, dtype=np.int16)
+        np.cumsum(ocupado, out=prefixo[1:])
+        return prefixo
+    
+    def _prefixo(self, profissional: str, dia: str) -> np.ndarray:
+        chave = (profissional, dia)
+        with self._lock:
+            prefixo = self._prefixos.get(chave)
+            if prefixo is not None:
+                self._prefixos.move_to_end(chave)
+                return prefixo
+            geracao = self._geracao
+        prefixo = self._montar_prefixo(profissional, dia)
+        with self._lock:
+            if geracao != self._geracao:
+                # A agenda mudou durante a montagem: usa o mapa, mas não guarda
+                return prefixo
+            self._prefixos[chave] = prefixo
+            while len(self._prefixos) > self.max_dias_cache:
+                self._prefixos.popitem(last=False)
+        return prefixo
+    
+    def horarios_livres(self, profissional: str, data: date, duracao: int,
+                        a_partir_de: Optional[int] = None) -> List[int]:
+        """Inícios (em minutos) da grade em que o serviço cabe sem conflito"""
+        _, config = self.configuracoes.atual()
+        self.repositorio.sincronizar()
+        if profissional not in config.profissionais_ativos:
+            return []
+        
+        chave = (profissional, data.isoformat(), duracao)
+        livres = self._livres.get(chave)
+        if livres is None:
+            with self._lock:
+                geracao = self._geracao
+                inicios = self._grade(config, duracao)
+            livres = []
+            if len(inicios):
+                prefixo = self._prefixo(profissional, chave[1])
+                livres = inicios[prefixo[inicios + duracao] == prefixo[inicios]].tolist()
+            with self._lock:
+                if geracao == self._geracao:
+                    if len(self._livres) >= self.max_dias_cache * 8:
+                        self._livres.clear()
+                    self._livres[chave] = livres
+        
+        if a_partir_de is not None:
+            return [inicio for inicio in livres if inicio >= a_partir_de]
+        return livres
+    
+    def semana(self, inicio: date, duracao: int, dias: int = 7) -> Dict[str, Dict[date, List[int]]]:
+        """Horários livres de todos os profissionais ativos em `dias` dias"""
+        _, config = self.configuracoes.atual()
+        datas = [inicio + timedelta(days=i) for i in range(dias)]
+        return {
+            profissional: {data: self.horarios_livres(profissional, data, duracao) for data in datas}
+            for profissional in config.profissionais_ativos
+        }
+
+@st.cache_resource
+def obter_motor_disponibilidade() -> MotorDisponibilidade:
+    """Motor do processo, ligado ao repositório compartilhado"""
+    return MotorDisponibilidade(obter_repositorio_agendamentos(), obter_configuracoes_agenda())
\ No newline at end of file
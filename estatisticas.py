@@ -0,0 +1,184 @@
+"""Números dos cards do dashboard, mantidos de forma incremental.
+
+Os módulos chamam registrar() no momento em que gravam algo (um agendamento,
+uma venda, um relatório...). Cada registro vira uma linha num log
+append-only compartilhado pelos workers e soma um delta ao contador em
+memória; o dashboard só lê os textos já formatados, sem varrer dados.
+
+Linha do log: "<plataforma> <dia ISO, ou - para totais> <delta>".
+
+Um indicador com fonte não usa o log: o valor é lido da fonte de verdade a
+cada ttl. É o caso das vendas, lidas dos resumos gravados na mesma
+transação do livro; uma venda aceita na fila mas recusada pelo gravador
+não entra no card.
+
+Só têm indicador as plataformas cujo número nasce dos registros: contagens
+do dia, que começam em zero. Estoque, RH e financeiro exibiriam saldos
+(itens, funcionários, contas a pagar) que dependem de dados anteriores ao
+log e que esses módulos ainda não guardam; o card deles mantém o texto
+fixo da plataforma até existir uma fonte para semear o contador.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Optional, Tuple
+
+import streamlit as st
+
+from resumos_vendas import obter_resumos_vendas
+from travas import trava_arquivo
+
+logger = logging.getLogger(__name__)
+
+def _milhar(valor: float) -> str:
+    return f"{valor:,.0f}".replace(",", ".")
+
+@dataclass(frozen=True)
+class Indicador:
+    """Como o contador de uma plataforma é acumulado e exibido no card"""
+    formato: Callable[[float], str]
+    diario: bool = False
+    # Lê o valor da fonte de verdade (a cada ttl) em vez de somar o log
+    fonte: Optional[Callable[[], float]] = None
+
+def _vendas_de_hoje() -> float:
+    """Faturamento de hoje, em reais, pelos resumos do livro de vendas"""
+    return obter_resumos_vendas().do_dia(date.today()).faturamento / 100
+
+INDICADORES: Dict[str, Indicador] = {
+    "agendamento": Indicador(lambda v: f"{_milhar(v)} agendamentos hoje", diario=True),
+    "vendas": Indicador(lambda v: f"R$ {_milhar(v)} em vendas hoje", diario=True, fonte=_vendas_de_hoje),
+    "relatorios": Indicador(lambda v: f"{_milhar(v)} relatórios gerados hoje", diario=True),
+}
+
+class PainelEstatisticas:
+    """Contadores por plataforma com leitura O(1) e cache de ttl segundos.
+    
+    Dentro do ttl, texto() devolve o valor em cache; depois dele faz um stat
+    no log e lê só as linhas acrescentadas por outros workers.
+    """
+    
+    def __init__(self, caminho: str = "estatisticas_plataformas.log", ttl: float = 30.0,
+                 indicadores: Optional[Dict[str, Indicador]] = None, limite_compactacao: int = 50_000):
+        self.caminho = caminho
+        self.ttl = ttl
+        self.indicadores = indicadores or INDICADORES
+        self.limite_compactacao = limite_compactacao
+        self._contadores: Dict[Tuple[str, str], float] = {}
+        self._textos: Dict[str, str] = {}
+        self._dia_textos = None
+        self._expira = 0.0
+        self._posicao = 0
+        self._inode = None
+        self._arquivo = None
+        self._linhas = 0
+        self._lock = threading.Lock()
+    
+    def _chave_dia(self, plataforma_id: str, dia: Optional[date]) -> str:
+        if not self.indicadores[plataforma_id].diario:
+            return "-"
+        return (dia or date.today()).isoformat()
+    
+    def _sincronizar(self):
+        try:
+            info = os.stat(self.caminho)
+        except FileNotFoundError:
+            return
+        if info.st_size == self._posicao and info.st_ino == self._inode:
+            return
+        if info.st_ino != self._inode or info.st_size < self._posicao:
+            # Arquivo novo ou compactado por outro worker: relê do início
+            self._contadores = {}
+            self._posicao = 0
+            self._linhas = 0
+            self._abrir()
+        self._arquivo.seek(self._posicao)
+        for linha in self._arquivo:
+            if not linha.endswith("\n"):
+                break
+            plataforma_id, dia, delta = linha.split()
+            chave = (plataforma_id, dia)
+            self._contadores[chave] = self._contadores.get(chave, 0.0) + float(delta)
+            self._posicao += len(linha.encode("utf-8"))
+            self._linhas += 1
+        self._dia_textos = None
+    
+    def _abrir(self):
+        """Troca o arquivo lido pelo que está no caminho agora.
+        
+        O anterior fica aberto até aqui: enquanto isso o inode dele não pode
+        ser reaproveitado pelo arquivo compactado, e a troca não passa
+        despercebida por um inode repetido.
+        """
+        arquivo = open(self.caminho, "r", encoding="utf-8")
+        if self._arquivo is not None:
+            self._arquivo.close()
+        self._arquivo = arquivo
+        self._inode = os.fstat(arquivo.fileno()).st_ino
+    
+    def _atualizar_textos(self):
+        hoje = date.today().isoformat()
+        if self._dia_textos == hoje:
+            return
+        # Os textos dos indicadores com fonte só mudam em _ler_fontes()
+        textos = {plataforma_id: texto for plataforma_id, texto in self._textos.items()
+                  if self.indicadores[plataforma_id].fonte is not None}
+        for plataforma_id, indicador in self.indicadores.items():
+            if indicador.fonte is None:
+                chave = (plataforma_id, hoje if indicador.diario else "-")
+                textos[plataforma_id] = indicador.formato(self._contadores.get(chave, 0.0))
+        self._textos = textos
+        self._dia_textos = hoje
+    
+    def _ler_fontes(self):
+        for plataforma_id, indicador in self.indicadores.items():
+            if indicador.fonte is None:
+                continue
+            try:
+                self._textos[plataforma_id] = indicador.formato(indicador.fonte())
+            except Exception:
+                # Sem a fonte, o card volta ao texto fixo da plataforma
+                logger.exception("Falha ao ler o indicador de %s", plataforma_id)
+                self._textos.pop(plataforma_id, None)
+    
+    def texto(self, plataforma_id: str) -> Optional[str]:
+        """Texto do card; None se a plataforma não tem indicador"""
+        agora = time.monotonic()
+        if agora >= self._expira:
+            with self._lock:
+                if agora >= self._expira:
+                    self._sincronizar()
+                    self._atualizar_textos()
+                    self._ler_fontes()
+                    self._expira = agora + self.ttl
+        return self._textos.get(plataforma_id)
+    
+    def registrar(self, plataforma_id: str, delta: float = 1, dia: Optional[date] = None):
+        """Soma delta ao contador da plataforma (no dia indicado, se for diário)"""
+        linha = f"{plataforma_id} {self._chave_dia(plataforma_id, dia)} {delta}\n"
+        with self._lock, trava_arquivo(self.caminho):
+            with open(self.caminho, "a", encoding="utf-8") as f:
+                f.write(linha)
+            self._sincronizar()
+            self._atualizar_textos()
+            if self._linhas > self.limite_compactacao:
+                self._compactar()
+    
+    def _compactar(self):
+        """Regrava o log com uma linha por contador (com a trava de arquivo)"""
+        caminho_tmp = f"{self.caminho}.{os.getpid()}.tmp"
+        with open(caminho_tmp, "w", encoding="utf-8") as f:
+            f.writelines(f"{plataforma_id} {dia} {valor}\n"
+                         for (plataforma_id, dia), valor in self._contadores.items())
+        os.replace(caminho_tmp, self.caminho)
+        self._abrir()
+        self._posicao = os.fstat(self._arquivo.fileno()).st_size
+        self._linhas = len(self._contadores)
+
+@st.cache_resource
+def obter_painel_estatisticas() -> PainelEstatisticas:
+    """Painel único do processo, usado pelo dashboard e pelos módulos"""
+    return PainelEstatisticas()
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Exportação de tabelas grandes para CSV sem montar o arquivo em memória.
+
+As linhas chegam em blocos (um fetchmany do banco, por exemplo) e vão
+direto para um SpooledTemporaryFile: arquivos pequenos ficam em memória,
+os maiores passam para o disco ao cruzar limite_memoria. Enquanto o CSV é
+montado não existe a string inteira nem a cópia em bytes dela; com gzip o
+que sai do arquivo já é comprimido. O arquivo volta posicionado no início,
+pronto para ser lido pelo download.
+
+O spool limita só a memória da montagem. O st.download_button não aceita
+um stream: o que data (ou o callable) devolve é convertido em bytes e fica
+no armazenamento de mídia do Streamlit até a sessão descartá-lo, então o
+download em si ocupa o tamanho do arquivo (o comprimido, com gzip).
+
+conteudo_download() entrega ao st.download_button um callable: o Streamlit
+só gera o arquivo quando alguém clica em baixar, e guarda os bytes uma
+única vez. Em versões sem esse suporte, o arquivo é gerado na hora.
+"""
+import csv
+import gzip
+import io
+import tempfile
+from typing import Callable, Iterable, Sequence, Union
+
+LIMITE_MEMORIA = 8 * 1024 * 1024
+
+# download_button(data=callable) chegou junto com add_deferred no gerenciador de arquivos
+try:
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    DOWNLOAD_ADIADO = hasattr(MediaFileManager, "add_deferred")
+except ImportError:
+    DOWNLOAD_ADIADO = False
+
+def exportar_csv(cabecalho: Sequence[str], blocos: Iterable[Sequence[Sequence]], comprimir: bool = False,
+                 limite_memoria: int = LIMITE_MEMORIA) -> tempfile.SpooledTemporaryFile:
+    """Grava cabeçalho e blocos de linhas num arquivo temporário (CSV ou CSV.gz)"""
+    arquivo = tempfile.SpooledTemporaryFile(max_size=limite_memoria, mode="w+b")
+    try:
+        # GzipFile sobre um fileobj não o fecha; o TextIOWrapper é desligado no fim pelo mesmo motivo
+        destino = gzip.GzipFile(fileobj=arquivo, mode="wb") if comprimir else arquivo
+        texto = io.TextIOWrapper(destino, encoding="utf-8", newline="")
+        escritor = csv.writer(texto)
+        escritor.writerow(cabecalho)
+        for bloco in blocos:
+            escritor.writerows(bloco)
+        texto.flush()
+        texto.detach()
+        if comprimir:
+            destino.close()
+        arquivo.seek(0)
+        return arquivo
+    except BaseException:
+        arquivo.close()
+        raise
+
+def conteudo_download(gerar: Callable[[], tempfile.SpooledTemporaryFile]) -> Union[Callable[[], bytes], bytes]:
+    """Valor para download_button(data=...): o arquivo de gerar() só é montado no clique e lido inteiro em bytes"""
+    def ler() -> bytes:
+        with gerar() as arquivo:
+            return arquivo.read()
+    return ler if DOWNLOAD_ADIADO else ler()
\ No newline at end of file
@@ -0,0 +1,26 @@
+import functools
+
+import streamlit as st
+
+from metricas import medir
+
+# st.fragment chegou no Streamlit 1.37 (antes, st.experimental_fragment).
+# Em versões sem suporte a função roda normalmente, junto com o script.
+_decorador = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+def fragmento(func=None, **opcoes):
+    """Executa a função como fragmento (cronometrado): interações nela só reexecutam ela mesma"""
+    if func is None:
+        return lambda f: fragmento(f, **opcoes)
+    
+    modulo = "app" if func.__module__ == "__main__" else func.__module__
+    nome = f"fragmento:{modulo}.{func.__name__}"
+    
+    @functools.wraps(func)
+    def cronometrado(*args, **kwargs):
+        with medir(nome):
+            return func(*args, **kwargs)
+    
+    if _decorador is None:
+        return cronometrado
+    return _decorador(cronometrado, **opcoes) if opcoes else _decorador(cronometrado)
\ No newline at end of file
@@ -0,0 +1,55 @@
+import os
+import threading
+import time
+
+# Identificadores no estilo ULID: 48 bits de milissegundos + 80 bits
+# aleatórios, em Base32 de Crockford (26 caracteres, ordenáveis como texto).
+# Dentro do mesmo milissegundo a parte aleatória é incrementada, então os
+# ids de um processo são estritamente crescentes; entre processos, 80 bits
+# aleatórios tornam colisões desprezíveis.
+
+ALFABETO = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_MAXIMO_ALEATORIO = (1 << 80) - 1
+
+_lock = threading.Lock()
+_ultimo_ms = 0
+_ultimo_aleatorio = 0
+
+def _codificar(valor: int, tamanho: int) -> str:
+    caracteres = []
+    for _ in range(tamanho):
+        valor, resto = divmod(valor, 32)
+        caracteres.append(ALFABETO[resto])
+    return "".join(reversed(caracteres))
+
+def _reiniciar_apos_fork():
+    global _lock, _ultimo_ms, _ultimo_aleatorio
+    _lock = threading.Lock()
+    _ultimo_ms = 0
+    _ultimo_aleatorio = 0
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reiniciar_apos_fork)
+
+def novo_id(prefixo: str = "") -> str:
+    """Gera um id único, crescente no tempo, com prefixo opcional (ex.: "USR")"""
+    global _ultimo_ms, _ultimo_aleatorio
+    with _lock:
+        agora_ms = time.time_ns() // 1_000_000
+        if agora_ms > _ultimo_ms:
+            _ultimo_ms = agora_ms
+            _ultimo_aleatorio = int.from_bytes(os.urandom(10), "big")
+        else:
+            # Mesmo milissegundo ou relógio voltou: mantém a ordem incrementando
+            _ultimo_aleatorio += 1
+            if _ultimo_aleatorio > _MAXIMO_ALEATORIO:
+                _ultimo_ms += 1
+                _ultimo_aleatorio = int.from_bytes(os.urandom(10), "big")
+        return prefixo + _codificar(_ultimo_ms, 10) + _codificar(_ultimo_aleatorio, 16)
+
+def instante_do_id(identificador: str, prefixo: str = "") -> float:
+    """Timestamp (segundos) embutido no id"""
+    valor = 0
+    for caractere in identificador[len(prefixo):len(prefixo) + 10]:
+        valor = valor * 32 + ALFABETO.index(caractere)
+    return valor / 1000
\ No newline at end of file
@@ -0,0 +1,142 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+Acesso = Tuple[str, float]
+
+class AnelAcessos:
+    """Buffer circular de tamanho fixo com (plataforma, instante) de um usuário"""
+    
+    __slots__ = ("plataformas", "instantes", "proximo", "tamanho")
+    
+    def __init__(self, capacidade: int):
+        self.plataformas: List[Optional[str]] = [None] * capacidade
+        self.instantes = array("d", bytes(8 * capacidade))
+        self.proximo = 0
+        self.tamanho = 0
+    
+    def adicionar(self, plataforma_id: str, instante: float):
+        self.plataformas[self.proximo] = plataforma_id
+        self.instantes[self.proximo] = instante
+        self.proximo = (self.proximo + 1) % len(self.plataformas)
+        self.tamanho = min(self.tamanho + 1, len(self.plataformas))
+    
+    def ultimos(self, n: Optional[int] = None) -> List[Acesso]:
+        """Acessos do mais recente para o mais antigo"""
+        capacidade = len(self.plataformas)
+        quantidade = self.tamanho if n is None else min(n, self.tamanho)
+        posicoes = ((self.proximo - 1 - i) % capacidade for i in range(quantidade))
+        return [(self.plataformas[p], self.instantes[p]) for p in posicoes]
+
+class HistoricoAcessos:
+    """Últimos acessos de cada usuário às plataformas.
+    
+    Os acessos ficam num anel por usuário em memória e vão para o SQLite em
+    lote (por tempo ou por quantidade pendente). No banco há uma linha por
+    usuário com os acessos mais recentes, então ler os últimos N é uma
+    consulta por chave, sem varrer log nenhum. Na gravação, o que outro
+    worker já gravou para o usuário é mesclado pelo instante.
+    """
+    
+    def __init__(self, caminho: str = "acessos.db", capacidade: int = 20, intervalo_flush: float = 5.0,
+                 limite_pendentes: int = 200, max_usuarios: int = 10_000):
+        self.capacidade = capacidade
+        self.intervalo_flush = intervalo_flush
+        self.limite_pendentes = limite_pendentes
+        self.max_usuarios = max_usuarios
+        self._aneis: "OrderedDict[str, AnelAcessos]" = OrderedDict()
+        self._pendentes: Dict[str, List[Acesso]] = {}
+        self._total_pendente = 0
+        self._timer_flush: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, timeout=30, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS ultimos_acessos (
+                    usuario_id TEXT PRIMARY KEY,
+                    acessos TEXT NOT NULL
+                )
+            """)
+        atexit.register(self.descarregar)
+    
+    def _ler(self, usuario_id: str) -> List[Acesso]:
+        linha = self._conn.execute(
+            "SELECT acessos FROM ultimos_acessos WHERE usuario_id = ?", (usuario_id,)
+        ).fetchone()
+        return [tuple(acesso) for acesso in json.loads(linha[0])] if linha else []
+    
+    def _novo_anel(self, acessos: List[Acesso]) -> AnelAcessos:
+        anel = AnelAcessos(self.capacidade)
+        for plataforma_id, instante in sorted(acessos, key=lambda a: a[1])[-self.capacidade:]:
+            anel.adicionar(plataforma_id, instante)
+        return anel
+    
+    def _guardar_anel(self, usuario_id: str, anel: AnelAcessos):
+        self._aneis[usuario_id] = anel
+        self._aneis.move_to_end(usuario_id)
+        while len(self._aneis) > self.max_usuarios:
+            # Pendentes não se perdem: ficam em _pendentes até o próximo flush
+            self._aneis.popitem(last=False)
+    
+    def _anel(self, usuario_id: str) -> AnelAcessos:
+        anel = self._aneis.get(usuario_id)
+        if anel is None:
+            anel = self._novo_anel(self._ler(usuario_id) + self._pendentes.get(usuario_id, []))
+        self._guardar_anel(usuario_id, anel)
+        return anel
+    
+    def registrar(self, usuario_id: str, plataforma_id: str, instante: Optional[float] = None):
+        """Guarda o acesso no anel do usuário e agenda a gravação em lote"""
+        instante = time.time() if instante is None else instante
+        with self._lock:
+            self._anel(usuario_id).adicionar(plataforma_id, instante)
+            self._pendentes.setdefault(usuario_id, []).append((plataforma_id, instante))
+            self._total_pendente += 1
+            
+            if self._total_pendente >= self.limite_pendentes or self.intervalo_flush <= 0:
+                self.descarregar()
+            elif self._timer_flush is None:
+                self._timer_flush = threading.Timer(self.intervalo_flush, self.descarregar)
+                self._timer_flush.daemon = True
+                self._timer_flush.start()
+    
+    def ultimos(self, usuario_id: str, n: int = 3) -> List[Acesso]:
+        """Últimos n acessos do usuário, do mais recente para o mais antigo"""
+        with self._lock:
+            return self._anel(usuario_id).ultimos(n)
+    
+    def _cancelar_flush(self):
+        if self._timer_flush is not None:
+            self._timer_flush.cancel()
+            self._timer_flush = None
+    
+    def descarregar(self):
+        """Grava os acessos pendentes de todos os usuários numa transação"""
+        with self._lock:
+            self._cancelar_flush()
+            if not self._pendentes:
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                linhas = []
+                for usuario_id, novos in self._pendentes.items():
+                    anel = self._novo_anel(self._ler(usuario_id) + novos)
+                    linhas.append((usuario_id, json.dumps(anel.ultimos()[::-1])))
+                    if usuario_id in self._aneis:
+                        self._aneis[usuario_id] = anel
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO ultimos_acessos (usuario_id, acessos) VALUES (?, ?)", linhas
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._pendentes = {}
+            self._total_pendente = 0
\ No newline at end of file
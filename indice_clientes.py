@@ -0,0 +1,268 @@
+"""Busca de clientes por trigramas, tolerante a acento, prefixo e erro de digitação.
+
+Nome, telefone e e-mail são normalizados (minúsculas, sem acento, dígitos
+do telefone juntos) e quebrados em trigramas, com duas posições de
+preenchimento no começo de cada palavra. Como o texto normalizado é ASCII,
+cada trigrama vira um inteiro de 24 bits.
+
+As listas de clientes por trigrama ficam em duas partes: uma base em numpy
+(pares trigrama/cliente ordenados pelo trigrama), montada de forma
+vetorizada nas cargas em lote, e um delta com um array por trigrama, onde
+cada cliente novo é só um append. A base não é refeita a cada cliente.
+
+Na consulta, os trigramas da busca recebem o preenchimento só no começo
+(o que dá a busca por prefixo), as listas são somadas com numpy.bincount e
+o cliente é candidato se tiver uma fração mínima deles (o que tolera letra
+trocada). O top-k sai de um argpartition sobre os candidatos.
+"""
+import math
+import re
+import threading
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import streamlit as st
+
+from repositorio_agendamentos import RepositorioAgendamentos, obter_repositorio_agendamentos
+from texto import normalizar
+
+# A partir disso, sincronizar() carrega em lote (refazendo a base) em vez de cliente a cliente
+LIMITE_LOTE = 1000
+
+@dataclass
+class Cliente:
+    nome: str
+    telefone: str
+    email: str
+    total_agendamentos: int = 0
+    ultima_visita: str = ""
+
+_NAO_DIGITOS = re.compile(r"\D")
+
+def _digitos(telefone: str) -> str:
+    return _NAO_DIGITOS.sub("", telefone or "")
+
+def _palavras(cliente: Cliente) -> List[str]:
+    palavras = normalizar(f"{cliente.nome} {cliente.email}").split()
+    digitos = _digitos(cliente.telefone)
+    if digitos:
+        # Também sem DDD (e sem DDI), que é como o número costuma ser digitado
+        palavras += sorted({digitos, digitos[-9:], digitos[-8:]})
+    return palavras
+
+@lru_cache(maxsize=65536)
+def _codigos_palavra(palavra: str, fim_de_palavra: bool) -> Tuple[int, ...]:
+    texto = ("  " + palavra + (" " if fim_de_palavra else "")).encode("ascii")
+    return tuple((texto[i] << 16) | (texto[i + 1] << 8) | texto[i + 2] for i in range(len(texto) - 2))
+
+def _codigos(palavras: Iterable[str], fim_de_palavra: bool) -> set:
+    return set().union(*(_codigos_palavra(palavra, fim_de_palavra) for palavra in palavras))
+
+def _pares_lote(primeiro: int, palavras_por_cliente: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pares únicos (trigrama, cliente) de um lote, sem laço Python por trigrama"""
+    segmentos, donos = [], []
+    for deslocamento, palavras in enumerate(palavras_por_cliente):
+        segmentos += ["  " + palavra + " " for palavra in palavras]
+        donos += [primeiro + deslocamento] * len(palavras)
+    if not segmentos:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.int32)
+    
+    tamanhos = np.fromiter(map(len, segmentos), dtype=np.int64, count=len(segmentos))
+    texto = np.frombuffer("".join(segmentos).encode("ascii"), dtype=np.uint8).astype(np.int64)
+    segmento = np.repeat(np.arange(len(segmentos)), tamanhos)
+    codigos = (texto[:-2] << 16) | (texto[1:-1] << 8) | texto[2:]
+    # Trigrama que atravessa o fim de uma palavra não existe
+    validos = segmento[:-2] == segmento[2:]
+    clientes = np.repeat(np.asarray(donos, dtype=np.int64), tamanhos)[:-2][validos]
+    chaves = np.sort((clientes << 24) | codigos[validos])
+    chaves = chaves[np.concatenate(([True], chaves[1:] != chaves[:-1]))]
+    return (chaves & 0xFFFFFF).astype(np.uint32), (chaves >> 24).astype(np.int32)
+
+class IndiceClientes:
+    def __init__(self, limiar: float = 0.5):
+        self.limiar = limiar
+        self._clientes: List[Cliente] = []
+        self._ativos = bytearray()
+        self._tamanhos = array("I")
+        self._base_codigos = np.empty(0, dtype=np.uint32)
+        self._base_clientes = np.empty(0, dtype=np.int32)
+        self._delta: Dict[int, array] = defaultdict(lambda: array("i"))
+        self._por_chave: Dict[str, int] = {}
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._por_chave)
+    
+    @staticmethod
+    def _chave(nome: str, telefone: str, email: str) -> str:
+        # O telefone identifica o cliente; sem ele, nome + e-mail
+        return _digitos(telefone) or f"{normalizar(nome)}|{normalizar(email)}"
+    
+    def _atualizar(self, chave: str, nome: str, telefone: str, email: str,
+                   agendamentos: int, data: str) -> Tuple[Cliente, bool]:
+        """Soma os agendamentos ao cliente; o bool diz se ele precisa entrar no índice"""
+        posicao = self._por_chave.get(chave)
+        novo = posicao is None
+        if novo:
+            cliente = Cliente(nome, telefone, email)
+        else:
+            cliente = self._clientes[posicao]
+            if (nome, email or cliente.email) != (cliente.nome, cliente.email):
+                # Dados mudaram: a entrada antiga sai da busca e entra uma nova
+                self._ativos[posicao] = 0
+                cliente = Cliente(nome, telefone, email or cliente.email,
+                                  cliente.total_agendamentos, cliente.ultima_visita)
+                novo = True
+        cliente.total_agendamentos += agendamentos
+        cliente.ultima_visita = max(cliente.ultima_visita, data)
+        return cliente, novo
+    
+    def adicionar(self, nome: str, telefone: str, email: str = "", data: str = "") -> Cliente:
+        """Registra um agendamento do cliente, criando-o no índice se for novo"""
+        chave = self._chave(nome, telefone, email)
+        with self._lock:
+            cliente, novo = self._atualizar(chave, nome, telefone, email, 1, data)
+            if novo:
+                posicao = len(self._clientes)
+                codigos = _codigos(_palavras(cliente), fim_de_palavra=True)
+                for codigo in codigos:
+                    self._delta[codigo].append(posicao)
+                self._clientes.append(cliente)
+                self._ativos.append(1)
+                self._tamanhos.append(len(codigos))
+                self._por_chave[chave] = posicao
+            return cliente
+    
+    def adicionar_lote(self, linhas: Iterable[Tuple[str, str, str, str]]):
+        """Registra vários agendamentos (nome, telefone, email, data) refazendo a base uma vez só"""
+        agregados: Dict[str, list] = {}
+        for nome, telefone, email, data in linhas:
+            chave = self._chave(nome, telefone, email)
+            atual = agregados.get(chave)
+            if atual is None:
+                agregados[chave] = [nome, telefone, email, 1, data]
+            else:
+                # Vale o cadastro mais recente, somando os agendamentos
+                atual[:3] = nome, telefone, email or atual[2]
+                atual[3] += 1
+                atual[4] = max(atual[4], data)
+        
+        with self._lock:
+            novos: Dict[str, Cliente] = {}
+            for chave, (nome, telefone, email, quantidade, data) in agregados.items():
+                cliente, novo = self._atualizar(chave, nome, telefone, email, quantidade, data)
+                if novo:
+                    novos[chave] = cliente
+            if not novos:
+                return
+            
+            primeiro = len(self._clientes)
+            codigos, clientes = _pares_lote(primeiro, [_palavras(cliente) for cliente in novos.values()])
+            for posicao, chave in enumerate(novos, start=primeiro):
+                self._por_chave[chave] = posicao
+            self._clientes += novos.values()
+            self._ativos += b"\x01" * len(novos)
+            self._tamanhos.extend(np.bincount(clientes - primeiro, minlength=len(novos)).tolist())
+            
+            # Base + delta + lote, ordenados pelo trigrama
+            partes_codigos, partes_clientes = [self._base_codigos], [self._base_clientes]
+            for codigo, postagem in self._delta.items():
+                partes_codigos.append(np.full(len(postagem), codigo, dtype=np.uint32))
+                partes_clientes.append(np.array(postagem, dtype=np.int32))
+            partes_codigos.append(codigos)
+            partes_clientes.append(clientes)
+            todos_codigos = np.concatenate(partes_codigos)
+            ordem = np.argsort(todos_codigos)
+            self._base_codigos = todos_codigos[ordem]
+            self._base_clientes = np.concatenate(partes_clientes)[ordem]
+            self._delta.clear()
+    
+    def buscar(self, texto: str, k: int = 20) -> List[Cliente]:
+        """Os k clientes mais parecidos com a busca, do melhor para o pior"""
+        codigos = _codigos(normalizar(texto).split(), fim_de_palavra=False)
+        if not codigos:
+            return []
+        # Busca curta não tem trigramas de sobra para tolerar erro
+        minimo = len(codigos) if len(codigos) <= 3 else math.ceil(len(codigos) * self.limiar)
+        consulta = np.fromiter(codigos, dtype=np.uint32, count=len(codigos))
+        
+        with self._lock:
+            inicios = np.searchsorted(self._base_codigos, consulta, side="left").tolist()
+            fins = np.searchsorted(self._base_codigos, consulta, side="right").tolist()
+            postagens = [self._base_clientes[i:f] for i, f in zip(inicios, fins) if f > i]
+            postagens += [np.frombuffer(self._delta[c], dtype=np.int32) for c in codigos if c in self._delta]
+            if not postagens:
+                return []
+            acertos = np.bincount(np.concatenate(postagens), minlength=len(self._clientes))
+            del postagens
+            ativos = np.frombuffer(bytes(self._ativos), dtype=np.uint8)
+            candidatos = np.flatnonzero((acertos >= minimo) & (ativos == 1))
+            if not len(candidatos):
+                return []
+            # Cobertura da busca primeiro; entre iguais, o cadastro mais curto (o mais exato)
+            tamanhos = np.array(self._tamanhos, dtype=np.float64)[candidatos]
+            pontos = acertos[candidatos] / len(codigos) + 0.1 * acertos[candidatos] / tamanhos
+            if len(candidatos) > k:
+                melhores = np.argpartition(-pontos, k - 1)[:k]
+                candidatos, pontos = candidatos[melhores], pontos[melhores]
+            ordem = candidatos[np.argsort(-pontos, kind="stable")]
+            return [self._clientes[i] for i in ordem.tolist()]
+    
+    def recentes(self, n: int = 50) -> List[Cliente]:
+        """Os últimos clientes cadastrados, do mais novo para o mais antigo"""
+        with self._lock:
+            recentes = []
+            for posicao in range(len(self._clientes) - 1, -1, -1):
+                if len(recentes) >= n:
+                    break
+                if self._ativos[posicao]:
+                    recentes.append(self._clientes[posicao])
+            return recentes
+
+class IndiceClientesAgenda(IndiceClientes):
+    """Índice alimentado pelos agendamentos do repositório, lido de forma incremental"""
+    
+    def __init__(self, repositorio: RepositorioAgendamentos, limiar: float = 0.5):
+        super().__init__(limiar)
+        self.repositorio = repositorio
+        self._ultimo_rowid = 0
+        self._alterado = True
+        repositorio.ao_alterar(self._agenda_alterada)
+    
+    def _agenda_alterada(self, profissional: Optional[str], dia: Optional[str]):
+        self._alterado = True
+    
+    def sincronizar(self):
+        """Indexa só os agendamentos gravados desde a última leitura"""
+        self.repositorio.sincronizar()
+        if not self._alterado:
+            return
+        with self._lock:
+            self._alterado = False
+            linhas = self.repositorio.clientes_desde(self._ultimo_rowid)
+            if not linhas:
+                return
+            if len(linhas) >= LIMITE_LOTE:
+                self.adicionar_lote(linha[1:] for linha in linhas)
+            else:
+                for _, cliente, telefone, email, data in linhas:
+                    self.adicionar(cliente, telefone, email, data)
+            self._ultimo_rowid = linhas[-1][0]
+    
+    def buscar(self, texto: str, k: int = 20) -> List[Cliente]:
+        self.sincronizar()
+        return super().buscar(texto, k)
+    
+    def recentes(self, n: int = 50) -> List[Cliente]:
+        self.sincronizar()
+        return super().recentes(n)
+
+@st.cache_resource
+def obter_indice_clientes() -> IndiceClientesAgenda:
+    """Índice do processo, ligado ao repositório compartilhado"""
+    return IndiceClientesAgenda(obter_repositorio_agendamentos())
\ No newline at end of file
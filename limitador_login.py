@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from armazenamento_usuarios import normalizar_email
+
+EXPOENTE_MAXIMO = 30
+
+@dataclass
+class _Balde:
+    tokens: float
+    atualizado_em: float
+    falhas: int = 0
+    bloqueado_ate: float = 0.0
+
+class LimitadorLogin:
+    """Token bucket por e-mail e por cliente, com backoff exponencial após falhas.
+    
+    Cada chave vive num OrderedDict usado como LRU; ao passar de max_chaves
+    a menos usada é descartada, então a memória fica limitada mesmo sob
+    ataques com milhões de e-mails diferentes.
+    
+    Cliente None (IP desconhecido) usa só o balde do e-mail: um balde
+    comum a todos os anônimos deixaria qualquer um bloquear o login de todos.
+    """
+    
+    def __init__(self, capacidade=5, reposicao_por_segundo=1 / 12, backoff_base=1.0,
+                 backoff_maximo=300.0, max_chaves=100_000):
+        self.capacidade = capacidade
+        self.reposicao_por_segundo = reposicao_por_segundo
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self.max_chaves = max_chaves
+        self._baldes: "OrderedDict[str, _Balde]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.permitidos = 0
+        self.bloqueados = 0
+    
+    def _balde(self, chave: str, agora: float) -> _Balde:
+        balde = self._baldes.get(chave)
+        if balde is None:
+            balde = _Balde(tokens=self.capacidade, atualizado_em=agora)
+            self._baldes[chave] = balde
+            if len(self._baldes) > self.max_chaves:
+                self._baldes.popitem(last=False)
+        else:
+            self._baldes.move_to_end(chave)
+            balde.tokens = min(self.capacidade, balde.tokens + (agora - balde.atualizado_em) * self.reposicao_por_segundo)
+            balde.atualizado_em = agora
+        return balde
+    
+    @staticmethod
+    def _chaves(email: str, cliente: Optional[str]) -> Tuple[str, ...]:
+        chave_email = f"email:{normalizar_email(email)}"
+        return (chave_email,) if cliente is None else (chave_email, f"cliente:{cliente}")
+    
+    def permitir(self, email: str, cliente: Optional[str]) -> Tuple[bool, float]:
+        """Consome uma tentativa; devolve (permitido, segundos até poder tentar)"""
+        agora = time.monotonic()
+        with self._lock:
+            baldes = [self._balde(chave, agora) for chave in self._chaves(email, cliente)]
+            espera = 0.0
+            for balde in baldes:
+                espera = max(espera, balde.bloqueado_ate - agora)
+                if balde.tokens < 1:
+                    espera = max(espera, (1 - balde.tokens) / self.reposicao_por_segundo)
+            if espera > 0:
+                self.bloqueados += 1
+                return False, espera
+            for balde in baldes:
+                balde.tokens -= 1
+            self.permitidos += 1
+            return True, 0.0
+    
+    def registrar_falha(self, email: str, cliente: Optional[str]):
+        agora = time.monotonic()
+        with self._lock:
+            for chave in self._chaves(email, cliente):
+                balde = self._balde(chave, agora)
+                balde.falhas += 1
+                # Expoente limitado: 2.0 ** 1024 estoura o float e derrubaria os logins da chave
+                atraso = min(self.backoff_maximo, self.backoff_base * 2.0 ** min(balde.falhas - 1, EXPOENTE_MAXIMO))
+                balde.bloqueado_ate = agora + atraso
+    
+    def registrar_sucesso(self, email: str, cliente: Optional[str]):
+        # Só o e-mail é liberado; falhas do cliente continuam contando
+        chave_email = self._chaves(email, cliente)[0]
+        with self._lock:
+            balde = self._baldes.get(chave_email)
+            if balde is not None:
+                balde.falhas = 0
+                balde.bloqueado_ate = 0.0
+    
+    def contadores(self) -> dict:
+        with self._lock:
+            return {
+                "permitidos": self.permitidos,
+                "bloqueados": self.bloqueados,
+                "chaves_monitoradas": len(self._baldes),
+            }
\ No newline at end of file
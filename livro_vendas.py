@@ -0,0 +1,307 @@
+"""Livro de vendas: registro append-only em SQLite, gravado em lotes.
+
+registrar() só monta a venda e a põe numa fila; quem grava é uma thread
+dedicada do processo, então o script do Streamlit nunca espera disco nem
+lock do banco. A thread esvazia a fila a cada volta e grava tudo o que
+encontrou numa única transação (group commit): com pouca carga cada venda
+vai sozinha, no pico centenas dividem o mesmo commit. Como só ela escreve,
+os gravadores do processo já saem serializados; entre workers, o BEGIN
+IMMEDIATE do SQLite faz o mesmo.
+
+Quem precisa manter algo junto com as vendas (os resumos do painel, por
+exemplo) se registra em na_transacao() e grava na mesma transação do lote.
+
+Valores são inteiros em centavos; reais só na hora de exibir.
+
+Nenhum erro derruba a thread gravadora: banco ocupado é tentado de novo;
+qualquer outro erro faz o lote ser regravado venda a venda, e a venda que
+falhar sozinha vai para um arquivo de rejeitadas (<banco>.rejeitadas.jsonl),
+com log e contador. Se ainda assim a thread não estiver viva, registrar()
+recusa a venda em vez de enfileirá-la para sempre.
+"""
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+import streamlit as st
+
+from gerador_ids import novo_id
+from metricas import registro_metricas
+
+logger = logging.getLogger(__name__)
+
+MAX_TENTATIVAS = 8
+
+@dataclass
+class Venda:
+    id: str
+    instante: str
+    data: str
+    cliente: str
+    produto: str
+    quantidade: int
+    preco_unitario: int
+    total: int
+    forma_pagamento: str
+    parcelas: int = 1
+    observacoes: str = ""
+    codigo_produto: str = ""
+    categoria: str = ""
+
+CAMPOS_VENDA = tuple(campo.name for campo in fields(Venda))
+CAMPOS_EM_CENTAVOS = ("preco_unitario", "total")
+
+def centavos(valor: Union[int, float, str, Decimal]) -> int:
+    """Converte reais (ex.: 12.5 ou "12,50") em centavos, arredondando meio centavo para cima"""
+    if isinstance(valor, str):
+        valor = valor.replace("R$", "").strip()
+        # Com vírgula decimal ("1.234,56") o ponto separa milhares; sem ela ("12.50") é o decimal
+        if "," in valor:
+            valor = valor.replace(".", "").replace(",", ".")
+    reais = Decimal(str(valor)) if isinstance(valor, float) else Decimal(valor)
+    return int((reais * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def formatar_reais(valor_centavos: int) -> str:
+    """R$ no formato brasileiro (R$ 1.234,56)"""
+    sinal = "-" if valor_centavos < 0 else ""
+    reais, resto = divmod(abs(valor_centavos), 100)
+    return f"{sinal}R$ {reais:,}".replace(",", ".") + f",{resto:02d}"
+
+class LivroVendas:
+    def __init__(self, caminho: str = "vendas.db", tamanho_lote: int = 1000):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self._fila: "queue.SimpleQueue[Optional[Venda]]" = queue.SimpleQueue()
+        self._ouvintes: List[Callable[[List[Venda]], None]] = []
+        self._na_transacao: List[Callable[[sqlite3.Connection, List[Venda]], None]] = []
+        self._pendentes = 0
+        self._condicao = threading.Condition()
+        self._contadores = {"vendas_gravadas": 0, "lotes": 0, "maior_lote": 0, "falhas": 0,
+                            "lotes_com_erro": 0, "vendas_rejeitadas": 0}
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Dinheiro: cada commit vai ao disco (fsync); o lote divide esse custo entre as vendas
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS vendas (
+                id TEXT PRIMARY KEY,
+                instante TEXT NOT NULL,
+                data TEXT NOT NULL,
+                cliente TEXT NOT NULL,
+                produto TEXT NOT NULL,
+                quantidade INTEGER NOT NULL,
+                preco_unitario INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                forma_pagamento TEXT NOT NULL,
+                parcelas INTEGER NOT NULL DEFAULT 1,
+                observacoes TEXT NOT NULL DEFAULT '',
+                codigo_produto TEXT NOT NULL DEFAULT '',
+                categoria TEXT NOT NULL DEFAULT ''
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_vendas_data ON vendas (data)")
+        # A conexão acima é só da thread gravadora; leituras usam outra
+        self._leitura = sqlite3.connect(caminho, check_same_thread=False, timeout=30)
+        self._lock_leitura = threading.Lock()
+        self._gravador = threading.Thread(target=self._gravar_continuamente, name="gravador-vendas", daemon=True)
+        self._gravador.start()
+        atexit.register(self.fechar)
+    
+    def ao_gravar(self, ouvinte: Callable[[List[Venda]], None]):
+        """Registra ouvinte(vendas) chamado pela thread gravadora após cada commit"""
+        self._ouvintes.append(ouvinte)
+    
+    def na_transacao(self, gravador: Callable[[sqlite3.Connection, List[Venda]], None]):
+        """Registra gravador(conexão, vendas), chamado dentro da transação de cada lote.
+        
+        Se ele falhar, o lote inteiro volta atrás. Registre antes das primeiras vendas.
+        """
+        self._na_transacao.append(gravador)
+    
+    def registrar(self, cliente: str, produto: str, quantidade: int, preco_unitario: int,
+                  forma_pagamento: str, parcelas: int = 1, observacoes: str = "",
+                  codigo_produto: str = "", categoria: str = "") -> Venda:
+        """Enfileira a venda (preço em centavos) e devolve na hora, já com id"""
+        if quantidade <= 0:
+            raise ValueError("A quantidade precisa ser positiva")
+        if not isinstance(preco_unitario, int):
+            raise TypeError("O preço unitário deve estar em centavos (int)")
+        if not self._gravador.is_alive():
+            raise RuntimeError("O gravador de vendas não está rodando; a venda não foi registrada")
+        agora = datetime.now()
+        venda = Venda(
+            id=novo_id("VND"),
+            instante=agora.strftime("%Y-%m-%d %H:%M:%S"),
+            data=agora.strftime("%Y-%m-%d"),
+            cliente=cliente,
+            produto=produto,
+            quantidade=quantidade,
+            preco_unitario=preco_unitario,
+            total=preco_unitario * quantidade,
+            forma_pagamento=forma_pagamento,
+            parcelas=parcelas,
+            observacoes=observacoes,
+            codigo_produto=codigo_produto,
+            categoria=categoria,
+        )
+        with self._condicao:
+            self._pendentes += 1
+        self._fila.put(venda)
+        return venda
+    
+    def _gravar_continuamente(self):
+        while True:
+            primeira = self._fila.get()
+            if primeira is None:
+                return
+            lote = [primeira]
+            # Tudo o que chegou enquanto o commit anterior acontecia vai junto
+            parar = False
+            while len(lote) < self.tamanho_lote:
+                try:
+                    venda = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                if venda is None:
+                    parar = True
+                    break
+                lote.append(venda)
+            try:
+                self._gravar_lote(lote)
+            except Exception:
+                # Última barreira: sem a thread, toda venda seguinte ficaria na fila para sempre
+                logger.exception("Erro inesperado no gravador de vendas")
+            if parar:
+                return
+    
+    def _inserir(self, lote: List[Venda]):
+        """Grava o lote numa transação; banco ocupado é tentado de novo com espera crescente"""
+        linhas = [tuple(getattr(venda, campo) for campo in CAMPOS_VENDA) for venda in lote]
+        tentativa = 0
+        while True:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(
+                        f"INSERT INTO vendas ({', '.join(CAMPOS_VENDA)}) "
+                        f"VALUES ({', '.join('?' * len(CAMPOS_VENDA))})", linhas
+                    )
+                    for gravador in self._na_transacao:
+                        gravador(self._conn, lote)
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    if self._conn.in_transaction:
+                        self._conn.execute("ROLLBACK")
+                    raise
+                return
+            except sqlite3.OperationalError:
+                # Banco ocupado por outro worker além do timeout: tenta o mesmo lote de
+                # novo; se o erro persistir, não é contenção e vai para o tratamento geral
+                self._contadores["falhas"] += 1
+                tentativa += 1
+                if tentativa >= MAX_TENTATIVAS:
+                    raise
+                time.sleep(min(1.0, 0.05 * 2 ** tentativa))
+    
+    def _rejeitar(self, venda: Venda, erro: Exception):
+        """Guarda a venda que não pôde ser gravada, para conferência e regravação manual"""
+        self._contadores["vendas_rejeitadas"] += 1
+        logger.error("Venda %s rejeitada pelo banco: %r", venda.id, erro)
+        try:
+            with open(f"{self.caminho}.rejeitadas.jsonl", "a", encoding="utf-8") as arquivo:
+                arquivo.write(json.dumps({**asdict(venda), "erro": repr(erro)}, ensure_ascii=False) + "\n")
+        except OSError:
+            logger.exception("Não foi possível guardar a venda rejeitada %s", venda.id)
+    
+    def _gravar_lote(self, lote: List[Venda]):
+        gravadas = lote
+        try:
+            try:
+                self._inserir(lote)
+            except Exception:
+                logger.exception("Falha ao gravar lote de %d vendas; regravando uma a uma", len(lote))
+                self._contadores["lotes_com_erro"] += 1
+                # Sozinha, cada venda boa entra; só a que causa o erro fica de fora
+                gravadas = []
+                for venda in lote:
+                    try:
+                        self._inserir([venda])
+                        gravadas.append(venda)
+                    except Exception as erro:
+                        self._rejeitar(venda, erro)
+            
+            if gravadas:
+                self._contadores["vendas_gravadas"] += len(gravadas)
+                self._contadores["lotes"] += 1
+                self._contadores["maior_lote"] = max(self._contadores["maior_lote"], len(gravadas))
+                for ouvinte in self._ouvintes:
+                    try:
+                        ouvinte(gravadas)
+                    except Exception:
+                        # Um ouvinte quebrado não pode parar a gravação
+                        logger.exception("Ouvinte do livro de vendas falhou")
+        finally:
+            with self._condicao:
+                self._pendentes -= len(lote)
+                self._condicao.notify_all()
+    
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        """Espera as vendas já registradas chegarem ao banco; False se o tempo acabar"""
+        with self._condicao:
+            return self._condicao.wait_for(lambda: self._pendentes == 0, timeout)
+    
+    def fechar(self, timeout: float = 10.0):
+        """Grava o que está na fila e encerra a thread gravadora"""
+        if self._gravador.is_alive():
+            self._fila.put(None)
+            self._gravador.join(timeout)
+    
+    def contar(self) -> int:
+        """Vendas já gravadas no banco (inclusive por outros workers)"""
+        with self._lock_leitura:
+            return self._leitura.execute("SELECT COUNT(*) FROM vendas").fetchone()[0]
+    
+    def em_blocos(self, inicio: str, fim: str, tamanho_bloco: int = 10_000,
+                  em_reais: bool = False) -> Iterator[List[tuple]]:
+        """Vendas de inicio a fim (datas ISO, inclusive) em blocos de linhas, na ordem de CAMPOS_VENDA.
+        
+        Usa uma conexão própria: a leitura inteira vê um único instante do banco
+        sem segurar a conexão de leitura compartilhada. Com em_reais, os valores
+        saem como texto em reais ("12.50").
+        """
+        colunas = [f"printf('%.2f', {campo} / 100.0)" if em_reais and campo in CAMPOS_EM_CENTAVOS else campo
+                   for campo in CAMPOS_VENDA]
+        conn = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            # O índice por data já entrega as linhas em ordem, sem ordenar tudo em memória
+            cursor = conn.execute(
+                f"SELECT {', '.join(colunas)} FROM vendas WHERE data BETWEEN ? AND ? ORDER BY data",
+                (inicio, fim)
+            )
+            while True:
+                bloco = cursor.fetchmany(tamanho_bloco)
+                if not bloco:
+                    return
+                yield bloco
+        finally:
+            conn.close()
+    
+    def contadores(self) -> Dict[str, int]:
+        with self._condicao:
+            pendentes = self._pendentes
+        return {**self._contadores, "pendentes": pendentes, "gravador_ativo": int(self._gravador.is_alive())}
+
+@st.cache_resource
+def obter_livro_vendas() -> LivroVendas:
+    """Livro de vendas do processo, com uma única thread gravadora"""
+    livro = LivroVendas()
+    registro_metricas.registrar_coletor("livro_vendas", livro.contadores)
+    return livro
\ No newline at end of file
@@ -0,0 +1,196 @@
+"""Cronômetros e contadores do portal, ligáveis em tempo de execução.
+
+Desligado (o padrão), medir() devolve um contexto vazio compartilhado e
+contar() só testa uma flag. Ligado por PORTAL_METRICAS=1 ou pela página de
+métricas do administrador, cada medição guarda a duração numa janela das
+amostras mais recentes, de onde saem p50/p95/p99.
+
+O resumo também é gravado periodicamente em formato texto do Prometheus
+(PORTAL_METRICAS_ARQUIVO, padrão metricas.prom), para um node_exporter com
+textfile collector ou para inspeção manual.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List
+
+JANELA_AMOSTRAS = 2048
+QUANTIS = (0.5, 0.95, 0.99)
+
+class _Serie:
+    __slots__ = ("amostras", "contagem", "soma", "maximo")
+    
+    def __init__(self):
+        self.amostras = deque(maxlen=JANELA_AMOSTRAS)
+        self.contagem = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+def _quantil(ordenadas: List[float], q: float) -> float:
+    if not ordenadas:
+        return 0.0
+    return ordenadas[min(len(ordenadas) - 1, int(q * len(ordenadas)))]
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Metricas:
+    def __init__(self):
+        self._series: Dict[str, _Serie] = {}
+        self._contadores: Dict[str, float] = {}
+        self._coletores: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+    
+    def observar(self, nome: str, segundos: float):
+        with self._lock:
+            serie = self._series.get(nome)
+            if serie is None:
+                serie = self._series[nome] = _Serie()
+            serie.amostras.append(segundos)
+            serie.contagem += 1
+            serie.soma += segundos
+            serie.maximo = max(serie.maximo, segundos)
+    
+    def contar(self, nome: str, quantidade: float = 1):
+        with self._lock:
+            self._contadores[nome] = self._contadores.get(nome, 0) + quantidade
+    
+    def registrar_coletor(self, nome: str, coletor: Callable[[], Dict[str, float]]):
+        """Valores instantâneos (gauges) lidos só na hora de exportar"""
+        self._coletores[nome] = coletor
+    
+    def zerar(self):
+        with self._lock:
+            self._series = {}
+            self._contadores = {}
+    
+    def resumo(self) -> List[dict]:
+        """Uma linha por série medida, com quantis em milissegundos"""
+        with self._lock:
+            series = {nome: (sorted(s.amostras), s.contagem, s.soma, s.maximo) for nome, s in self._series.items()}
+        linhas = []
+        for nome, (ordenadas, contagem, soma, maximo) in sorted(series.items()):
+            linhas.append({
+                "nome": nome,
+                "contagem": contagem,
+                "media_ms": soma / contagem * 1000,
+                **{f"p{int(q * 100)}_ms": _quantil(ordenadas, q) * 1000 for q in QUANTIS},
+                "max_ms": maximo * 1000,
+            })
+        return linhas
+    
+    def contadores(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._contadores)
+    
+    def coletar(self) -> Dict[str, Dict[str, float]]:
+        valores = {}
+        for nome, coletor in list(self._coletores.items()):
+            try:
+                valores[nome] = coletor()
+            except Exception:
+                # Um coletor quebrado não pode derrubar a exportação inteira
+                continue
+        return valores
+    
+    def prometheus(self) -> str:
+        """Resumo no formato de exposição em texto do Prometheus"""
+        with self._lock:
+            series = {nome: (sorted(s.amostras), s.contagem, s.soma) for nome, s in self._series.items()}
+            contadores = dict(self._contadores)
+        
+        linhas = [
+            "# HELP portal_duracao_segundos Tempo de parede por rota, render, aba e montagem de dados",
+            "# TYPE portal_duracao_segundos summary",
+        ]
+        for nome, (ordenadas, contagem, soma) in sorted(series.items()):
+            rotulo = _escapar(nome)
+            for q in QUANTIS:
+                linhas.append(f'portal_duracao_segundos{{nome="{rotulo}",quantile="{q}"}} {_quantil(ordenadas, q):.6f}')
+            linhas.append(f'portal_duracao_segundos_sum{{nome="{rotulo}"}} {soma:.6f}')
+            linhas.append(f'portal_duracao_segundos_count{{nome="{rotulo}"}} {contagem}')
+        
+        linhas += ["# HELP portal_eventos_total Eventos contados", "# TYPE portal_eventos_total counter"]
+        for nome, valor in sorted(contadores.items()):
+            linhas.append(f'portal_eventos_total{{nome="{_escapar(nome)}"}} {valor}')
+        
+        linhas += ["# HELP portal_valor Valores instantâneos dos componentes", "# TYPE portal_valor gauge"]
+        for coletor, valores in sorted(self.coletar().items()):
+            for nome, valor in sorted(valores.items()):
+                linhas.append(f'portal_valor{{coletor="{_escapar(coletor)}",nome="{_escapar(nome)}"}} {valor}')
+        return "\n".join(linhas) + "\n"
+    
+    def gravar_prometheus(self, caminho: str):
+        """Grava o dump de forma atômica (o coletor nunca lê arquivo pela metade)"""
+        caminho_tmp = f"{caminho}.{os.getpid()}.tmp"
+        with open(caminho_tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(caminho_tmp, caminho)
+
+class _Cronometro:
+    __slots__ = ("nome", "inicio")
+    
+    def __init__(self, nome: str):
+        self.nome = nome
+    
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+    
+    def __exit__(self, *excecao):
+        registro_metricas.observar(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+class _Nulo:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *excecao):
+        return False
+
+_NULO = _Nulo()
+
+registro_metricas = Metricas()
+ARQUIVO_PROMETHEUS = os.environ.get("PORTAL_METRICAS_ARQUIVO", "metricas.prom")
+INTERVALO_EXPORTACAO = float(os.environ.get("PORTAL_METRICAS_INTERVALO", "15"))
+
+_ligado = False
+_exportador = None
+
+def _exportar_periodicamente():
+    while _ligado:
+        time.sleep(INTERVALO_EXPORTACAO)
+        try:
+            registro_metricas.gravar_prometheus(ARQUIVO_PROMETHEUS)
+        except OSError:
+            pass
+
+def ligar():
+    global _ligado, _exportador
+    _ligado = True
+    if INTERVALO_EXPORTACAO > 0 and (_exportador is None or not _exportador.is_alive()):
+        _exportador = threading.Thread(target=_exportar_periodicamente, name="exportador-metricas", daemon=True)
+        _exportador.start()
+
+def desligar():
+    global _ligado
+    _ligado = False
+
+def ligado() -> bool:
+    return _ligado
+
+def medir(nome: str):
+    """Contexto que cronometra o bloco; vazio quando as métricas estão desligadas"""
+    if not _ligado:
+        return _NULO
+    return _Cronometro(nome)
+
+def contar(nome: str, quantidade: float = 1):
+    if _ligado:
+        registro_metricas.contar(nome, quantidade)
+
+if os.environ.get("PORTAL_METRICAS", "").strip() not in ("", "0"):
+    ligar()
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""Perfil de inicialização do portal (opcional).
+
+Ligado pela variável PORTAL_PERFIL_INICIALIZACAO, que indica o prefixo dos
+arquivos gerados ("1" usa "perfil_inicializacao").
+
+No processo, o gancho de import só vê módulos ainda não carregados: sob
+`streamlit run`, streamlit, pandas e plotly já foram importados pelo
+runtime antes do script, então ali aparecem só os módulos do portal. Para
+medir esses custos, um interpretador novo roda `python -X importtime -c
+"import app, sistema_..."` (em segundo plano, numa pasta temporária; os
+módulos sistema_* são os que puxam pandas e plotly) e a saída vira a seção
+"processo_novo" do relatório.
+
+Gera <prefixo>.json (comparável entre versões) e <prefixo>.folded, no
+formato de pilhas colapsadas aceito por flamegraph.pl/speedscope.
+"""
+import builtins
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+from contextlib import contextmanager, nullcontext
+
+INICIO_PROCESSO = time.perf_counter()
+PACOTES_OBSERVADOS = ("streamlit", "pandas", "plotly")
+DIRETORIO_APP = os.path.dirname(os.path.abspath(__file__))
+
+def _ler_importtime(saida: str) -> list:
+    """Linhas do -X importtime como [(pilha, próprio µs, acumulado µs)], pais depois dos filhos"""
+    pendentes = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        _, proprio, acumulado, nome = (linha[:12], *linha[12:].split("|", 2))
+        nivel = (len(nome) - len(nome.lstrip(" ")) - 1) // 2
+        nome = nome.strip()
+        # A saída lista cada módulo depois dos que ele importou, um nível mais fundo
+        filhos = []
+        while pendentes and pendentes[-1][0] > nivel:
+            filhos = pendentes.pop()[1] + filhos
+        itens = [(f"{nome};{pilha}", p, a) for pilha, p, a in filhos] + [(nome, int(proprio), int(acumulado))]
+        pendentes.append((nivel, itens))
+    return [item for _, itens in pendentes for item in itens]
+
+def _comando_padrao() -> str:
+    """import do app e das plataformas, como na primeira visita a cada uma"""
+    plataformas = sorted(nome[:-3] for nome in os.listdir(DIRETORIO_APP)
+                         if nome.startswith("sistema_") and nome.endswith(".py"))
+    return "import " + ", ".join(["app", *plataformas])
+
+def medir_processo_novo(comando: Optional[str] = None, timeout: float = 120.0) -> dict:
+    """Importações de um interpretador novo (python -X importtime), com tudo ainda por carregar"""
+    comando = comando or _comando_padrao()
+    ambiente = {**os.environ, "PYTHONPATH": DIRETORIO_APP + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    # Sem o perfil no filho: ele mediria a si mesmo e dispararia outro processo
+    ambiente.pop("PORTAL_PERFIL_INICIALIZACAO", None)
+    with tempfile.TemporaryDirectory() as pasta:
+        inicio = time.perf_counter()
+        resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", comando], cwd=pasta, env=ambiente,
+                                   capture_output=True, text=True, timeout=timeout)
+        duracao = time.perf_counter() - inicio
+    return {"comando": comando, "codigo_saida": resultado.returncode, "duracao": duracao,
+            "importacoes": _ler_importtime(resultado.stderr)}
+
+class PerfilInicializacao:
+    def __init__(self, prefixo: str):
+        self.prefixo = prefixo
+        self.importacoes = []
+        self.etapas = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._lock_gravacao = threading.Lock()
+        self._import_original = builtins.__import__
+        self._import_module_original = importlib.import_module
+        self.processo_novo = None
+    
+    def instalar(self):
+        perfil = self
+        
+        def importar(nome, globals=None, locals=None, fromlist=(), level=0):
+            if level or nome in sys.modules:
+                return perfil._import_original(nome, globals, locals, fromlist, level)
+            return perfil._medir(nome, lambda: perfil._import_original(nome, globals, locals, fromlist, level))
+        
+        def import_module(nome, package=None):
+            if nome.startswith(".") or nome in sys.modules:
+                return perfil._import_module_original(nome, package)
+            return perfil._medir(nome, lambda: perfil._import_module_original(nome, package))
+        
+        builtins.__import__ = importar
+        importlib.import_module = import_module
+        threading.Thread(target=self._medir_processo_novo, name="perfil-processo-novo", daemon=True).start()
+    
+    def _medir_processo_novo(self):
+        try:
+            processo_novo = medir_processo_novo()
+        except (OSError, subprocess.SubprocessError) as e:
+            processo_novo = {"erro": repr(e)}
+        with self._lock:
+            self.processo_novo = processo_novo
+        self.gravar()
+    
+    def _medir(self, nome, importar):
+        pilha = getattr(self._local, "pilha", None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        pilha.append(nome)
+        caminho = ";".join(pilha)
+        inicio = time.perf_counter()
+        try:
+            return importar()
+        finally:
+            duracao = time.perf_counter() - inicio
+            pilha.pop()
+            with self._lock:
+                self.importacoes.append({
+                    "modulo": nome,
+                    "pilha": caminho,
+                    "thread": threading.current_thread().name,
+                    "inicio": inicio - INICIO_PROCESSO,
+                    "duracao": duracao,
+                })
+    
+    @contextmanager
+    def etapa(self, nome: str):
+        """Mede a primeira execução da etapa; as seguintes não são registradas"""
+        if nome in self.etapas:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            fim = time.perf_counter()
+            with self._lock:
+                self.etapas.setdefault(nome, {
+                    "duracao": fim - inicio,
+                    "desde_inicio": fim - INICIO_PROCESSO,
+                })
+            self.gravar()
+    
+    def _observada(self, modulo: str) -> bool:
+        return modulo.split(".")[0] in PACOTES_OBSERVADOS or modulo.startswith("sistema_")
+    
+    def relatorio(self) -> dict:
+        with self._lock:
+            importacoes = list(self.importacoes)
+            etapas = dict(self.etapas)
+            processo_novo = self.processo_novo
+        observadas = {}
+        for item in importacoes:
+            if self._observada(item["modulo"]):
+                # Fica a medição mais externa (maior tempo acumulado) de cada módulo
+                observadas[item["modulo"]] = max(observadas.get(item["modulo"], 0.0), item["duracao"])
+        if processo_novo and "importacoes" in processo_novo:
+            observadas_novo = {}
+            for pilha, _, acumulado in processo_novo["importacoes"]:
+                modulo = pilha.rpartition(";")[2]
+                if self._observada(modulo):
+                    observadas_novo[modulo] = max(observadas_novo.get(modulo, 0.0), acumulado / 1e6)
+            processo_novo = {
+                "comando": processo_novo["comando"],
+                "codigo_saida": processo_novo["codigo_saida"],
+                "duracao": processo_novo["duracao"],
+                "importacoes_observadas": dict(sorted(observadas_novo.items())),
+                "total_importacoes": len(processo_novo["importacoes"]),
+            }
+        return {
+            "versao_relatorio": 2,
+            "python": platform.python_version(),
+            "importacoes_observadas": dict(sorted(observadas.items())),
+            "etapas": etapas,
+            "processo_novo": processo_novo,
+            "total_importacoes": len(importacoes),
+            "importacoes": importacoes,
+        }
+    
+    def pilhas_colapsadas(self) -> str:
+        """Tempo exclusivo (µs) por pilha de importação, uma linha por pilha"""
+        with self._lock:
+            importacoes = list(self.importacoes)
+            processo_novo = self.processo_novo
+        filhos = {}
+        for item in importacoes:
+            pai = item["pilha"].rpartition(";")[0]
+            if pai:
+                filhos[pai] = filhos.get(pai, 0.0) + item["duracao"]
+        linhas = []
+        for item in importacoes:
+            exclusivo = max(0.0, item["duracao"] - filhos.get(item["pilha"], 0.0))
+            linhas.append(f"{item['thread']};{item['pilha']} {int(exclusivo * 1e6)}")
+        for nome, dados in self.etapas.items():
+            linhas.append(f"etapas;{nome} {int(dados['duracao'] * 1e6)}")
+        for pilha, proprio, _ in (processo_novo or {}).get("importacoes", []):
+            linhas.append(f"processo_novo;{pilha} {proprio}")
+        return "\n".join(linhas) + "\n"
+    
+    def gravar(self):
+        # A thread do processo novo também grava: os dois arquivos saem da mesma medição
+        with self._lock_gravacao:
+            with open(f"{self.prefixo}.json", "w", encoding="utf-8") as f:
+                json.dump(self.relatorio(), f, indent=4, ensure_ascii=False)
+            with open(f"{self.prefixo}.folded", "w", encoding="utf-8") as f:
+                f.write(self.pilhas_colapsadas())
+
+def _configurar():
+    destino = os.environ.get("PORTAL_PERFIL_INICIALIZACAO", "").strip()
+    if not destino:
+        return None
+    perfil = PerfilInicializacao("perfil_inicializacao" if destino == "1" else destino)
+    perfil.instalar()
+    return perfil
+
+perfil = _configurar()
+
+def etapa(nome: str):
+    """Contexto de medição; sem o perfil ligado não faz nada"""
+    if perfil is None:
+        return nullcontext()
+    return perfil.etapa(nome)
\ No newline at end of file
@@ -0,0 +1,78 @@
+import importlib
+import os
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional
+
+class RegistroPlataformas:
+    """Catálogo das plataformas com importação tardia dos módulos.
+    
+    Os módulos sistema_* puxam pandas e plotly ao serem importados; aqui
+    eles só são carregados no primeiro acesso (ou pelo pré-aquecimento em
+    segundo plano), então a tela de login não paga esse custo.
+    """
+    
+    def __init__(self, plataformas: List[dict]):
+        self.plataformas = plataformas
+        self._por_id = {p["id"]: p for p in plataformas}
+        self._modulos: Dict[str, ModuleType] = {}
+        self._tempos_importacao: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._locks_modulo: Dict[str, threading.Lock] = {}
+    
+    def obter(self, plataforma_id: str) -> Optional[dict]:
+        return self._por_id.get(plataforma_id)
+    
+    def _lock_do_modulo(self, nome_modulo: str) -> threading.Lock:
+        with self._lock:
+            return self._locks_modulo.setdefault(nome_modulo, threading.Lock())
+    
+    def carregar_modulo(self, plataforma_id: str) -> ModuleType:
+        """Importa o módulo da plataforma uma única vez e mede o tempo gasto"""
+        nome_modulo = self._por_id[plataforma_id]["modulo"]
+        modulo = self._modulos.get(nome_modulo)
+        if modulo is not None:
+            return modulo
+        
+        with self._lock_do_modulo(nome_modulo):
+            modulo = self._modulos.get(nome_modulo)
+            if modulo is None:
+                inicio = time.perf_counter()
+                modulo = importlib.import_module(nome_modulo)
+                self._tempos_importacao[nome_modulo] = time.perf_counter() - inicio
+                self._modulos[nome_modulo] = modulo
+        return modulo
+    
+    def pre_aquecer(self, plataforma_ids: Optional[Iterable[str]] = None) -> threading.Thread:
+        """Importa as plataformas indicadas (ou todas) numa thread em segundo plano"""
+        ids = list(plataforma_ids) if plataforma_ids is not None else list(self._por_id)
+        
+        def aquecer():
+            for plataforma_id in ids:
+                if plataforma_id in self._por_id:
+                    try:
+                        self.carregar_modulo(plataforma_id)
+                    except Exception:
+                        # O erro reaparece (e é exibido) no acesso normal à plataforma
+                        pass
+        
+        thread = threading.Thread(target=aquecer, name="pre-aquecimento-plataformas", daemon=True)
+        thread.start()
+        return thread
+    
+    def carregado(self, plataforma_id: str) -> bool:
+        return self._por_id[plataforma_id]["modulo"] in self._modulos
+    
+    def tempos_importacao(self) -> Dict[str, float]:
+        """Segundos gastos na primeira importação de cada módulo já carregado"""
+        return dict(self._tempos_importacao)
+
+def plataformas_para_pre_aquecer() -> Optional[List[str]]:
+    """Lê PORTAL_PRE_AQUECER: "todas", ou ids separados por vírgula; vazio desliga"""
+    valor = os.environ.get("PORTAL_PRE_AQUECER", "").strip()
+    if not valor:
+        return []
+    if valor == "todas":
+        return None
+    return [p.strip() for p in valor.split(",") if p.strip()]
\ No newline at end of file
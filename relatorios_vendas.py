@@ -0,0 +1,213 @@
+"""Relatórios de vendas sobre o livro, particionado por mês em memória.
+
+Cada partição é um DataFrame com as vendas de um mês, lido do SQLite pelo
+índice de data só quando um relatório precisa dele (Hoje e Esta Semana
+leem um ou dois meses, não o ano inteiro) e mantido num LRU. Depois da
+carga, só as vendas novas são buscadas: quando o PRAGMA data_version muda,
+as linhas com rowid acima do último visto (o livro é append-only) entram
+nas partições já carregadas do mês delas.
+
+Cada tipo de relatório é um groupby vetorizado sobre as linhas do período.
+O resultado fica em cache pela chave (relatório, início, fim, versão dos
+dados): repetir o relatório sem vendas novas não recalcula nada.
+
+Os valores ficam em centavos inteiros até a saída. Ticket médio, comissão e
+imposto arredondam meio centavo para cima em aritmética inteira, como o
+livro (centavos()) e os resumos: o Series.round() do pandas arredonda meio
+para o par e divergiria deles em um centavo.
+"""
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from livro_vendas import obter_livro_vendas
+from metricas import registro_metricas
+from resumos_vendas import SEM_CATEGORIA
+
+COLUNAS = ("data", "cliente", "produto", "categoria", "forma_pagamento", "quantidade", "total")
+
+COMISSAO_PADRAO = 0.05
+COMISSOES = {"Serviços": 0.10}
+IMPOSTO_PADRAO = ("ICMS", 0.18)
+IMPOSTOS = {"Serviços": ("ISS", 0.05)}
+# Taxas e alíquotas viram inteiros nesta escala (0,01%) antes de multiplicar os centavos
+ESCALA_TAXA = 10_000
+
+# Colunas de saída em reais e em percentual, para a formatação na tela
+COLUNAS_EM_REAIS = {"Vendas", "Faturamento", "Ticket Médio", "Comissão", "Imposto"}
+COLUNAS_PERCENTUAIS = {"% do Faturamento", "Taxa", "Alíquota"}
+
+def _em_reais(tabela: pd.DataFrame) -> pd.DataFrame:
+    """Converte as colunas em centavos para reais, só na saída"""
+    for coluna in COLUNAS_EM_REAIS.intersection(tabela.columns):
+        tabela[coluna] = tabela[coluna] / 100
+    return tabela
+
+def _dividir(numerador: pd.Series, denominador: pd.Series) -> pd.Series:
+    """Divisão de inteiros arredondando meio centavo para cima"""
+    return (numerador + denominador // 2) // denominador
+
+def _aplicar_taxa(valores: pd.Series, taxas: pd.Series) -> pd.Series:
+    """Centavos vezes a taxa, arredondando meio centavo para cima"""
+    pontos = (taxas * ESCALA_TAXA).round().astype("int64")
+    return _dividir(valores * pontos, ESCALA_TAXA)
+
+def _por_periodo(vendas: pd.DataFrame) -> pd.DataFrame:
+    tabela = vendas.groupby("data").agg(
+        Vendas=("total", "sum"), Pedidos=("total", "size"), Clientes=("cliente", "nunique")
+    ).sort_index(ascending=False)
+    tabela["Ticket Médio"] = _dividir(tabela["Vendas"], tabela["Pedidos"])
+    tabela.index = tabela.index.strftime("%d/%m/%Y")
+    return _em_reais(tabela.rename_axis("Data").reset_index())
+
+def _por_produto(vendas: pd.DataFrame) -> pd.DataFrame:
+    tabela = vendas.groupby("produto").agg(
+        Quantidade=("quantidade", "sum"), Pedidos=("total", "size"), Faturamento=("total", "sum")
+    ).sort_values("Faturamento", ascending=False)
+    tabela["% do Faturamento"] = tabela["Faturamento"] / tabela["Faturamento"].sum() * 100
+    return _em_reais(tabela.rename_axis("Produto").reset_index())
+
+def _por_cliente(vendas: pd.DataFrame) -> pd.DataFrame:
+    tabela = vendas.groupby("cliente").agg(
+        Compras=("total", "size"), Itens=("quantidade", "sum"), Faturamento=("total", "sum"),
+        Ultima=("data", "max")
+    ).sort_values("Faturamento", ascending=False)
+    tabela["Ticket Médio"] = _dividir(tabela["Faturamento"], tabela["Compras"])
+    tabela["Ultima"] = tabela["Ultima"].dt.strftime("%d/%m/%Y")
+    tabela = tabela.rename(columns={"Ultima": "Última Compra"})
+    return _em_reais(tabela.rename_axis("Cliente").reset_index())
+
+def _comissoes(vendas: pd.DataFrame) -> pd.DataFrame:
+    tabela = vendas.groupby("categoria").agg(Pedidos=("total", "size"), Faturamento=("total", "sum"))
+    taxas = tabela.index.to_series().map(COMISSOES).fillna(COMISSAO_PADRAO)
+    tabela["Taxa"] = taxas * 100
+    tabela["Comissão"] = _aplicar_taxa(tabela["Faturamento"], taxas)
+    tabela = tabela.sort_values("Comissão", ascending=False)
+    return _em_reais(tabela.rename_axis("Categoria").reset_index())
+
+def _impostos(vendas: pd.DataFrame) -> pd.DataFrame:
+    tabela = vendas.groupby("categoria").agg(Faturamento=("total", "sum"))
+    impostos = tabela.index.to_series().map(lambda categoria: IMPOSTOS.get(categoria, IMPOSTO_PADRAO))
+    aliquotas = impostos.str[1].astype(float)
+    tabela["Tributo"] = impostos.str[0]
+    tabela["Alíquota"] = aliquotas * 100
+    tabela["Imposto"] = _aplicar_taxa(tabela["Faturamento"], aliquotas)
+    tabela = tabela.sort_values("Imposto", ascending=False)
+    return _em_reais(tabela.rename_axis("Categoria").reset_index())
+
+RELATORIOS: Dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {
+    "Vendas por Período": _por_periodo,
+    "Vendas por Produto": _por_produto,
+    "Vendas por Cliente": _por_cliente,
+    "Comissões": _comissoes,
+    "Impostos": _impostos,
+}
+
+def _meses(inicio: date, fim: date) -> List[str]:
+    """Meses ("AAAA-MM") de inicio a fim, inclusive"""
+    meses = []
+    ano, mes = inicio.year, inicio.month
+    while (ano, mes) <= (fim.year, fim.month):
+        meses.append(f"{ano:04d}-{mes:02d}")
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+    return meses
+
+def _quadro(linhas: List[tuple]) -> pd.DataFrame:
+    quadro = pd.DataFrame.from_records(linhas, columns=list(COLUNAS))
+    # Data como datetime64: filtro e max() comparam números, não strings
+    quadro["data"] = pd.to_datetime(quadro["data"], format="%Y-%m-%d")
+    # Mesmo rótulo dos resumos para vendas sem categoria
+    quadro["categoria"] = quadro["categoria"].fillna("").replace("", SEM_CATEGORIA)
+    return quadro.astype({"quantidade": "int64", "total": "int64"})
+
+class MotorRelatorios:
+    def __init__(self, caminho: str = "vendas.db", max_particoes: int = 24, max_resultados: int = 64):
+        self.caminho = caminho
+        self.max_particoes = max_particoes
+        self.max_resultados = max_resultados
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, timeout=30)
+        self._particoes: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._resultados: "OrderedDict[Tuple[str, date, date, int], pd.DataFrame]" = OrderedDict()
+        self._contadores = {"relatorios": 0, "acertos_cache": 0, "particoes_lidas": 0, "vendas_incrementais": 0}
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        self._ultimo_rowid = self._conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM vendas").fetchone()[0]
+    
+    def _sincronizar(self):
+        """Acrescenta às partições carregadas as vendas gravadas desde a última leitura"""
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+        linhas = self._conn.execute(
+            f"SELECT rowid, {', '.join(COLUNAS)} FROM vendas WHERE rowid > ? ORDER BY rowid",
+            (self._ultimo_rowid,)
+        ).fetchall()
+        if not linhas:
+            return
+        self._ultimo_rowid = linhas[-1][0]
+        self._contadores["vendas_incrementais"] += len(linhas)
+        novas = _quadro([linha[1:] for linha in linhas])
+        for mes, grupo in novas.groupby(novas["data"].dt.strftime("%Y-%m")):
+            # Meses fora do cache vão ler essas vendas do banco quando forem carregados
+            if mes in self._particoes:
+                self._particoes[mes] = pd.concat([self._particoes[mes], grupo], ignore_index=True)
+    
+    def _particao(self, mes: str) -> pd.DataFrame:
+        if mes in self._particoes:
+            self._particoes.move_to_end(mes)
+            return self._particoes[mes]
+        # rowid <= último visto: as vendas mais novas chegam por _sincronizar, sem contar duas vezes
+        linhas = self._conn.execute(
+            f"SELECT {', '.join(COLUNAS)} FROM vendas WHERE data BETWEEN ? AND ? AND rowid <= ?",
+            (f"{mes}-01", f"{mes}-31", self._ultimo_rowid)
+        ).fetchall()
+        particao = self._particoes[mes] = _quadro(linhas)
+        self._contadores["particoes_lidas"] += 1
+        while len(self._particoes) > self.max_particoes:
+            self._particoes.popitem(last=False)
+        return particao
+    
+    def gerar(self, relatorio: str, inicio: date, fim: date) -> pd.DataFrame:
+        """Relatório do tipo pedido com as vendas de inicio a fim (inclusive)"""
+        if relatorio not in RELATORIOS:
+            raise ValueError(f"Relatório desconhecido: {relatorio}")
+        if inicio > fim:
+            raise ValueError("A data inicial é posterior à final")
+        with self._lock:
+            self._sincronizar()
+            self._contadores["relatorios"] += 1
+            chave = (relatorio, inicio, fim, self._data_version)
+            if chave in self._resultados:
+                self._resultados.move_to_end(chave)
+                self._contadores["acertos_cache"] += 1
+                return self._resultados[chave]
+            particoes = [self._particao(mes) for mes in _meses(inicio, fim)]
+        
+        # Partições não são alteradas no lugar (vendas novas geram um DataFrame novo),
+        # então o cálculo pode acontecer fora do lock
+        vendas = pd.concat(particoes, ignore_index=True) if len(particoes) > 1 else particoes[0]
+        no_periodo = vendas["data"].between(pd.Timestamp(inicio), pd.Timestamp(fim))
+        resultado = RELATORIOS[relatorio](vendas[no_periodo])
+        
+        with self._lock:
+            self._resultados[chave] = resultado
+            while len(self._resultados) > self.max_resultados:
+                self._resultados.popitem(last=False)
+        return resultado
+    
+    def contadores(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._contadores, "particoes_em_memoria": len(self._particoes)}
+
+@st.cache_resource
+def obter_motor_relatorios() -> MotorRelatorios:
+    """Motor do processo, lendo o livro de vendas compartilhado"""
+    motor = MotorRelatorios(obter_livro_vendas().caminho)
+    registro_metricas.registrar_coletor("relatorios_vendas", motor.contadores)
+    return motor
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""Agendamentos persistidos em SQLite, com índice de intervalos em memória.
+
+Os horários de um profissional num dia nunca se sobrepõem (o repositório
+recusa conflitos), então cada (profissional, dia) vira duas listas
+ordenadas, de inícios e de fins, e a checagem de conflito é uma busca
+binária. Os dias são carregados sob demanda pelo índice do SQLite em
+(profissional, data, inicio) e guardados num LRU; o histórico inteiro nunca
+precisa estar em memória.
+
+Horários são minutos desde a meia-noite; datas, texto ISO (AAAA-MM-DD).
+"""
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, fields
+from datetime import date, datetime, time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import streamlit as st
+
+from gerador_ids import novo_id
+
+STATUS_ATIVOS = ("Confirmado", "Em espera")
+
+class ConflitoAgendamento(Exception):
+    """O profissional já tem agendamento nesse intervalo"""
+
+@dataclass
+class Agendamento:
+    id: str
+    profissional: str
+    data: str
+    inicio: int
+    fim: int
+    cliente: str
+    telefone: str
+    servico: str
+    email: str = ""
+    observacoes: str = ""
+    status: str = "Confirmado"
+    criado_em: str = ""
+
+CAMPOS_AGENDAMENTO = tuple(campo.name for campo in fields(Agendamento))
+
+def minutos(horario: Union[time, str, int]) -> int:
+    """Converte "HH:MM" ou datetime.time em minutos desde a meia-noite"""
+    if isinstance(horario, int):
+        return horario
+    if isinstance(horario, str):
+        horario = datetime.strptime(horario, "%H:%M").time()
+    return horario.hour * 60 + horario.minute
+
+def formatar_minutos(valor: int) -> str:
+    return f"{valor // 60:02d}:{valor % 60:02d}"
+
+def _dia(data: Union[date, str]) -> str:
+    return data if isinstance(data, str) else data.isoformat()
+
+class _DiaProfissional:
+    """Intervalos ativos de um profissional num dia, ordenados pelo início"""
+    
+    __slots__ = ("inicios", "fins", "ids")
+    
+    def __init__(self, linhas: Iterable[Tuple[int, int, str]]):
+        self.inicios: List[int] = []
+        self.fins: List[int] = []
+        self.ids: List[str] = []
+        for inicio, fim, agendamento_id in linhas:
+            self.inicios.append(inicio)
+            self.fins.append(fim)
+            self.ids.append(agendamento_id)
+    
+    def conflitos(self, inicio: int, fim: int) -> List[str]:
+        # Sem sobreposição, os fins também estão ordenados: os conflitantes
+        # são os que começam antes de `fim` e terminam depois de `inicio`
+        ate = bisect_left(self.inicios, fim)
+        desde = bisect_right(self.fins, inicio)
+        return self.ids[desde:ate]
+    
+    def inserir(self, inicio: int, fim: int, agendamento_id: str):
+        posicao = bisect_left(self.inicios, inicio)
+        self.inicios.insert(posicao, inicio)
+        self.fins.insert(posicao, fim)
+        self.ids.insert(posicao, agendamento_id)
+    
+    def ocupados(self) -> List[Tuple[int, int]]:
+        return list(zip(self.inicios, self.fins))
+
+class RepositorioAgendamentos:
+    def __init__(self, caminho: str = "agendamentos.db", max_dias_cache: int = 4096):
+        self.caminho = caminho
+        self.max_dias_cache = max_dias_cache
+        self._dias: "OrderedDict[Tuple[str, str], _DiaProfissional]" = OrderedDict()
+        self._agendas: Dict[str, List[Agendamento]] = {}
+        self._versao = None
+        self._ouvintes: List[Callable[[Optional[str], Optional[str]], None]] = []
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS agendamentos (
+                    id TEXT PRIMARY KEY,
+                    profissional TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    inicio INTEGER NOT NULL,
+                    fim INTEGER NOT NULL,
+                    cliente TEXT NOT NULL,
+                    telefone TEXT NOT NULL,
+                    servico TEXT NOT NULL,
+                    email TEXT NOT NULL DEFAULT '',
+                    observacoes TEXT NOT NULL DEFAULT '',
+                    status TEXT NOT NULL,
+                    criado_em TEXT NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_agendamentos_agenda ON agendamentos (profissional, data, inicio)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_agendamentos_data ON agendamentos (data)")
+            self._versao = self.versao()
+    
+    def versao(self):
+        # data_version muda quando outra conexão confirma uma transação
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def ao_alterar(self, ouvinte: Callable[[Optional[str], Optional[str]], None]):
+        """Registra ouvinte(profissional, dia) chamado a cada mudança na agenda.
+        
+        (None, None) significa que qualquer dia pode ter mudado (gravação de
+        outro worker ou importação em lote).
+        """
+        self._ouvintes.append(ouvinte)
+    
+    def _notificar(self, profissional: Optional[str], dia: Optional[str]):
+        if dia is None:
+            self._agendas.clear()
+        else:
+            self._agendas.pop(dia, None)
+        for ouvinte in self._ouvintes:
+            ouvinte(profissional, dia)
+    
+    def _descartar_se_alterado(self):
+        """Outro worker gravou: os dias em cache podem estar velhos"""
+        versao = self.versao()
+        if versao != self._versao:
+            self._dias.clear()
+            self._versao = versao
+            self._notificar(None, None)
+    
+    def sincronizar(self):
+        """Confere se outro worker alterou a agenda (um PRAGMA, sem ler linhas)"""
+        with self._lock:
+            self._descartar_se_alterado()
+    
+    def _ler_dia(self, profissional: str, dia: str) -> _DiaProfissional:
+        cursor = self._conn.execute(f"""
+            SELECT inicio, fim, id FROM agendamentos
+            WHERE profissional = ? AND data = ? AND status IN ({', '.join('?' * len(STATUS_ATIVOS))})
+            ORDER BY inicio
+        """, (profissional, dia, *STATUS_ATIVOS))
+        return _DiaProfissional(cursor)
+    
+    def _dia_profissional(self, profissional: str, dia: str) -> _DiaProfissional:
+        chave = (profissional, dia)
+        indice = self._dias.get(chave)
+        if indice is None:
+            indice = self._dias[chave] = self._ler_dia(profissional, dia)
+            while len(self._dias) > self.max_dias_cache:
+                self._dias.popitem(last=False)
+        self._dias.move_to_end(chave)
+        return indice
+    
+    def conflitos(self, profissional: str, data: Union[date, str], inicio, fim) -> List[str]:
+        """Ids dos agendamentos ativos que se sobrepõem a [inicio, fim)"""
+        with self._lock:
+            self._descartar_se_alterado()
+            return self._dia_profissional(profissional, _dia(data)).conflitos(minutos(inicio), minutos(fim))
+    
+    def esta_livre(self, profissional: str, data: Union[date, str], inicio, fim) -> bool:
+        return not self.conflitos(profissional, data, inicio, fim)
+    
+    def ocupados(self, profissional: str, data: Union[date, str]) -> List[Tuple[int, int]]:
+        """Intervalos (inicio, fim) já reservados para o profissional no dia"""
+        with self._lock:
+            self._descartar_se_alterado()
+            return self._dia_profissional(profissional, _dia(data)).ocupados()
+    
+    def agendar(self, profissional: str, data: Union[date, str], inicio, fim, cliente: str, telefone: str,
+                servico: str, email: str = "", observacoes: str = "") -> Agendamento:
+        """Grava o agendamento ou levanta ConflitoAgendamento"""
+        agendamento = Agendamento(
+            id=novo_id("AGD"),
+            profissional=profissional,
+            data=_dia(data),
+            inicio=minutos(inicio),
+            fim=minutos(fim),
+            cliente=cliente,
+            telefone=telefone,
+            servico=servico,
+            email=email,
+            observacoes=observacoes,
+            criado_em=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        if agendamento.fim <= agendamento.inicio:
+            raise ValueError("O fim do agendamento precisa ser depois do início")
+        
+        with self._lock:
+            # A transação segura a escrita entre workers: a checagem é refeita
+            # com o dia lido do banco, não com o cache
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Commits de outros workers antes deste ficam visíveis ao cache;
+                # o próprio commit não muda o data_version desta conexão
+                self._descartar_se_alterado()
+                indice = self._ler_dia(agendamento.profissional, agendamento.data)
+                conflitantes = indice.conflitos(agendamento.inicio, agendamento.fim)
+                if conflitantes:
+                    raise ConflitoAgendamento(
+                        f"{profissional} já tem agendamento entre {formatar_minutos(agendamento.inicio)} "
+                        f"e {formatar_minutos(agendamento.fim)} em {agendamento.data}"
+                    )
+                self._conn.execute(
+                    f"INSERT INTO agendamentos ({', '.join(CAMPOS_AGENDAMENTO)}) "
+                    f"VALUES ({', '.join(':' + campo for campo in CAMPOS_AGENDAMENTO)})",
+                    asdict(agendamento)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            indice.inserir(agendamento.inicio, agendamento.fim, agendamento.id)
+            self._dias[(agendamento.profissional, agendamento.data)] = indice
+            self._notificar(agendamento.profissional, agendamento.data)
+        return agendamento
+    
+    def inserir_lote(self, agendamentos: Iterable[Agendamento]):
+        """Importação em massa sem checagem de conflito (migrações, benchmarks)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._descartar_se_alterado()
+                self._conn.executemany(
+                    f"INSERT INTO agendamentos ({', '.join(CAMPOS_AGENDAMENTO)}) "
+                    f"VALUES ({', '.join('?' * len(CAMPOS_AGENDAMENTO))})",
+                    (tuple(getattr(a, campo) for campo in CAMPOS_AGENDAMENTO) for a in agendamentos)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._dias.clear()
+            self._notificar(None, None)
+    
+    def alterar_status(self, agendamento_id: str, status: str) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._descartar_se_alterado()
+                linha = self._conn.execute(
+                    "SELECT profissional, data FROM agendamentos WHERE id = ?", (agendamento_id,)
+                ).fetchone()
+                if linha is not None:
+                    self._conn.execute("UPDATE agendamentos SET status = ? WHERE id = ?", (status, agendamento_id))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if linha is None:
+                return False
+            self._dias.pop((linha["profissional"], linha["data"]), None)
+            self._notificar(linha["profissional"], linha["data"])
+            return True
+    
+    def do_dia(self, data: Union[date, str]) -> List[Agendamento]:
+        """Agendamentos do dia (todos os status), em ordem de horário.
+        
+        A lista fica em cache até a agenda desse dia mudar; não altere.
+        """
+        dia = _dia(data)
+        with self._lock:
+            self._descartar_se_alterado()
+            agenda = self._agendas.get(dia)
+            if agenda is None:
+                cursor = self._conn.execute(
+                    f"SELECT {', '.join(CAMPOS_AGENDAMENTO)} FROM agendamentos WHERE data = ? "
+                    "ORDER BY inicio, profissional", (dia,)
+                )
+                agenda = self._agendas[dia] = [Agendamento(**dict(linha)) for linha in cursor]
+                if len(self._agendas) > self.max_dias_cache:
+                    self._agendas.clear()
+                    self._agendas[dia] = agenda
+            return agenda
+    
+    def clientes_desde(self, rowid: int = 0) -> List[tuple]:
+        """(rowid, cliente, telefone, email, data) dos agendamentos gravados depois de `rowid`"""
+        with self._lock:
+            return [tuple(linha) for linha in self._conn.execute(
+                "SELECT rowid, cliente, telefone, email, data FROM agendamentos WHERE rowid > ? ORDER BY rowid",
+                (rowid,)
+            )]
+
+@st.cache_resource
+def obter_repositorio_agendamentos() -> RepositorioAgendamentos:
+    """Repositório único do processo, compartilhado pelas sessões"""
+    return RepositorioAgendamentos()
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""Resumos das vendas por dia, mês, produto, categoria e forma de pagamento.
+
+Cada lote gravado pelo livro de vendas soma seus totais nas linhas de
+resumo dentro da mesma transação que insere as vendas (LivroVendas.
+na_transacao): o resumo nunca fica adiantado nem atrasado em relação ao
+livro e inclui as vendas de todos os workers. O lote é agregado em Python
+antes do UPSERT, então mil vendas do mesmo dia viram poucas linhas.
+
+As métricas e gráficos do painel leem linhas pela chave primária
+(dimensão, período, chave) em vez de somar o livro inteiro; o resultado
+fica em memória até o PRAGMA data_version indicar um commit novo. Um banco
+que já tinha vendas antes dos resumos é resumido uma vez, com GROUP BY.
+"""
+import sqlite3
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+import streamlit as st
+
+from livro_vendas import Venda, obter_livro_vendas
+
+SEM_CATEGORIA = "Sem categoria"
+
+# dimensão → (período, chave) em SQL sobre a tabela de vendas; _chaves() faz o mesmo em Python
+DIMENSOES: Dict[str, Tuple[str, str]] = {
+    "dia": ("data", "''"),
+    "mes": ("substr(data, 1, 7)", "''"),
+    "produto": ("substr(data, 1, 7)", "produto"),
+    "categoria": ("substr(data, 1, 7)", f"COALESCE(NULLIF(categoria, ''), '{SEM_CATEGORIA}')"),
+    "pagamento": ("substr(data, 1, 7)", "forma_pagamento"),
+}
+
+@dataclass(frozen=True)
+class Totais:
+    vendas: int = 0
+    itens: int = 0
+    faturamento: int = 0
+    
+    @property
+    def ticket_medio(self) -> int:
+        """Faturamento por venda, em centavos arredondados"""
+        return (self.faturamento + self.vendas // 2) // self.vendas if self.vendas else 0
+
+def _chaves(venda: Venda) -> Iterator[Tuple[str, str, str]]:
+    mes = venda.data[:7]
+    yield "dia", venda.data, ""
+    yield "mes", mes, ""
+    yield "produto", mes, venda.produto
+    yield "categoria", mes, venda.categoria or SEM_CATEGORIA
+    yield "pagamento", mes, venda.forma_pagamento
+
+def acumular(conn: sqlite3.Connection, lote: List[Venda]):
+    """Soma o lote nos resumos; roda dentro da transação do livro de vendas"""
+    somas: Dict[Tuple[str, str, str], List[int]] = defaultdict(lambda: [0, 0, 0])
+    for venda in lote:
+        for chave in _chaves(venda):
+            soma = somas[chave]
+            soma[0] += 1
+            soma[1] += venda.quantidade
+            soma[2] += venda.total
+    conn.executemany("""
+        INSERT INTO resumos_vendas (dimensao, periodo, chave, vendas, itens, faturamento)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (dimensao, periodo, chave) DO UPDATE SET
+            vendas = vendas + excluded.vendas,
+            itens = itens + excluded.itens,
+            faturamento = faturamento + excluded.faturamento
+    """, [(*chave, *soma) for chave, soma in somas.items()])
+
+class ResumosVendas:
+    def __init__(self, caminho: str = "vendas.db"):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS resumos_vendas (
+                dimensao TEXT NOT NULL,
+                periodo TEXT NOT NULL,
+                chave TEXT NOT NULL,
+                vendas INTEGER NOT NULL,
+                itens INTEGER NOT NULL,
+                faturamento INTEGER NOT NULL,
+                PRIMARY KEY (dimensao, periodo, chave)
+            ) WITHOUT ROWID
+        """)
+        self._data_version = None
+        self._cache: Dict[tuple, list] = {}
+    
+    def reconstruir_se_vazio(self):
+        """Resume de uma vez as vendas gravadas antes de existirem os resumos"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                vazio = self._conn.execute("SELECT 1 FROM resumos_vendas LIMIT 1").fetchone() is None
+                if vazio:
+                    for dimensao, (periodo, chave) in DIMENSOES.items():
+                        self._conn.execute(f"""
+                            INSERT INTO resumos_vendas (dimensao, periodo, chave, vendas, itens, faturamento)
+                            SELECT '{dimensao}', {periodo}, {chave}, COUNT(*), SUM(quantidade), SUM(total)
+                            FROM vendas GROUP BY 2, 3
+                        """)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def _ler(self, sql: str, parametros: tuple) -> list:
+        """Linhas da consulta, guardadas até o próximo commit no banco"""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                self._data_version = data_version
+                self._cache.clear()
+            chave = (sql, parametros)
+            if chave not in self._cache:
+                self._cache[chave] = self._conn.execute(sql, parametros).fetchall()
+            return self._cache[chave]
+    
+    def _totais(self, dimensao: str, periodo: str, chave: str = "") -> Totais:
+        linhas = self._ler(
+            "SELECT vendas, itens, faturamento FROM resumos_vendas WHERE dimensao = ? AND periodo = ? AND chave = ?",
+            (dimensao, periodo, chave)
+        )
+        return Totais(*linhas[0]) if linhas else Totais()
+    
+    def do_dia(self, dia: date) -> Totais:
+        return self._totais("dia", dia.isoformat())
+    
+    def do_mes(self, dia: date) -> Totais:
+        """Totais do mês civil que contém `dia`"""
+        return self._totais("mes", dia.strftime("%Y-%m"))
+    
+    def por_dia(self, inicio: date, fim: date) -> Dict[date, Totais]:
+        """Totais de cada dia de inicio a fim (inclusive), com zeros nos dias sem venda"""
+        linhas = self._ler(
+            "SELECT periodo, vendas, itens, faturamento FROM resumos_vendas "
+            "WHERE dimensao = 'dia' AND periodo BETWEEN ? AND ?",
+            (inicio.isoformat(), fim.isoformat())
+        )
+        encontrados = {periodo: Totais(*totais) for periodo, *totais in linhas}
+        dias = [inicio + timedelta(days=i) for i in range((fim - inicio).days + 1)]
+        return {dia: encontrados.get(dia.isoformat(), Totais()) for dia in dias}
+    
+    def ranking(self, dimensao: str, dia: date, limite: int = 0) -> List[Tuple[str, Totais]]:
+        """Produtos, categorias ou formas de pagamento do mês de `dia`, por faturamento"""
+        if dimensao not in ("produto", "categoria", "pagamento"):
+            raise ValueError(f"Dimensão sem ranking: {dimensao}")
+        linhas = self._ler(
+            "SELECT chave, vendas, itens, faturamento FROM resumos_vendas "
+            "WHERE dimensao = ? AND periodo = ? ORDER BY faturamento DESC LIMIT ?",
+            (dimensao, dia.strftime("%Y-%m"), limite or -1)
+        )
+        return [(chave, Totais(*totais)) for chave, *totais in linhas]
+
+@st.cache_resource
+def obter_resumos_vendas() -> ResumosVendas:
+    """Resumos do processo, somados pelo livro de vendas compartilhado"""
+    livro = obter_livro_vendas()
+    resumos = ResumosVendas(livro.caminho)
+    # Primeiro o gravador, depois a reconstrução: nenhuma venda fica de fora
+    livro.na_transacao(acumular)
+    resumos.reconstruir_se_vazio()
+    return resumos
\ No newline at end of file
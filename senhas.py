@@ -0,0 +1,101 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from dataclasses import dataclass
+
+# Formatos gravados em Usuario.senha_hash:
+#   scrypt$<n>$<r>$<p>$<salt>$<hash>
+#   pbkdf2_sha256$<iteracoes>$<salt>$<hash>
+#   <64 hex>  (SHA-256 sem salt das versões antigas)
+
+TAMANHO_SALT = 16
+TAMANHO_HASH = 32
+
+@dataclass(frozen=True)
+class PoliticaSenha:
+    algoritmo: str = "scrypt"
+    scrypt_n: int = 2 ** 14
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    pbkdf2_iteracoes: int = 600_000
+    
+    @classmethod
+    def do_ambiente(cls) -> "PoliticaSenha":
+        """Política ajustável por SENHA_ALGORITMO, SENHA_SCRYPT_N e SENHA_PBKDF2_ITERACOES"""
+        padrao = cls()
+        return cls(
+            algoritmo=os.environ.get("SENHA_ALGORITMO", padrao.algoritmo),
+            scrypt_n=int(os.environ.get("SENHA_SCRYPT_N", padrao.scrypt_n)),
+            pbkdf2_iteracoes=int(os.environ.get("SENHA_PBKDF2_ITERACOES", padrao.pbkdf2_iteracoes)),
+        )
+
+def _b64(dados: bytes) -> str:
+    return base64.b64encode(dados).decode("ascii")
+
+def _scrypt(senha: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # maxmem padrão do OpenSSL (32 MiB) não comporta n >= 2**15
+    return hashlib.scrypt(senha.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r * p, dklen=TAMANHO_HASH)
+
+def _pbkdf2(senha: str, salt: bytes, iteracoes: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", senha.encode(), salt, iteracoes, dklen=TAMANHO_HASH)
+
+def gerar_hash(senha: str, politica: PoliticaSenha = None) -> str:
+    politica = politica or POLITICA_PADRAO
+    salt = secrets.token_bytes(TAMANHO_SALT)
+    if politica.algoritmo == "scrypt":
+        derivado = _scrypt(senha, salt, politica.scrypt_n, politica.scrypt_r, politica.scrypt_p)
+        return f"scrypt${politica.scrypt_n}${politica.scrypt_r}${politica.scrypt_p}${_b64(salt)}${_b64(derivado)}"
+    if politica.algoritmo == "pbkdf2_sha256":
+        derivado = _pbkdf2(senha, salt, politica.pbkdf2_iteracoes)
+        return f"pbkdf2_sha256${politica.pbkdf2_iteracoes}${_b64(salt)}${_b64(derivado)}"
+    raise ValueError(f"Algoritmo de senha desconhecido: {politica.algoritmo}")
+
+def verificar_senha(senha: str, senha_hash: str) -> bool:
+    partes = senha_hash.split("$")
+    if partes[0] == "scrypt" and len(partes) == 6:
+        n, r, p = int(partes[1]), int(partes[2]), int(partes[3])
+        esperado = base64.b64decode(partes[5])
+        calculado = _scrypt(senha, base64.b64decode(partes[4]), n, r, p)
+    elif partes[0] == "pbkdf2_sha256" and len(partes) == 4:
+        esperado = base64.b64decode(partes[3])
+        calculado = _pbkdf2(senha, base64.b64decode(partes[2]), int(partes[1]))
+    elif len(partes) == 1:
+        esperado = senha_hash.encode()
+        calculado = hashlib.sha256(senha.encode()).hexdigest().encode()
+    else:
+        return False
+    return hmac.compare_digest(esperado, calculado)
+
+def precisa_rehash(senha_hash: str, politica: PoliticaSenha = None) -> bool:
+    """True se o hash gravado é mais fraco que a política atual"""
+    politica = politica or POLITICA_PADRAO
+    partes = senha_hash.split("$")
+    if partes[0] != politica.algoritmo:
+        return True
+    if politica.algoritmo == "scrypt":
+        n, r, p = int(partes[1]), int(partes[2]), int(partes[3])
+        return (n, r, p) < (politica.scrypt_n, politica.scrypt_r, politica.scrypt_p)
+    return int(partes[1]) < politica.pbkdf2_iteracoes
+
+POLITICA_PADRAO = PoliticaSenha.do_ambiente()
+
+# scrypt/PBKDF2 liberam o GIL, então logins simultâneos calculam hashes em
+# paralelo; cada scrypt da política padrão aloca 16 MiB. O semáforo limita
+# quantos rodam ao mesmo tempo no processo (SENHA_THREADS), seja verificação
+# ou geração (rehash no login, cadastro), e os demais esperam a vez na
+# própria thread da sessão, sem troca de thread.
+_hashes_simultaneos = threading.BoundedSemaphore(int(os.environ.get("SENHA_THREADS", min(4, os.cpu_count() or 1))))
+
+def verificar_senha_limitada(senha: str, senha_hash: str) -> bool:
+    """verificar_senha com no máximo SENHA_THREADS hashes simultâneos no processo"""
+    with _hashes_simultaneos:
+        return verificar_senha(senha, senha_hash)
+
+def gerar_hash_limitado(senha: str, politica: PoliticaSenha = None) -> str:
+    """gerar_hash com no máximo SENHA_THREADS hashes simultâneos no processo"""
+    with _hashes_simultaneos:
+        return gerar_hash(senha, politica)
\ No newline at end of file
@@ -0,0 +1,191 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Dict, Optional
+
+from travas import trava_arquivo
+
+VALIDADE_PADRAO = 8 * 60 * 60
+TAMANHO_MINIMO_SEGREDO = 32
+
+def _b64(dados: bytes) -> str:
+    return base64.urlsafe_b64encode(dados).rstrip(b"=").decode("ascii")
+
+def _de_b64(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+def _validar_segredo(segredo: bytes, origem: str) -> bytes:
+    if len(segredo) < TAMANHO_MINIMO_SEGREDO:
+        raise ValueError(f"Segredo de sessão em {origem} tem {len(segredo)} bytes; "
+                         f"o mínimo é {TAMANHO_MINIMO_SEGREDO}")
+    return segredo
+
+def carregar_segredo(caminho: str = ".segredo_sessao") -> bytes:
+    """Chave HMAC: PORTAL_SEGREDO_SESSAO ou um arquivo gerado uma única vez.
+    
+    O arquivo é escrito por completo num temporário e só então ligado ao
+    nome final com os.link, que falha se o nome já existe: todos os workers
+    da máquina acabam usando a mesma chave, e nenhum lê um arquivo pela
+    metade. Chaves com menos de TAMANHO_MINIMO_SEGREDO bytes são recusadas.
+    """
+    segredo = os.environ.get("PORTAL_SEGREDO_SESSAO")
+    if segredo:
+        return _validar_segredo(segredo.encode(), "PORTAL_SEGREDO_SESSAO")
+    if not os.path.exists(caminho):
+        caminho_tmp = f"{caminho}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+        fd = os.open(caminho_tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+                f.flush()
+                os.fsync(f.fileno())
+            os.link(caminho_tmp, caminho)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(caminho_tmp)
+    with open(caminho, "r") as f:
+        return _validar_segredo(f.read().strip().encode(), caminho)
+
+class ListaRevogacao:
+    """Sessões encerradas, num arquivo append-only compartilhado pelos workers.
+    
+    Cada linha é "<jti> <expiração>". A verificação só faz um stat e lê o
+    que foi acrescentado desde a última vez. Acréscimo e compactação seguram
+    a mesma trava entre processos: nenhuma revogação se perde na troca do
+    arquivo.
+    """
+    
+    def __init__(self, caminho: str = "sessoes_revogadas.txt", limite_compactacao: int = 10_000):
+        self.caminho = caminho
+        self.limite_compactacao = limite_compactacao
+        self._revogados: Dict[str, float] = {}
+        self._posicao = 0
+        self._inode = None
+        self._arquivo = None
+        self._lock = threading.Lock()
+    
+    def _sincronizar(self):
+        try:
+            info = os.stat(self.caminho)
+        except FileNotFoundError:
+            return
+        if info.st_size == self._posicao and info.st_ino == self._inode:
+            return
+        with self._lock:
+            if info.st_ino != self._inode or info.st_size < self._posicao:
+                # Arquivo novo ou compactado por outro worker: relê do início
+                self._revogados = {}
+                self._posicao = 0
+                self._abrir()
+            self._arquivo.seek(self._posicao)
+            for linha in self._arquivo:
+                if not linha.endswith("\n"):
+                    break
+                jti, expira = linha.split()
+                self._revogados[jti] = float(expira)
+                self._posicao += len(linha.encode("utf-8"))
+    
+    def _abrir(self):
+        """Troca o arquivo lido pelo que está no caminho agora.
+        
+        O anterior fica aberto até aqui, então o arquivo compactado não
+        herda o inode dele e a troca sempre é percebida.
+        """
+        arquivo = open(self.caminho, "r", encoding="utf-8")
+        if self._arquivo is not None:
+            self._arquivo.close()
+        self._arquivo = arquivo
+        self._inode = os.fstat(arquivo.fileno()).st_ino
+    
+    def esta_revogado(self, jti: str) -> bool:
+        self._sincronizar()
+        return jti in self._revogados
+    
+    def revogar(self, jti: str, expira: float):
+        with trava_arquivo(self.caminho):
+            with open(self.caminho, "a", encoding="utf-8") as f:
+                f.write(f"{jti} {expira}\n")
+            self._sincronizar()
+            if len(self._revogados) > self.limite_compactacao:
+                self._compactar()
+    
+    def compactar(self):
+        """Regrava o arquivo só com as sessões que ainda não expiraram"""
+        with trava_arquivo(self.caminho):
+            self._compactar()
+    
+    def _compactar(self):
+        # Com a trava de arquivo: lê o que os outros workers acrescentaram antes de trocar
+        self._sincronizar()
+        agora = time.time()
+        with self._lock:
+            vigentes = {jti: expira for jti, expira in self._revogados.items() if expira > agora}
+            caminho_tmp = f"{self.caminho}.{os.getpid()}.tmp"
+            with open(caminho_tmp, "w", encoding="utf-8") as f:
+                f.writelines(f"{jti} {expira}\n" for jti, expira in vigentes.items())
+            os.replace(caminho_tmp, self.caminho)
+            self._revogados = vigentes
+            self._abrir()
+            self._posicao = os.fstat(self._arquivo.fileno()).st_size
+
+class GerenciadorSessoes:
+    """Tokens de sessão assinados com HMAC-SHA256 e com expiração.
+    
+    A validação não consulta o armazenamento de usuários: confere a
+    assinatura, o prazo e a lista de revogação.
+    
+    O token é um bearer: quem o tem usa a sessão até expirar ou ser
+    revogada. O app o guarda em ?sessao= para sobreviver ao recarregamento
+    da página, então ele aparece no histórico do navegador e pode vazar no
+    Referer; por isso a validade é curta e sair revoga o token.
+    """
+    
+    def __init__(self, segredo: Optional[bytes] = None, validade: int = VALIDADE_PADRAO,
+                 revogacao: Optional[ListaRevogacao] = None):
+        self.segredo = _validar_segredo(segredo, "segredo") if segredo is not None else carregar_segredo()
+        self.validade = validade
+        self.revogacao = revogacao or ListaRevogacao()
+    
+    def _assinar(self, corpo: str) -> str:
+        return _b64(hmac.new(self.segredo, corpo.encode("ascii"), hashlib.sha256).digest())
+    
+    def emitir(self, usuario) -> str:
+        agora = time.time()
+        dados = {
+            "uid": usuario.id,
+            "nome": usuario.nome,
+            "tipo": usuario.tipo,
+            "iat": int(agora),
+            "exp": int(agora + self.validade),
+            "jti": secrets.token_hex(8),
+        }
+        corpo = _b64(json.dumps(dados, separators=(",", ":")).encode("utf-8"))
+        return f"{corpo}.{self._assinar(corpo)}"
+    
+    def validar(self, token: str) -> Optional[dict]:
+        """Devolve os dados da sessão, ou None se inválida, expirada ou revogada"""
+        if not token or token.count(".") != 1:
+            return None
+        corpo, assinatura = token.split(".")
+        try:
+            if not hmac.compare_digest(assinatura.encode("ascii"), self._assinar(corpo).encode("ascii")):
+                return None
+            dados = json.loads(_de_b64(corpo))
+        except ValueError:
+            return None
+        if dados.get("exp", 0) < time.time():
+            return None
+        if self.revogacao.esta_revogado(dados["jti"]):
+            return None
+        return dados
+    
+    def revogar(self, token: str):
+        dados = self.validar(token)
+        if dados is not None:
+            self.revogacao.revogar(dados["jti"], dados["exp"])
\ No newline at end of file
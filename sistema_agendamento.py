@@ -1,166 +1,265 @@
-import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
-import random
-
-def render():
-    st.markdown("""
-        <style>
-        .agendamento-header {
-            background: linear-gradient(90deg, #FF4B4B 0%, #FF6B6B 100%);
-            padding: 20px;
-            border-radius: 15px;
-            color: white;
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        .agendamento-card {
-            background-color: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            margin-bottom: 15px;
-            border-left: 4px solid #FF4B4B;
-        }
-        </style>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-        <div class="agendamento-header">
-            <h1>📅 Sistema de Agendamento</h1>
-            <p>Gerencie seus agendamentos de forma eficiente</p>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    # Menu interno
-    tab1, tab2, tab3, tab4 = st.tabs(["📋 Novo Agendamento", "👥 Clientes", "📊 Agenda", "⚙️ Configurações"])
-    
-    with tab1:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Informações do Cliente")
-            nome = st.text_input("Nome do Cliente *")
-            telefone = st.text_input("Telefone *")
-            email = st.text_input("E-mail")
-            
-            st.subheader("Detalhes do Serviço")
-            servico = st.selectbox(
-                "Serviço *",
-                ["Corte de Cabelo", "Barba", "Corte + Barba", "Coloração", "Hidratação", "Manicure", "Pedicure"]
-            )
-            
-            profissional = st.selectbox(
-                "Profissional *",
-                ["João", "Maria", "Carlos", "Ana", "Pedro"]
-            )
-        
-        with col2:
-            st.subheader("Data e Hora")
-            data = st.date_input("Data *", min_value=datetime.now().date())
-            
-            # Gerar horários disponíveis
-            horarios = []
-            for hora in range(8, 19):
-                for minuto in ['00', '30']:
-                    horarios.append(f"{hora:02d}:{minuto}")
-            
-            hora = st.selectbox("Horário *", horarios)
-            
-            st.subheader("Observações")
-            observacoes = st.text_area("Observações adicionais")
-        
-        if st.button("✅ Agendar", type="primary", use_container_width=True):
-            if nome and telefone and servico and profissional and data and hora:
-                st.success(f"Agendamento realizado para {nome} em {data} às {hora}!")
-                st.balloons()
-            else:
-                st.error("Preencha todos os campos obrigatórios (*)")
-    
-    with tab2:
-        st.subheader("Clientes Cadastrados")
-        
-        # Dados simulados
-        clientes = pd.DataFrame({
-            "Nome": ["João Silva", "Maria Santos", "Carlos Oliveira", "Ana Souza", "Pedro Lima"],
-            "Telefone": ["(11) 99999-1111", "(11) 98888-2222", "(11) 97777-3333", "(11) 96666-4444", "(11) 95555-5555"],
-            "E-mail": ["joao@email.com", "maria@email.com", "carlos@email.com", "ana@email.com", "pedro@email.com"],
-            "Total Agendamentos": [15, 23, 8, 12, 5],
-            "Última Visita": ["10/05/2024", "12/05/2024", "08/05/2024", "11/05/2024", "09/05/2024"]
-        })
-        
-        st.dataframe(clientes, use_container_width=True, hide_index=True)
-        
-        # Buscar cliente
-        busca = st.text_input("🔍 Buscar cliente")
-        if busca:
-            resultados = clientes[clientes['Nome'].str.contains(busca, case=False)]
-            st.write(f"Encontrados {len(resultados)} clientes:")
-            st.dataframe(resultados, use_container_width=True, hide_index=True)
-    
-    with tab3:
-        st.subheader("Agenda de Hoje")
-        
-        # Agenda simulada
-        agenda_hoje = pd.DataFrame({
-            "Horário": ["09:00", "10:00", "11:00", "14:00", "15:00", "16:00"],
-            "Cliente": ["João Silva", "Maria Santos", "Carlos Oliveira", "Ana Souza", "Pedro Lima", "Lucia Ferreira"],
-            "Serviço": ["Corte", "Manicure", "Barba", "Coloração", "Corte + Barba", "Pedicure"],
-            "Profissional": ["João", "Maria", "Carlos", "Ana", "Pedro", "Maria"],
-            "Status": ["Confirmado", "Confirmado", "Em espera", "Confirmado", "Cancelado", "Confirmado"]
-        })
-        
-        # Colorir status
-        def color_status(val):
-            if val == "Confirmado":
-                return 'background-color: #90EE90'
-            elif val == "Cancelado":
-                return 'background-color: #FFB6C1'
-            elif val == "Em espera":
-                return 'background-color: #FFE4B5'
-            return ''
-        
-        styled_agenda = agenda_hoje.style.applymap(color_status, subset=['Status'])
-        st.dataframe(styled_agenda, use_container_width=True, hide_index=True)
-        
-        # Estatísticas do dia
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Total Agendamentos", "8", "+2")
-        with col2:
-            st.metric("Confirmados", "6", "-1")
-        with col3:
-            st.metric("Concluídos", "3", "+1")
-        with col4:
-            st.metric("Faturamento", "R$ 850", "+R$ 120")
-    
-    with tab4:
-        st.subheader("Configurações do Sistema")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Horário de Funcionamento**")
-            hora_inicio = st.time_input("Abertura", datetime.strptime("08:00", "%H:%M").time())
-            hora_fim = st.time_input("Fechamento", datetime.strptime("19:00", "%H:%M").time())
-            
-            st.write("**Intervalo entre agendamentos**")
-            intervalo = st.select_slider("Intervalo (minutos)", options=[15, 30, 45, 60], value=30)
-        
-        with col2:
-            st.write("**Profissionais Ativos**")
-            profissionais_ativos = st.multiselect(
-                "Selecione",
-                ["João", "Maria", "Carlos", "Ana", "Pedro"],
-                default=["João", "Maria", "Carlos", "Ana", "Pedro"]
-            )
-            
-            st.write("**Serviços Oferecidos**")
-            servicos_ativos = st.multiselect(
-                "Serviços",
-                ["Corte de Cabelo", "Barba", "Corte + Barba", "Coloração", "Hidratação", "Manicure", "Pedicure"],
-                default=["Corte de Cabelo", "Barba", "Manicure", "Pedicure"]
-            )
-        
-        if st.button("💾 Salvar Configurações"):
-            st.success("Configurações salvas com sucesso!")
\ No newline at end of file
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+from tema import registrar_estilo, aplicar_estilos
+from fragmentos import fragmento
+from estatisticas import obter_painel_estatisticas
+from metricas import medir
+from tabelas import tabela_estilizada, CorPorValor, VERDE, VERMELHO, AMARELO
+from repositorio_agendamentos import (obter_repositorio_agendamentos, ConflitoAgendamento,
+                                      minutos, formatar_minutos)
+from disponibilidade import obter_motor_disponibilidade
+from indice_clientes import obter_indice_clientes
+from configuracao_agenda import obter_configuracoes_agenda, ConfiguracaoAgenda, PROFISSIONAIS, DURACAO_SERVICOS
+
+CSS_AGENDAMENTO = """
+    .agendamento-header {
+        background: linear-gradient(90deg, #FF4B4B 0%, #FF6B6B 100%);
+        padding: 20px;
+        border-radius: 15px;
+        color: white;
+        text-align: center;
+        margin-bottom: 30px;
+    }
+    .agendamento-card {
+        background-color: white;
+        padding: 20px;
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        margin-bottom: 15px;
+        border-left: 4px solid #FF4B4B;
+    }
+"""
+
+registrar_estilo("agendamento", CSS_AGENDAMENTO)
+
+COR_STATUS_AGENDA = CorPorValor("Status", {"Confirmado": VERDE, "Cancelado": VERMELHO, "Em espera": AMARELO})
+
+def render():
+    aplicar_estilos("agendamento")
+    
+    st.markdown("""
+        <div class="agendamento-header">
+            <h1>📅 Sistema de Agendamento</h1>
+            <p>Gerencie seus agendamentos de forma eficiente</p>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    # Menu interno
+    tab1, tab2, tab3, tab4 = st.tabs(["📋 Novo Agendamento", "👥 Clientes", "📊 Agenda", "⚙️ Configurações"])
+    
+    with tab1:
+        _aba_novo_agendamento()
+    
+    with tab2:
+        _aba_clientes()
+    
+    with tab3:
+        _aba_agenda()
+    
+    with tab4:
+        _aba_configuracoes()
+
+@fragmento
+def _aba_novo_agendamento():
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Informações do Cliente")
+        nome = st.text_input("Nome do Cliente *")
+        telefone = st.text_input("Telefone *")
+        email = st.text_input("E-mail")
+        
+        _, config = obter_configuracoes_agenda().atual()
+        
+        st.subheader("Detalhes do Serviço")
+        servico = st.selectbox("Serviço *", list(config.servicos_ativos))
+        
+        profissional = st.selectbox("Profissional *", list(config.profissionais_ativos))
+    
+    with col2:
+        st.subheader("Data e Hora")
+        data = st.date_input("Data *", min_value=datetime.now().date())
+        
+        # Só horários da grade em que o serviço inteiro cabe na agenda do profissional
+        duracao = config.duracao(servico) if servico else config.intervalo
+        agora = datetime.now()
+        a_partir_de = agora.hour * 60 + agora.minute if data == agora.date() else None
+        livres = []
+        if profissional:
+            livres = obter_motor_disponibilidade().horarios_livres(profissional, data, duracao, a_partir_de)
+        horarios = [formatar_minutos(inicio) for inicio in livres]
+        
+        hora = st.selectbox("Horário *", horarios)
+        if profissional and not horarios:
+            st.warning(f"{profissional} não tem horários livres em {data.strftime('%d/%m/%Y')} para este serviço.")
+        st.caption(f"Duração do serviço: {duracao} minutos")
+        
+        st.subheader("Observações")
+        observacoes = st.text_area("Observações adicionais")
+    
+    if st.button("✅ Agendar", type="primary", use_container_width=True):
+        if nome and telefone and servico and profissional and data and hora:
+            inicio = minutos(hora)
+            try:
+                obter_repositorio_agendamentos().agendar(
+                    profissional, data, inicio, inicio + duracao,
+                    cliente=nome, telefone=telefone, servico=servico,
+                    email=email, observacoes=observacoes
+                )
+            except ConflitoAgendamento as e:
+                st.error(f"⛔ {e}. Escolha outro horário ou profissional.")
+            else:
+                obter_painel_estatisticas().registrar("agendamento", 1, dia=data)
+                st.success(f"Agendamento realizado para {nome} em {data} às {hora}!")
+                st.balloons()
+        else:
+            st.error("Preencha todos os campos obrigatórios (*)")
+
+@fragmento
+def _aba_clientes():
+    st.subheader("Clientes Cadastrados")
+    
+    indice = obter_indice_clientes()
+    
+    # Buscar cliente (nome, telefone ou e-mail; aceita começo de palavra, sem acento e com erro de digitação)
+    busca = st.text_input("🔍 Buscar cliente", placeholder="Nome, telefone ou e-mail")
+    if busca:
+        with medir("busca:agendamento.clientes"):
+            clientes = indice.buscar(busca, k=50)
+        st.write(f"Encontrados {len(clientes)} clientes:")
+    else:
+        clientes = indice.recentes(50)
+        st.caption(f"{len(indice)} clientes no total; os mais recentes:")
+    
+    if not clientes:
+        st.info("Nenhum cliente encontrado.")
+        return
+    
+    with medir("dataframe:agendamento.clientes.clientes"):
+        tabela = pd.DataFrame({
+            "Nome": [c.nome for c in clientes],
+            "Telefone": [c.telefone for c in clientes],
+            "E-mail": [c.email for c in clientes],
+            "Total Agendamentos": [c.total_agendamentos for c in clientes],
+            "Última Visita": [datetime.strptime(c.ultima_visita, "%Y-%m-%d").strftime("%d/%m/%Y")
+                              if c.ultima_visita else "" for c in clientes]
+        })
+    
+    st.dataframe(tabela, use_container_width=True, hide_index=True)
+
+@fragmento
+def _aba_agenda():
+    st.subheader("Agenda de Hoje")
+    
+    agendamentos = obter_repositorio_agendamentos().do_dia(datetime.now().date())
+    if agendamentos:
+        _agenda_do_dia(agendamentos)
+    else:
+        st.info("Nenhum agendamento para hoje.")
+    
+    st.subheader("Disponibilidade da Semana")
+    
+    _, config = obter_configuracoes_agenda().atual()
+    hoje = datetime.now().date()
+    semana = obter_motor_disponibilidade().semana(hoje, config.intervalo)
+    datas = [hoje + timedelta(days=i) for i in range(7)]
+    with medir("dataframe:agendamento.agenda.disponibilidade"):
+        disponibilidade = pd.DataFrame(
+            {data.strftime("%d/%m"): [len(semana[p][data]) for p in semana] for data in datas},
+            index=list(semana)
+        )
+    st.caption(f"Horários livres de {config.intervalo} minutos por profissional")
+    st.dataframe(disponibilidade, use_container_width=True)
+
+def _agenda_do_dia(agendamentos):
+    with medir("dataframe:agendamento.agenda.agenda_hoje"):
+        agenda_hoje = pd.DataFrame({
+            "Horário": [f"{formatar_minutos(a.inicio)} - {formatar_minutos(a.fim)}" for a in agendamentos],
+            "Cliente": [a.cliente for a in agendamentos],
+            "Serviço": [a.servico for a in agendamentos],
+            "Profissional": [a.profissional for a in agendamentos],
+            "Status": [a.status for a in agendamentos]
+        })
+    
+    # Colorir status
+    tabela_estilizada(agenda_hoje, [COR_STATUS_AGENDA], chave="agenda_hoje")
+    
+    # Estatísticas do dia
+    col1, col2, col3, col4 = st.columns(4)
+    status = agenda_hoje["Status"].value_counts()
+    with col1:
+        st.metric("Total Agendamentos", len(agenda_hoje))
+    with col2:
+        st.metric("Confirmados", int(status.get("Confirmado", 0)))
+    with col3:
+        st.metric("Em espera", int(status.get("Em espera", 0)))
+    with col4:
+        st.metric("Cancelados", int(status.get("Cancelado", 0)))
+
+@fragmento
+def _aba_configuracoes():
+    st.subheader("Configurações do Sistema")
+    
+    configuracoes = obter_configuracoes_agenda()
+    versao, config = configuracoes.atual()
+    # Chaves por versão: uma gravação (de qualquer sessão) recria os campos com os valores salvos
+    sufixo = f"_v{versao}"
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Horário de Funcionamento**")
+        hora_inicio = st.time_input("Abertura", datetime.strptime(formatar_minutos(config.abertura), "%H:%M").time(),
+                                    key="agenda_abertura" + sufixo)
+        hora_fim = st.time_input("Fechamento", datetime.strptime(formatar_minutos(config.fechamento), "%H:%M").time(),
+                                 key="agenda_fechamento" + sufixo)
+        
+        st.write("**Intervalo entre agendamentos**")
+        intervalo = st.select_slider("Intervalo (minutos)", options=[15, 30, 45, 60], value=config.intervalo,
+                                     key="agenda_intervalo" + sufixo)
+    
+    with col2:
+        st.write("**Profissionais Ativos**")
+        profissionais_ativos = st.multiselect(
+            "Selecione",
+            PROFISSIONAIS,
+            default=list(config.profissionais_ativos),
+            key="agenda_profissionais" + sufixo
+        )
+        
+        st.write("**Serviços Oferecidos**")
+        servicos_ativos = st.multiselect(
+            "Serviços",
+            list(DURACAO_SERVICOS),
+            default=list(config.servicos_ativos),
+            key="agenda_servicos" + sufixo
+        )
+    
+    if versao:
+        ultima = configuracoes.historico(1)[0]
+        st.caption(f"Versão {versao}, salva em {ultima['salvo_em']}" + (f" por {ultima['salvo_por']}" if ultima['salvo_por'] else ""))
+    else:
+        st.caption("Usando a configuração padrão (ainda não salva).")
+    
+    if st.button("💾 Salvar Configurações"):
+        nova = ConfiguracaoAgenda(
+            abertura=minutos(hora_inicio),
+            fechamento=minutos(hora_fim),
+            intervalo=intervalo,
+            profissionais_ativos=tuple(profissionais_ativos),
+            servicos_ativos=tuple(servicos_ativos),
+            duracao_servicos=config.duracao_servicos,
+        )
+        usuario = st.session_state.get("usuario_logado")
+        try:
+            nova_versao = configuracoes.salvar(nova, autor=usuario.nome if usuario else "")
+        except ValueError as e:
+            st.error(f"❌ {e}")
+        else:
+            if nova_versao == versao:
+                st.info("Nenhuma alteração para salvar.")
+            else:
+                st.toast(f"Configurações salvas (versão {nova_versao})", icon="💾")
+                # As outras abas dependem da configuração: recarrega a página inteira
+                st.rerun()
\ No newline at end of file
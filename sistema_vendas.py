@@ -1,219 +1,378 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import datetime, timedelta
-import random
-
-def render():
-    st.markdown("""
-        <style>
-        .vendas-header {
-            background: linear-gradient(90deg, #00CC96 0%, #00E6A8 100%);
-            padding: 20px;
-            border-radius: 15px;
-            color: white;
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        .vendas-card {
-            background-color: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            margin-bottom: 15px;
-            border-left: 4px solid #00CC96;
-        }
-        </style>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-        <div class="vendas-header">
-            <h1>💰 Sistema de Vendas</h1>
-            <p>Controle completo de vendas e faturamento</p>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    # Métricas principais
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="Vendas Hoje",
-            value=f"R$ {random.randint(1500, 3000):,.2f}",
-            delta=f"+{random.randint(5, 15)}%"
-        )
-    with col2:
-        st.metric(
-            label="Vendas Mês",
-            value=f"R$ {random.randint(45000, 60000):,.2f}",
-            delta=f"+{random.randint(8, 12)}%"
-        )
-    with col3:
-        st.metric(
-            label="Ticket Médio",
-            value=f"R$ {random.randint(80, 120):,.2f}",
-            delta=f"+R$ {random.randint(5, 15)}"
-        )
-    with col4:
-        st.metric(
-            label="Meta Mensal",
-            value="78%",
-            delta="+5%"
-        )
-    
-    # Tabs para diferentes funcionalidades
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Dashboard", "🛒 Nova Venda", "📦 Produtos", "📈 Relatórios"])
-    
-    with tab1:
-        st.subheader("Visão Geral de Vendas")
-        
-        # Gráfico de vendas
-        dias = list(range(1, 31))
-        vendas_diarias = [random.randint(800, 2500) for _ in range(30)]
-        
-        df_vendas = pd.DataFrame({
-            'Dia': dias,
-            'Vendas': vendas_diarias
-        })
-        
-        fig = px.line(df_vendas, x='Dia', y='Vendas', title='Vendas Diárias - Últimos 30 Dias')
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Top produtos
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Produtos Mais Vendidos")
-            produtos = pd.DataFrame({
-                'Produto': ['Produto A', 'Produto B', 'Produto C', 'Produto D', 'Produto E'],
-                'Quantidade': [145, 132, 98, 87, 65],
-                'Faturamento': ['R$ 7.250', 'R$ 6.600', 'R$ 4.900', 'R$ 4.350', 'R$ 3.250']
-            })
-            st.dataframe(produtos, use_container_width=True, hide_index=True)
-        
-        with col2:
-            st.subheader("Vendas por Categoria")
-            categorias = pd.DataFrame({
-                'Categoria': ['Eletrônicos', 'Vestuário', 'Alimentos', 'Serviços', 'Outros'],
-                'Percentual': [35, 25, 20, 12, 8]
-            })
-            
-            fig_pie = px.pie(categorias, values='Percentual', names='Categoria', title='Distribuição por Categoria')
-            st.plotly_chart(fig_pie, use_container_width=True)
-    
-    with tab2:
-        st.subheader("Registrar Nova Venda")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            cliente = st.text_input("Nome do Cliente")
-            produto = st.selectbox(
-                "Produto/Serviço",
-                ["Produto A - R$ 50,00", "Produto B - R$ 75,00", "Produto C - R$ 120,00", 
-                 "Serviço X - R$ 200,00", "Serviço Y - R$ 150,00"]
-            )
-            quantidade = st.number_input("Quantidade", min_value=1, value=1)
-        
-        with col2:
-            forma_pagamento = st.selectbox(
-                "Forma de Pagamento",
-                ["Dinheiro", "Cartão de Crédito", "Cartão de Débito", "PIX", "Boleto"]
-            )
-            
-            parcelas = 1
-            if forma_pagamento == "Cartão de Crédito":
-                parcelas = st.selectbox("Parcelas", [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])
-            
-            observacoes = st.text_area("Observações")
-        
-        # Calcular valor
-        precos = [50, 75, 120, 200, 150]
-        idx = ["Produto A - R$ 50,00", "Produto B - R$ 75,00", "Produto C - R$ 120,00", 
-               "Serviço X - R$ 200,00", "Serviço Y - R$ 150,00"].index(produto)
-        valor_total = precos[idx] * quantidade
-        
-        st.info(f"**Valor Total: R$ {valor_total:.2f}**")
-        
-        if st.button("✅ Finalizar Venda", type="primary", use_container_width=True):
-            st.success(f"Venda finalizada com sucesso! Total: R$ {valor_total:.2f}")
-            st.balloons()
-    
-    with tab3:
-        st.subheader("Catálogo de Produtos")
-        
-        # Tabela de produtos
-        produtos_catalogo = pd.DataFrame({
-            'Código': ['P001', 'P002', 'P003', 'P004', 'P005'],
-            'Produto': ['Produto A', 'Produto B', 'Produto C', 'Produto D', 'Produto E'],
-            'Categoria': ['Eletrônicos', 'Vestuário', 'Eletrônicos', 'Alimentos', 'Serviços'],
-            'Preço': ['R$ 50,00', 'R$ 75,00', 'R$ 120,00', 'R$ 25,00', 'R$ 200,00'],
-            'Estoque': [45, 32, 18, 67, 999]
-        })
-        
-        st.dataframe(produtos_catalogo, use_container_width=True, hide_index=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Adicionar Novo Produto")
-            novo_produto = st.text_input("Nome do Produto")
-            preco = st.number_input("Preço", min_value=0.0, format="%.2f")
-            categoria = st.selectbox("Categoria", ["Eletrônicos", "Vestuário", "Alimentos", "Serviços", "Outros"])
-            estoque_inicial = st.number_input("Estoque Inicial", min_value=0)
-            
-            if st.button("➕ Adicionar Produto"):
-                st.success(f"Produto {novo_produto} adicionado com sucesso!")
-        
-        with col2:
-            st.subheader("Ajustar Estoque")
-            produto_ajuste = st.selectbox("Selecione o Produto", produtos_catalogo['Produto'].tolist())
-            tipo_ajuste = st.radio("Tipo de Ajuste", ["Entrada", "Saída"])
-            quantidade_ajuste = st.number_input("Quantidade", min_value=1)
-            
-            if st.button("📦 Aplicar Ajuste"):
-                st.success(f"Estoque ajustado para {produto_ajuste}!")
-    
-    with tab4:
-        st.subheader("Relatórios de Vendas")
-        
-        periodo = st.selectbox(
-            "Período",
-            ["Hoje", "Esta Semana", "Este Mês", "Este Trimestre", "Este Ano", "Personalizado"]
-        )
-        
-        if periodo == "Personalizado":
-            col1, col2 = st.columns(2)
-            with col1:
-                data_inicio = st.date_input("Data Início")
-            with col2:
-                data_fim = st.date_input("Data Fim")
-        
-        tipo_relatorio = st.selectbox(
-            "Tipo de Relatório",
-            ["Vendas por Período", "Vendas por Produto", "Vendas por Cliente", "Comissões", "Impostos"]
-        )
-        
-        if st.button("📊 Gerar Relatório", use_container_width=True):
-            st.info("Gerando relatório...")
-            
-            # Relatório simulado
-            st.subheader("Resultado do Relatório")
-            
-            dados_relatorio = pd.DataFrame({
-                'Data': [(datetime.now() - timedelta(days=i)).strftime('%d/%m/%Y') for i in range(10)],
-                'Vendas': [random.randint(1000, 3000) for _ in range(10)],
-                'Clientes': [random.randint(8, 20) for _ in range(10)],
-                'Ticket Médio': [random.randint(80, 150) for _ in range(10)]
-            })
-            
-            st.dataframe(dados_relatorio, use_container_width=True, hide_index=True)
-            
-            # Botão para exportar
-            csv = dados_relatorio.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Download CSV",
-                data=csv,
-                file_name=f"relatorio_vendas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import calendar
+from datetime import date, datetime, timedelta
+from tema import registrar_estilo, aplicar_estilos
+from fragmentos import fragmento
+from metricas import medir
+from livro_vendas import obter_livro_vendas, centavos, formatar_reais, CAMPOS_VENDA
+from catalogo_produtos import obter_catalogo_produtos, CATEGORIAS
+from resumos_vendas import obter_resumos_vendas
+from exportacao import exportar_csv, conteudo_download
+from relatorios_vendas import obter_motor_relatorios, RELATORIOS, COLUNAS_EM_REAIS, COLUNAS_PERCENTUAIS
+
+CSS_VENDAS = """
+    .vendas-header {
+        background: linear-gradient(90deg, #00CC96 0%, #00E6A8 100%);
+        padding: 20px;
+        border-radius: 15px;
+        color: white;
+        text-align: center;
+        margin-bottom: 30px;
+    }
+    .vendas-card {
+        background-color: white;
+        padding: 20px;
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        margin-bottom: 15px;
+        border-left: 4px solid #00CC96;
+    }
+"""
+
+registrar_estilo("vendas", CSS_VENDAS)
+
+META_MENSAL = centavos(60000)
+
+def _variacao(atual: int, anterior: int) -> str:
+    if not anterior:
+        return "—"
+    return f"{(atual - anterior) / anterior:+.0%}"
+
+def _diferenca_reais(atual: int, anterior: int) -> str:
+    return ("+" if atual >= anterior else "") + formatar_reais(atual - anterior)
+
+def render():
+    aplicar_estilos("vendas")
+    
+    st.markdown("""
+        <div class="vendas-header">
+            <h1>💰 Sistema de Vendas</h1>
+            <p>Controle completo de vendas e faturamento</p>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    # Métricas principais (lidas dos resumos, sem varrer as vendas)
+    resumos = obter_resumos_vendas()
+    hoje = date.today()
+    ontem = hoje - timedelta(days=1)
+    mes_passado = hoje.replace(day=1) - timedelta(days=1)
+    do_dia = resumos.do_dia(hoje)
+    do_mes = resumos.do_mes(hoje)
+    # O mês passado até o mesmo dia, para comparar períodos do mesmo tamanho
+    ate_mesmo_dia = sum(
+        totais.faturamento for totais in
+        resumos.por_dia(mes_passado.replace(day=1), mes_passado.replace(day=min(hoje.day, mes_passado.day))).values()
+    )
+    meta = do_mes.faturamento / META_MENSAL
+    esperado = hoje.day / calendar.monthrange(hoje.year, hoje.month)[1]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="Vendas Hoje",
+            value=formatar_reais(do_dia.faturamento),
+            delta=_variacao(do_dia.faturamento, resumos.do_dia(ontem).faturamento)
+        )
+    with col2:
+        st.metric(
+            label="Vendas Mês",
+            value=formatar_reais(do_mes.faturamento),
+            delta=_variacao(do_mes.faturamento, ate_mesmo_dia)
+        )
+    with col3:
+        st.metric(
+            label="Ticket Médio",
+            value=formatar_reais(do_mes.ticket_medio),
+            delta=_diferenca_reais(do_mes.ticket_medio, resumos.do_mes(mes_passado).ticket_medio)
+        )
+    with col4:
+        st.metric(
+            label="Meta Mensal",
+            value=f"{meta:.0%}",
+            delta=f"{(meta - esperado) * 100:+.0f} p.p. do ritmo",
+            help=f"Meta de {formatar_reais(META_MENSAL)}; o delta compara com a parte do mês já passada"
+        )
+    
+    # Tabs para diferentes funcionalidades
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Dashboard", "🛒 Nova Venda", "📦 Produtos", "📈 Relatórios"])
+    
+    with tab1:
+        _aba_dashboard()
+    
+    with tab2:
+        _aba_nova_venda()
+    
+    with tab3:
+        _aba_produtos()
+    
+    with tab4:
+        _aba_relatorios()
+
+@fragmento
+def _aba_dashboard():
+    st.subheader("Visão Geral de Vendas")
+    
+    resumos = obter_resumos_vendas()
+    hoje = date.today()
+    
+    # Gráfico de vendas
+    diarias = resumos.por_dia(hoje - timedelta(days=29), hoje)
+    
+    with medir("dataframe:vendas.dashboard.df_vendas"):
+        df_vendas = pd.DataFrame({
+            'Dia': list(diarias),
+            'Vendas': [totais.faturamento / 100 for totais in diarias.values()]
+        })
+    
+    with medir("figura:vendas.dashboard.fig"):
+        fig = px.line(df_vendas, x='Dia', y='Vendas', title='Vendas Diárias - Últimos 30 Dias')
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Top produtos
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Produtos Mais Vendidos")
+        ranking = resumos.ranking("produto", hoje, limite=5)
+        with medir("dataframe:vendas.dashboard.produtos"):
+            produtos = pd.DataFrame({
+                'Produto': [produto for produto, _ in ranking],
+                'Quantidade': [totais.itens for _, totais in ranking],
+                'Faturamento': [formatar_reais(totais.faturamento) for _, totais in ranking]
+            })
+        if ranking:
+            st.dataframe(produtos, use_container_width=True, hide_index=True)
+        else:
+            st.info("Nenhuma venda neste mês.")
+    
+    with col2:
+        st.subheader("Vendas por Categoria")
+        ranking = resumos.ranking("categoria", hoje)
+        with medir("dataframe:vendas.dashboard.categorias"):
+            categorias = pd.DataFrame({
+                'Categoria': [categoria for categoria, _ in ranking],
+                'Faturamento': [totais.faturamento / 100 for _, totais in ranking]
+            })
+        
+        if ranking:
+            with medir("figura:vendas.dashboard.fig_pie"):
+                fig_pie = px.pie(categorias, values='Faturamento', names='Categoria', title='Distribuição por Categoria')
+            st.plotly_chart(fig_pie, use_container_width=True)
+        else:
+            st.info("Nenhuma venda neste mês.")
+
+def _seletor_produto(rotulo: str, chave: str):
+    """Busca enquanto digita: só os primeiros resultados vão para o selectbox"""
+    busca = st.text_input(f"🔍 {rotulo}", key=f"{chave}_busca", placeholder="Código ou nome")
+    opcoes = obter_catalogo_produtos().buscar(busca, limite=20)
+    if not opcoes:
+        st.warning("Nenhum produto encontrado.")
+        return None
+    return st.selectbox(
+        rotulo,
+        opcoes,
+        format_func=lambda p: f"{p.codigo} · {p.nome} - {formatar_reais(p.preco)}",
+        key=f"{chave}_produto",
+        label_visibility="collapsed"
+    )
+
+@fragmento
+def _aba_nova_venda():
+    st.subheader("Registrar Nova Venda")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        cliente = st.text_input("Nome do Cliente")
+        produto = _seletor_produto("Produto/Serviço", "venda")
+        quantidade = st.number_input("Quantidade", min_value=1, value=1)
+    
+    with col2:
+        forma_pagamento = st.selectbox(
+            "Forma de Pagamento",
+            ["Dinheiro", "Cartão de Crédito", "Cartão de Débito", "PIX", "Boleto"]
+        )
+        
+        parcelas = 1
+        if forma_pagamento == "Cartão de Crédito":
+            parcelas = st.selectbox("Parcelas", [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])
+        
+        observacoes = st.text_area("Observações")
+    
+    # Calcular valor (em centavos)
+    valor_total = produto.preco * quantidade if produto else 0
+    
+    st.info(f"**Valor Total: {formatar_reais(valor_total)}**")
+    
+    if st.button("✅ Finalizar Venda", type="primary", use_container_width=True):
+        if produto is None:
+            st.error("Selecione um produto ou serviço")
+            return
+        # Só enfileira: a gravação acontece na thread do livro, em lote
+        try:
+            venda = obter_livro_vendas().registrar(
+                cliente=cliente,
+                produto=produto.nome,
+                quantidade=int(quantidade),
+                preco_unitario=produto.preco,
+                forma_pagamento=forma_pagamento,
+                parcelas=parcelas,
+                observacoes=observacoes,
+                codigo_produto=produto.codigo,
+                categoria=produto.categoria
+            )
+        except RuntimeError as e:
+            st.error(f"❌ {e}")
+            return
+        st.success(f"Venda {venda.id} finalizada com sucesso! Total: {formatar_reais(venda.total)}")
+        st.balloons()
+
+@fragmento
+def _aba_produtos():
+    st.subheader("Catálogo de Produtos")
+    
+    catalogo = obter_catalogo_produtos()
+    
+    # Tabela de produtos
+    categoria_filtro = st.selectbox("Filtrar por Categoria", ["Todas"] + catalogo.categorias())
+    with medir("dataframe:vendas.produtos.produtos_catalogo"):
+        produtos_catalogo = catalogo.tabela(None if categoria_filtro == "Todas" else categoria_filtro)
+    
+    st.dataframe(
+        produtos_catalogo,
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Preço": st.column_config.NumberColumn(format="R$ %.2f")}
+    )
+    st.caption(f"{len(produtos_catalogo)} de {len(catalogo)} produtos")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Adicionar Novo Produto")
+        novo_produto = st.text_input("Nome do Produto")
+        preco = st.number_input("Preço", min_value=0.0, format="%.2f")
+        categoria = st.selectbox("Categoria", CATEGORIAS)
+        estoque_inicial = st.number_input("Estoque Inicial", min_value=0)
+        
+        if st.button("➕ Adicionar Produto"):
+            try:
+                produto = catalogo.adicionar(novo_produto, categoria, centavos(preco), int(estoque_inicial))
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                st.toast(f"Produto {produto.nome} adicionado com o código {produto.codigo}!", icon="➕")
+                # O catálogo acima e o seletor da venda já mostram o produto novo
+                st.rerun()
+    
+    with col2:
+        st.subheader("Ajustar Estoque")
+        produto_ajuste = _seletor_produto("Selecione o Produto", "ajuste")
+        tipo_ajuste = st.radio("Tipo de Ajuste", ["Entrada", "Saída"])
+        quantidade_ajuste = st.number_input("Quantidade", min_value=1)
+        
+        if st.button("📦 Aplicar Ajuste") and produto_ajuste is not None:
+            quantidade = int(quantidade_ajuste) if tipo_ajuste == "Entrada" else -int(quantidade_ajuste)
+            try:
+                produto = catalogo.ajustar_estoque(produto_ajuste.codigo, quantidade)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                st.toast(f"Estoque ajustado para {produto.nome}: {produto.estoque} unidades", icon="📦")
+                st.rerun()
+
+def _intervalo(periodo: str, data_inicio: date = None, data_fim: date = None):
+    """Primeiro e último dia do período escolhido no relatório"""
+    hoje = date.today()
+    if periodo == "Hoje":
+        return hoje, hoje
+    if periodo == "Esta Semana":
+        return hoje - timedelta(days=hoje.weekday()), hoje
+    if periodo == "Este Mês":
+        return hoje.replace(day=1), hoje
+    if periodo == "Este Trimestre":
+        return hoje.replace(month=(hoje.month - 1) // 3 * 3 + 1, day=1), hoje
+    if periodo == "Este Ano":
+        return hoje.replace(month=1, day=1), hoje
+    return data_inicio, data_fim
+
+@fragmento
+def _aba_relatorios():
+    st.subheader("Relatórios de Vendas")
+    
+    periodo = st.selectbox(
+        "Período",
+        ["Hoje", "Esta Semana", "Este Mês", "Este Trimestre", "Este Ano", "Personalizado"]
+    )
+    
+    data_inicio = data_fim = None
+    if periodo == "Personalizado":
+        col1, col2 = st.columns(2)
+        with col1:
+            data_inicio = st.date_input("Data Início")
+        with col2:
+            data_fim = st.date_input("Data Fim")
+    
+    tipo_relatorio = st.selectbox("Tipo de Relatório", list(RELATORIOS))
+    
+    comprimir = st.checkbox("Compactar o CSV (gzip)", help="Arquivos bem menores para períodos longos")
+    
+    if st.button("📊 Gerar Relatório", use_container_width=True):
+        inicio, fim = _intervalo(periodo, data_inicio, data_fim)
+        if inicio > fim:
+            st.error("❌ A data inicial é posterior à final")
+            return
+        
+        with st.spinner("Gerando relatório..."):
+            with medir("dataframe:vendas.relatorios.dados_relatorio"):
+                dados_relatorio = obter_motor_relatorios().gerar(tipo_relatorio, inicio, fim)
+        
+        st.subheader("Resultado do Relatório")
+        
+        if dados_relatorio.empty:
+            st.info("Nenhuma venda no período.")
+        else:
+            formatos = {coluna: st.column_config.NumberColumn(format="R$ %.2f")
+                        for coluna in COLUNAS_EM_REAIS.intersection(dados_relatorio.columns)}
+            formatos.update({coluna: st.column_config.NumberColumn(format="%.1f%%")
+                             for coluna in COLUNAS_PERCENTUAIS.intersection(dados_relatorio.columns)})
+            st.dataframe(dados_relatorio, use_container_width=True, hide_index=True, column_config=formatos)
+        
+        # Downloads adiados: nada é exportado até alguém clicar, e as vendas
+        # vão do livro para um arquivo temporário em blocos
+        sufixo = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv" + (".gz" if comprimir else "")
+        mime = "application/gzip" if comprimir else "text/csv"
+        
+        def exportar_relatorio():
+            with medir("exportacao:vendas.relatorios.relatorio"):
+                return exportar_csv(dados_relatorio.columns, [dados_relatorio.itertuples(index=False)],
+                                    comprimir=comprimir)
+        
+        def exportar_vendas():
+            with medir("exportacao:vendas.relatorios.vendas"):
+                return exportar_csv(
+                    CAMPOS_VENDA,
+                    obter_livro_vendas().em_blocos(inicio.isoformat(), fim.isoformat(), em_reais=True),
+                    comprimir=comprimir
+                )
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📥 Baixar relatório (CSV)",
+                data=conteudo_download(exportar_relatorio),
+                file_name=f"relatorio_vendas_{sufixo}",
+                mime=mime,
+                use_container_width=True
+            )
+        with col2:
+            st.download_button(
+                label="📥 Baixar vendas do período (CSV)",
+                data=conteudo_download(exportar_vendas),
+                file_name=f"vendas_{inicio:%Y%m%d}_{fim:%Y%m%d}_{sufixo}",
+                mime=mime,
+                use_container_width=True
             )
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Tabelas coloridas por regra, com estilos calculados de uma vez e paginação.
+
+Em vez de um callback Python por célula (Styler.applymap) ou por linha
+(Styler.apply(axis=1)), cada regra devolve o CSS de uma coluna inteira numa
+operação vetorizada (Series.map para cor por valor, np.select para faixas
+de limite). O Styler recebe a matriz pronta numa única chamada, restrita
+às colunas que a regra pinta.
+
+O próprio Styler ainda visita célula a célula para montar o CSS (e o
+Streamlit recusa estilizar mais de 262.144 células), então tabelas maiores
+que uma página são mostradas em páginas: só as linhas visíveis são
+estilizadas e enviadas ao navegador.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+VERDE = "#90EE90"
+VERMELHO = "#FFB6C1"
+AMARELO = "#FFE4B5"
+
+LINHAS_POR_PAGINA = 100
+
+def _fundo(cor: str) -> str:
+    return f"background-color: {cor}"
+
+@dataclass(frozen=True)
+class CorPorValor:
+    """Pinta as células de `coluna` conforme o valor (valores fora do mapa ficam sem cor)"""
+    coluna: str
+    cores: Dict[str, str]
+    
+    def estilos(self, df: pd.DataFrame) -> Tuple[Sequence[str], np.ndarray]:
+        css = {valor: _fundo(cor) for valor, cor in self.cores.items()}
+        return [self.coluna], df[self.coluna].map(css).fillna("").to_numpy(dtype=object)
+
+@dataclass(frozen=True)
+class CorPorLimite:
+    """Pinta a linha inteira pela primeira faixa em que coluna <= referência * fator.
+    
+    `referencia` é o nome de outra coluna ou um número fixo.
+    """
+    coluna: str
+    referencia: Union[str, float]
+    faixas: Tuple[Tuple[float, str], ...]
+    
+    def estilos(self, df: pd.DataFrame) -> Tuple[Sequence[str], np.ndarray]:
+        valores = pd.to_numeric(df[self.coluna], errors="coerce").to_numpy(dtype=float)
+        if isinstance(self.referencia, str):
+            referencia = pd.to_numeric(df[self.referencia], errors="coerce").to_numpy(dtype=float)
+        else:
+            referencia = float(self.referencia)
+        condicoes = [valores <= referencia * fator for fator, _ in self.faixas]
+        css = np.select(condicoes, [_fundo(cor) for _, cor in self.faixas], default="").astype(object)
+        return list(df.columns), css
+
+Regra = Union[CorPorValor, CorPorLimite]
+
+def estilizar(df: pd.DataFrame, regras: Sequence[Regra]):
+    """Styler com os estilos das regras; regras posteriores sobrepõem as anteriores"""
+    styler = df.style
+    for regra in regras:
+        colunas, css = regra.estilos(df)
+        matriz = np.repeat(np.asarray(css, dtype=object)[:, None], len(colunas), axis=1)
+        # subset: o Styler percorre só as colunas que a regra pinta
+        styler = styler.apply(lambda _, matriz=matriz: matriz, axis=None, subset=list(colunas))
+    return styler
+
+def tabela_estilizada(df: pd.DataFrame, regras: Sequence[Regra], chave: str,
+                      linhas_por_pagina: int = LINHAS_POR_PAGINA, **opcoes):
+    """st.dataframe colorido pelas regras, paginado quando passa de uma página"""
+    opcoes.setdefault("use_container_width", True)
+    opcoes.setdefault("hide_index", True)
+    
+    total = len(df)
+    paginas = max(1, math.ceil(total / linhas_por_pagina))
+    if paginas > 1:
+        pagina = st.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, value=1,
+                                 key=f"{chave}_pagina")
+        inicio = (pagina - 1) * linhas_por_pagina
+        # Só a página visível é estilizada e serializada
+        df = df.iloc[inicio:inicio + linhas_por_pagina]
+        st.caption(f"Linhas {inicio + 1}–{inicio + len(df)} de {total}")
+    
+    st.dataframe(estilizar(df, regras), **opcoes)
\ No newline at end of file
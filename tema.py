@@ -0,0 +1,79 @@
+"""Folhas de estilo do portal e dos módulos.
+
+Cada bloco de CSS é registrado já compactado e identificado pelo hash do
+conteúdo: registrar de novo um nome com CSS diferente gera outro id, e o
+bloco novo substitui o antigo na página. As tags de cada combinação de
+blocos são montadas uma vez só.
+
+O front-end remove os elementos que a execução atual não enviou, então uma
+<style> solta teria de acompanhar cada execução. Com st.html aceitando
+JavaScript, cada bloco vai uma vez por sessão (marcado em st.session_state
+pelo id): um script no próprio documento, sem iframe nem window.parent,
+coloca a <style> no <head>, que o front-end não limpa, e tira a versão
+anterior do mesmo nome. Sem esse suporte a tag sai em toda execução, por
+st.html (no contêiner de eventos) ou, antes dele, por st.markdown com
+unsafe_allow_html.
+"""
+import hashlib
+import inspect
+import json
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import streamlit as st
+
+_estilos: Dict[str, Tuple[str, str]] = {}
+_ids: Dict[str, str] = {}
+_lock = threading.Lock()
+
+# st.html(unsafe_allow_javascript=...) roda scripts no documento da página
+HTML_COM_SCRIPT = hasattr(st, "html") and "unsafe_allow_javascript" in inspect.signature(st.html).parameters
+
+CHAVE_ENVIADOS = "_estilos_enviados"
+
+def _compactar(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return css.strip()
+
+def registrar_estilo(nome: str, css: str) -> str:
+    """Registra um bloco de CSS (o id muda junto com o conteúdo); devolve o id do bloco"""
+    compactado = _compactar(css)
+    resumo = hashlib.sha256(compactado.encode("utf-8")).hexdigest()[:12]
+    id_estilo = f"estilo-{nome}-{resumo}"
+    with _lock:
+        _estilos.setdefault(id_estilo, (nome, compactado))
+        _ids[nome] = id_estilo
+    return id_estilo
+
+@lru_cache(maxsize=64)
+def _tag_estilo(ids: Tuple[str, ...]) -> str:
+    """<style> com os blocos, montada uma vez por combinação"""
+    return "".join(f'<style id="{id_estilo}">{_estilos[id_estilo][1]}</style>' for id_estilo in ids)
+
+@lru_cache(maxsize=64)
+def _script_estilo(ids: Tuple[str, ...]) -> str:
+    """<script> que põe os blocos no <head> e tira as versões anteriores de cada nome"""
+    blocos = json.dumps([[f"estilo-{_estilos[i][0]}-", i, _estilos[i][1]] for i in ids]).replace("</", "<\\/")
+    return ("<script>for (const [prefixo, id, css] of " + blocos + ") {"
+            "if (document.getElementById(id)) continue;"
+            "document.head.querySelectorAll('style[id^=\"' + prefixo + '\"]').forEach(e => e.remove());"
+            "const tag = document.createElement('style'); tag.id = id; tag.textContent = css;"
+            "document.head.appendChild(tag);}</script>")
+
+def aplicar_estilos(*nomes: str):
+    """Aplica os blocos indicados; com suporte a script, cada versão vai uma vez por sessão"""
+    ids = tuple(_ids[nome] for nome in nomes)
+    if HTML_COM_SCRIPT:
+        enviados = st.session_state.setdefault(CHAVE_ENVIADOS, set())
+        pendentes = tuple(id_estilo for id_estilo in ids if id_estilo not in enviados)
+        if pendentes:
+            st.html(_script_estilo(pendentes), unsafe_allow_javascript=True)
+            enviados.update(pendentes)
+    elif hasattr(st, "html"):
+        st.html(_tag_estilo(ids))
+    else:
+        st.markdown(_tag_estilo(ids), unsafe_allow_html=True)
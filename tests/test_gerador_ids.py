@@ -0,0 +1,46 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gerador_ids import instante_do_id, novo_id
+
+THREADS = 8
+POR_THREAD = 5_000
+
+def test_ids_unicos_e_crescentes_entre_threads():
+    barreira = threading.Barrier(THREADS)
+    gerados = [None] * THREADS
+    
+    def gerar(indice):
+        barreira.wait()
+        gerados[indice] = [novo_id("VND") for _ in range(POR_THREAD)]
+    
+    antes = time.time()
+    threads = [threading.Thread(target=gerar, args=(indice,)) for indice in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    todos = [identificador for lote in gerados for identificador in lote]
+    assert len(set(todos)) == THREADS * POR_THREAD
+    # Cada thread vê os ids em ordem estritamente crescente, como texto
+    for lote in gerados:
+        assert all(anterior < atual for anterior, atual in zip(lote, lote[1:]))
+    assert all(len(identificador) == 3 + 26 and identificador.startswith("VND") for identificador in todos)
+    # O instante embutido é o da geração (o id guarda milissegundos)
+    instantes = [instante_do_id(identificador, "VND") for identificador in todos]
+    assert antes - 0.001 <= min(instantes) <= max(instantes) <= time.time()
+
+def test_relogio_parado_ou_voltando_mantem_a_ordem(monkeypatch):
+    instante = time.time_ns()
+    monkeypatch.setattr(time, "time_ns", lambda: instante)
+    primeiros = [novo_id() for _ in range(100)]
+    # Relógio volta 1 s: os ids continuam depois dos já emitidos
+    instante -= 1_000_000_000
+    seguintes = [novo_id() for _ in range(100)]
+    ids = primeiros + seguintes
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livro_vendas import LivroVendas, centavos
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("12.50", 1250),
+    ("1.234,56", 123456),
+    ("R$ 12,50", 1250),
+    ("1.234.567,89", 123456789),
+    (12.5, 1250),
+    (0.1 + 0.2, 30),
+])
+def test_centavos(valor, esperado):
+    assert centavos(valor) == esperado
+
+def test_erro_no_lote_nao_derruba_o_gravador(tmp_path):
+    livro = LivroVendas(str(tmp_path / "vendas.db"))
+    
+    def gravador(conn, lote):
+        if any(venda.produto == "Ruim" for venda in lote):
+            raise ValueError("falha no resumo")
+    
+    livro.na_transacao(gravador)
+    boa = livro.registrar("Ana", "Bom", 1, 1000, "PIX")
+    ruim = livro.registrar("Bia", "Ruim", 1, 1000, "PIX")
+    assert livro.aguardar(10)
+    
+    # Só a venda que falha sozinha fica de fora, guardada no arquivo de rejeitadas
+    assert livro.contar() == 1
+    with open(f"{livro.caminho}.rejeitadas.jsonl", encoding="utf-8") as arquivo:
+        assert [json.loads(linha)["id"] for linha in arquivo] == [ruim.id]
+    assert boa.id != ruim.id
+    
+    contadores = livro.contadores()
+    assert contadores["vendas_rejeitadas"] == 1
+    assert contadores["gravador_ativo"] == 1
+    
+    livro.registrar("Caio", "Bom", 2, 1000, "PIX")
+    assert livro.aguardar(10)
+    assert livro.contar() == 2
+    livro.fechar()
+
+def test_registrar_recusa_venda_sem_gravador(tmp_path):
+    livro = LivroVendas(str(tmp_path / "vendas.db"))
+    livro.fechar()
+    with pytest.raises(RuntimeError):
+        livro.registrar("Ana", "Bom", 1, 1000, "PIX")
\ No newline at end of file
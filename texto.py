@@ -0,0 +1,14 @@
+"""Normalização de texto para buscas (sem acento, sem caixa, sem pontuação)."""
+import re
+import unicodedata
+
+_ACENTOS = re.compile(r"[\u0300-\u036f]")
+_ENTRE_DIGITOS = re.compile(r"(?<=\d)[^a-z0-9]+(?=\d)")
+_SEPARADORES = re.compile(r"[^a-z0-9]+")
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sem acento, com os grupos de dígitos de um número juntos"""
+    texto = (texto or "").lower()
+    if not texto.isascii():
+        texto = _ACENTOS.sub("", unicodedata.normalize("NFKD", texto))
+    return _SEPARADORES.sub(" ", _ENTRE_DIGITOS.sub("", texto)).strip()
\ No newline at end of file
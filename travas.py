@@ -0,0 +1,35 @@
+"""Trava entre processos para os arquivos compartilhados pelos workers.
+
+Os logs append-only (sessões revogadas, estatísticas) são compactados
+regravando o arquivo e trocando-o com os.replace. Sem uma trava comum,
+uma linha acrescentada por outro worker entre a leitura e a troca se
+perderia. A trava fica num arquivo ao lado (<caminho>.lock), que nunca é
+substituído: flock no POSIX, msvcrt.locking no Windows.
+"""
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+@contextmanager
+def trava_arquivo(caminho: str):
+    """Segura a trava exclusiva de `caminho` (entre processos e threads) enquanto o bloco roda"""
+    with open(f"{caminho}.lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0, os.SEEK_SET)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0, os.SEEK_SET)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
\ No newline at end of file